@@ -6,10 +6,33 @@ Dashboard untuk menampilkan hasil penelitian skripsi secara interaktif untuk sid
 import streamlit as st
 # Force deploy update v2
 import pandas as pd
+import contextlib
+import contextvars
+import functools
 import json
 import os
+import numpy as np
 from pathlib import Path
 
+import bands
+import bootstrap
+import compaction
+import csv_index
+import datasets
+import filter_index
+import ingest
+import instrumentation
+import json_index
+import overview
+import prefetch
+import query_catalog
+import run_compare
+import search_index
+import snapshot
+import soal_html
+import table_view
+from quantile_sketch import DDSketch
+
 # Page Configuration
 st.set_page_config(
     page_title="Hasil Penelitian - RAG-LLM Assessment Generator",
@@ -189,158 +212,818 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Determine base path
-BASE_PATH = Path(__file__).parent / "hasil"
+# Determine base path (HASIL_DIR points the dashboard at another results directory)
+BASE_PATH = Path(os.environ.get("HASIL_DIR", Path(__file__).parent / "hasil"))
+
+# Further result directories selectable in the sidebar (see datasets.py); cached
+# loader results of all of them share DASHBOARD_MEMORY_BUDGET_MB, evicted a dataset at a time
+# (an approximate budget on the estimated size of the cached results, not on RSS)
+DATASETS = datasets.discover(BASE_PATH, os.environ.get("DASHBOARD_DATASETS"))
+
+# Source files under hasil/
+EVALUATIONS_FILE = "Data_Evaluasi_Expert.json"
+ASSESSMENTS_FILE = "Log_Hasil_Generate_Soal.json"
+RETRIEVAL_FILE = "Raw_Data_Retrieval.csv"
+PIPELINE_LOG_PATTERN = "Log_Performa_*.csv"
+
+# Persisted full-text index over the generation log
+SEARCH_INDEX_FILE = ".search/assessments.json"
+
+# Latency stages of the retrieval log and the percentiles reported for each
+LATENCY_STAGES = {
+    "faiss_time_ms": "FAISS Search",
+    "rerank_time_ms": "CrossEncoder Rerank",
+    "total_time_ms": "Total Pipeline",
+}
+LATENCY_PERCENTILES = [0.50, 0.90, 0.95, 0.99]
+LATENCY_CHUNK_ROWS = 100_000
+
+# Generation pipeline stages recorded in Log_Performa_*.csv
+PIPELINE_STAGES = {
+    "extraction_ms": "Ekstraksi",
+    "chunking_ms": "Chunking",
+    "embedding_ms": "Embedding",
+    "retrieval_ms": "Retrieval",
+    "llm_ms": "LLM",
+}
+
+# Retrieval summary metrics reported with bootstrap intervals: column -> (label, format)
+BOOTSTRAP_METRICS = {
+    "rerank_sigmoid": ("Avg P(relevant) - Top-K", "{:.1%}"),
+    "rerank_top1_sigmoid": ("Avg P(relevant) - Top-1", "{:.1%}"),
+    "success_70": ("Success Rate (P ≥ 70%)", "{:.0%}"),
+    "success_50": ("Success Rate (P ≥ 50%)", "{:.0%}"),
+    "total_time_ms": ("Avg Response Time (ms)", "{:.2f} ms"),
+}
+BOOTSTRAP_RATES = ["success_70", "success_50"]
+
+# Retrieval runs that can be compared: the main log and any other raw result files
+RETRIEVAL_RUN_PATTERNS = ["Raw_Data_Retrieval*.csv", "**/retrieval_results_raw*.csv"]
+
+# Query catalogs of the retrieval test, in either heading layout (see query_catalog.py)
+QUERY_CATALOG_PATTERNS = ["Daftar_Query_Evaluasi.md", "**/QUERY_TEST*.md"]
+
+# Retrieval score columns that can be banded with the relevance scheme
+RELEVANCE_BAND_COLUMNS = {
+    "rerank_sigmoid": "P(relevant) Top-K",
+    "rerank_top1_sigmoid": "P(relevant) Top-1",
+    "faiss_sigmoid": "FAISS Cosine Similarity",
+}
+
+# Assessment viewer: soal per page (only the visible page is rendered and sent)
+SOAL_PAGE_SIZES = [10, 25, 50]
+
+# Paged tables: rows per page; tables up to the smallest size are shown whole, without controls
+TABLE_PAGE_SIZES = [25, 100, 500]
+
+# Evaluasi Expert: filter columns (group-indexed) and table columns -> headers
+EVALUATION_FILTER_COLUMNS = ["mata_kuliah", "evaluator_name", "difficulty"]
+EVALUATION_TABLE_COLUMNS = {
+    "evaluator_name": "Evaluator",
+    "mata_kuliah": "Mata Kuliah",
+    "topic": "Topik",
+    "difficulty": "Kesulitan",
+    "relevance": "Relevansi",
+    "difficulty_match": "Kesesuaian",
+    "structure": "Struktur",
+    "pedagogical_value": "Pedagogis",
+    "overall": "Overall",
+    "interpretation": "Interpretasi",
+}
+
+# Data Mentah preview: page sizes, and the largest non-array JSON shown whole
+PREVIEW_PAGE_SIZES = [25, 100, 500]
+PREVIEW_MAX_DOCUMENT_BYTES = 5 * 1024 * 1024
+
+# Instrumentation: DASHBOARD_DEBUG=1 (or ?debug=1) shows the debug panel,
+# DASHBOARD_METRICS_LOG=stderr|stdout|<path> writes one JSON line per rerun
+DEBUG_PANEL = os.environ.get("DASHBOARD_DEBUG") == "1"
+instrumentation.configure_logging(os.environ.get("DASHBOARD_METRICS_LOG"))
+
+# Background prefetch of section data while the first session shows the Overview
+# (DASHBOARD_PREFETCH=0 disables it); section visit counts decide the order
+PREFETCH_ENABLED = os.environ.get("DASHBOARD_PREFETCH", "1") != "0"
+PREFETCH_WORKERS = 2
+POPULARITY_FILE = ".prefetch/popularity.json"
+# Before the prefetch, stale sources are parsed on this many processes into the
+# snapshot (DASHBOARD_INGEST_WORKERS=0 skips it; default: one per core)
+INGEST_WORKERS = int(os.environ.get("DASHBOARD_INGEST_WORKERS", ingest.default_workers()))
+INGEST_TASK = "Ingest hasil/ → snapshot"
+
+# ================== DATASETS ==================
+
+# Results directory served by the current thread: set per rerun from the
+# sidebar selection, and per task by the background prefetch
+_active_dir = contextvars.ContextVar("active_dir", default=None)
+
+def data_dir():
+    """Results directory of the dataset being served (BASE_PATH unless another is selected)"""
+    return _active_dir.get() or BASE_PATH
+
+@contextlib.contextmanager
+def use_dataset(path):
+    """Serve ``path`` in this thread for the duration of the block"""
+    token = _active_dir.set(Path(path))
+    try:
+        yield
+    finally:
+        _active_dir.reset(token)
+
+# ================== CACHE INVALIDATION ==================
+
+def expand_sources(names):
+    """Resolve glob patterns among ``names`` to the matching files under hasil/"""
+    root = data_dir()
+    resolved = []
+    for name in names:
+        if any(ch in name for ch in "*?["):
+            resolved.extend(sorted(p.relative_to(root).as_posix() for p in root.glob(name)))
+        else:
+            resolved.append(name)
+    return resolved
+
+def file_version(name):
+    """Identity of a file under hasil/: (path, size, content hash), or None hash if missing"""
+    path = data_dir() / name
+    try:
+        stat = path.stat()
+        # Memoized on the file's stat, so unchanged files are never re-read
+        return (str(path), stat.st_size, snapshot.content_hash(path))
+    except FileNotFoundError:
+        return (str(path), 0, None)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _snapshot_hashes(root, manifest_hash):
+    """Source name -> content hash its snapshot table was built from, per manifest version"""
+    manifest = snapshot.load_manifest(root)
+    return {source: entry["hash"] for source, entry in manifest["tables"].items()} if manifest else {}
+
+def snapshot_version(name):
+    """Content hash the snapshot of a file under hasil/ was built from, or None if it has none"""
+    try:
+        manifest_hash = snapshot.content_hash(data_dir() / snapshot.MANIFEST)
+    except FileNotFoundError:
+        return None
+    return _snapshot_hashes(str(data_dir()), manifest_hash).get(name)
+
+def cache_on_files(*file_names, shared=False, snapshot_backed=False):
+    """
+    Cache a loader with st.cache_data, keyed on the current version of the given files.
+
+    The decorated function receives the tuple of file versions as its first
+    argument. A touched-but-identical file keeps its warm entry; a changed file
+    only invalidates the loaders that declare it. Names may be glob patterns,
+    so a newly dropped file matching the pattern also invalidates the entry.
+    ``snapshot_backed=True`` adds each file's snapshot_version to its version,
+    for loaders that read the snapshot: a rebuild invalidates them only when
+    the snapshot of one of their own files changed. ``shared=True`` uses
+    st.cache_resource instead, returning the same object to every session
+    (no per-call copy), which keeps snapshot-backed frames memory-mapped;
+    callers must treat those results as read-only.
+
+    Every call is timed and counted as a cache hit or miss in the
+    instrumentation registry (see instrumentation.py). A miss is also
+    accounted to the dataset being served, so datasets.CACHE can evict the
+    entries of least recently used datasets when over the memory budget.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            # Only runs when the cache misses
+            instrumentation.mark_miss()
+            return func(*args, **kwargs)
+
+        cached = st.cache_resource(compute) if shared else st.cache_data(compute)
+
+        def evict(versions, args, kwargs):
+            cached.clear(versions, *args, **kwargs)
+            instrumentation.REGISTRY.forget_entry(func.__name__, (versions, args))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with instrumentation.loader_call(func.__name__) as call:
+                versions = tuple(file_version(name) + ((snapshot_version(name),) if snapshot_backed else ())
+                                 for name in expand_sources(file_names))
+                result = cached(versions, *args, **kwargs)
+                call["key"], call["result"] = (versions, args), result
+            if call["miss"]:
+                dataset = str(data_dir())
+                size = instrumentation.REGISTRY.entry_size(func.__name__, (versions, args))
+                datasets.CACHE.add(dataset, (func.__name__, versions, args, tuple(kwargs.items())), size,
+                                  functools.partial(evict, versions, args, kwargs))
+                datasets.CACHE.evict(keep=dataset)
+            return result
 
-@st.cache_data
-def load_evaluations():
+        def clear():
+            cached.clear()
+            instrumentation.REGISTRY.forget_entries(func.__name__)
+
+        wrapper.clear = clear
+        return wrapper
+    return decorator
+
+# ================== DATA LOADERS ==================
+
+def load_snapshot_table(source):
+    """Memory-mapped snapshot table for a hasil/ source, or None if missing or stale"""
+    try:
+        return snapshot.read_table(data_dir(), source)
+    except Exception:
+        return None
+
+@cache_on_files(EVALUATIONS_FILE, shared=True, snapshot_backed=True)
+def load_evaluation_frame(versions):
+    """Expert evaluations as a DataFrame, from the snapshot when it is fresh"""
+    df = load_snapshot_table(EVALUATIONS_FILE)
+    if df is None:
+        df = compaction.compact(pd.DataFrame(load_evaluations()))
+    return df
+
+@cache_on_files(EVALUATIONS_FILE)
+def load_evaluations(versions):
     """Load expert evaluation data"""
     try:
-        with open(BASE_PATH / "Data_Evaluasi_Expert.json", "r", encoding="utf-8") as f:
+        with open(data_dir() / EVALUATIONS_FILE, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
         st.error(f"Error loading evaluations: {e}")
         return []
 
-@st.cache_data
-def load_assessments():
-    """Load generated assessments"""
+def _assessment_index_from_snapshot():
+    """Build the assessment index from the snapshot's metadata columns and content offsets"""
+    df = load_snapshot_table(ASSESSMENTS_FILE)
+    if df is None:
+        return None
+    metric_cols = [c for c in df.columns if c.startswith("metrics.")]
+    metric = lambda name, default: df[f"metrics.{name}"].fillna(default) if f"metrics.{name}" in df else default
+    index = pd.DataFrame({
+        "id": df["id"],
+        "mata_kuliah": df["mata_kuliah"],
+        "topic": df["topic"].fillna("Unknown") if "topic" in df else "Unknown",
+        "difficulty": df["difficulty"],
+        "has_metrics": df[metric_cols].notna().any(axis=1) if metric_cols else False,
+        "processing_time_s": metric("processing_time_s", 0),
+        "structure_compliance": metric("structure_compliance", 0),
+        "has_soal": metric("has_soal", False).astype(bool),
+        "has_kunci_jawaban": metric("has_kunci_jawaban", False).astype(bool),
+        "content_start": df["content_start"],
+        "content_end": df["content_end"],
+    })
+    index.attrs["content_path"] = str(snapshot.lazy_text_path(data_dir(), ASSESSMENTS_FILE, "content"))
+    return index
+
+@cache_on_files(ASSESSMENTS_FILE, shared=True, snapshot_backed=True)
+def load_assessment_index(versions):
+    """Index the generation log: metadata per record, content left on disk as a byte range"""
     try:
-        with open(BASE_PATH / "Log_Hasil_Generate_Soal.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        index = _assessment_index_from_snapshot()
+        if index is not None:
+            return index
+
+        buf = json_index.open_buffer(data_dir() / ASSESSMENTS_FILE)
+        rows = []
+        for record in json_index.scan_records(buf, skip_keys=("content",)):
+            fields = record["fields"]
+            metrics = fields.get("metrics") or {}
+            content_span = record["spans"].get("content", (0, 0))
+            rows.append({
+                "id": fields.get("id"),
+                "mata_kuliah": fields.get("mata_kuliah"),
+                "topic": fields.get("topic", "Unknown"),
+                "difficulty": fields.get("difficulty"),
+                "has_metrics": "metrics" in fields,
+                "processing_time_s": metrics.get("processing_time_s", 0),
+                "structure_compliance": metrics.get("structure_compliance", 0),
+                "has_soal": bool(metrics.get("has_soal")),
+                "has_kunci_jawaban": bool(metrics.get("has_kunci_jawaban")),
+                "content_start": content_span[0],
+                "content_end": content_span[1],
+            })
+        index = compaction.compact(pd.DataFrame(rows))
+        index.attrs["content_path"] = str(data_dir() / ASSESSMENTS_FILE)
+        return index
     except Exception as e:
-        st.error(f"Error loading assessments: {e}")
-        return []
+        st.error(f"Error indexing assessments: {e}")
+        return pd.DataFrame()
+
+@cache_on_files(ASSESSMENTS_FILE, snapshot_backed=True)
+def load_assessment_html(versions, content_path, start, end):
+    """Sanitized HTML of one indexed assessment, rendered once per data version"""
+    content = json_index.read_span(content_path, (start, end)) if end > start else ""
+    return soal_html.render_markdown(content)
+
+def render_soal_page(index, rows, first):
+    """HTML of one page of assessments; ``first`` is the number of the first soal"""
+    items = [
+        soal_html.render_item(first + i, assessment._asdict(), load_assessment_html(
+            index.attrs["content_path"], int(assessment.content_start), int(assessment.content_end)))
+        for i, assessment in enumerate(rows.itertuples(index=False))
+    ]
+    return soal_html.render_page(items)
 
-@st.cache_data
-def load_retrieval_data_final():
-    """Load and aggregate retrieval analysis data from raw results"""
+def render_table_view(view, key, formats=None):
+    """
+    Show a table_view.TableView one page at a time, sorted on the server.
+
+    Only the visible rows are styled and sent. ``key`` prefixes the widget
+    keys; tables up to the smallest page size are shown whole, without controls.
+    """
+    sort, ascending, page, page_size = None, True, 1, max(len(view), 1)
+    if len(view) > TABLE_PAGE_SIZES[0]:
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+        with col1:
+            sort = st.selectbox("Urutkan menurut:", [None] + view.columns, key=f"{key}_sort",
+                                format_func=lambda column: "Urutan asli" if column is None else column)
+        with col2:
+            ascending = st.selectbox("Arah:", [True, False], key=f"{key}_ascending",
+                                     format_func=lambda up: "Naik" if up else "Turun")
+        with col3:
+            page_size = st.selectbox("Baris per halaman:", TABLE_PAGE_SIZES, key=f"{key}_page_size")
+        total_pages = -(-len(view) // page_size)
+        with col4:
+            page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1,
+                                   key=f"{key}_page_{page_size}")
+        first = (page - 1) * page_size
+        st.caption(f"Baris {first + 1}–{min(len(view), first + page_size)} dari {len(view)} "
+                   f"(halaman {page}/{total_pages})")
+    st.dataframe(view.styled_page(page, page_size, sort, ascending, formats), width="stretch", hide_index=True)
+
+@cache_on_files(ASSESSMENTS_FILE, shared=True)
+def load_search_index(versions):
+    """BM25 index over generated assessments, updated incrementally when records are appended"""
     try:
-        # Load raw results
-        df = pd.read_csv(BASE_PATH / "Raw_Data_Retrieval.csv")
-        
-        # Calculate dynamic sigmoid scores first (0-100% scale for display)
-        import numpy as np
-        df["rerank_sigmoid"] = 1 / (1 + np.exp(-df["rerank_avg_score"]))
-        # df["rerank_top1_sigmoid"] = 1 / (1 + np.exp(-df["rerank_top1"])) # Not used in this view
-        
-        # Aggregate by Subject
-        agg_df = df.groupby("mata_kuliah").agg({
-            "rerank_sigmoid": "mean",
-            "total_time_ms": "mean",
-            "query": "count"
-        }).reset_index()
-        
-        # Rename columns to match the UI expectations
-        agg_df.columns = ["Mata Kuliah", "P(relevant)", "Response Time (ms)", "Jumlah Query"]
-        
-        # Convert to percentage for display consistency (0-1 -> 0-100)
-        agg_df["P(relevant)"] = agg_df["P(relevant)"] * 100
-        
-        return agg_df[["Mata Kuliah", "P(relevant)", "Response Time (ms)"]]
+        return search_index.SearchIndex.open(data_dir() / ASSESSMENTS_FILE, data_dir() / SEARCH_INDEX_FILE)
     except Exception as e:
-        st.error(f"Error loading retrieval data: {e}")
-        return pd.DataFrame()
+        st.error(f"Error loading search index: {e}")
+        return None
 
-@st.cache_data
-def load_rag_effectiveness():
-    """Load RAG effectiveness summary from raw results"""
+@cache_on_files(PIPELINE_LOG_PATTERN, snapshot_backed=True)
+def load_pipeline_performance(versions):
+    """Per-document generation timings from every Log_Performa_*.csv, tagged with the log name"""
+    frames = []
     try:
-        # Load and process raw data
-        df = pd.read_csv(BASE_PATH / "Raw_Data_Retrieval.csv")
-        import numpy as np
-        
-        # Calculate dynamic sigmoid scores
-        df["rerank_sigmoid"] = 1 / (1 + np.exp(-df["rerank_avg_score"]))
-        df["rerank_top1_sigmoid"] = 1 / (1 + np.exp(-df["rerank_top1"]))
-        
-        # Calculate summary metrics
-        total = len(df)
-        avg_top_k = df["rerank_sigmoid"].mean()
-        avg_top_1 = df["rerank_top1_sigmoid"].mean()
-        success_70 = len(df[df["rerank_top1_sigmoid"] >= 0.7]) / total * 100
-        success_50 = len(df[df["rerank_top1_sigmoid"] >= 0.5]) / total * 100
-        avg_time = df["total_time_ms"].mean()
-        
-        # Create summary dataframe with new labels
-        summary_data = {
-            "Metrik": [
-                "Avg P(relevant) - Top-K",
-                "Avg P(relevant) - Top-1", 
-                "Success Rate (P ≥ 70%)",
-                "Success Rate (P ≥ 50%)",
-                "Avg Response Time (ms)"
-            ],
-            "Nilai": [
-                f"{avg_top_k:.4f} ({avg_top_k*100:.1f}%)",
-                f"{avg_top_1:.4f} ({avg_top_1*100:.1f}%)",
-                f"{success_70:.0f}%",
-                f"{success_50:.0f}%",
-                f"{avg_time:.2f} ms"
-            ]
-        }
-        
-        return pd.DataFrame(summary_data)
+        for source in expand_sources([PIPELINE_LOG_PATTERN]):
+            df = load_snapshot_table(source)
+            if df is None:
+                df = pd.read_csv(data_dir() / source)
+            df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed")])
+            df.insert(0, "log", Path(source).stem)
+            frames.append(df)
     except Exception as e:
-        st.error(f"Error loading RAG effectiveness: {e}")
+        st.error(f"Error loading pipeline performance: {e}")
+    if not frames:
         return pd.DataFrame()
 
-@st.cache_data
-def load_sigmoid_analysis():
-    """Load retrieval results and calculate sigmoid scores dynamically"""
+    # Logs with different subjects concatenate to plain text: re-encode after the concat
+    df = compaction.compact(pd.concat(frames, ignore_index=True))
+    # Time not attributed to any recorded stage
+    df["overhead_ms"] = (df["total_ms"] - df[list(PIPELINE_STAGES)].sum(axis=1)).clip(lower=0)
+    return df
+
+@cache_on_files(RETRIEVAL_FILE, shared=True, snapshot_backed=True)
+def load_retrieval_frame(versions):
+    """Load raw retrieval results once and derive every probability column in one pass"""
     try:
-        # Load raw results
-        df = pd.read_csv(BASE_PATH / "Raw_Data_Retrieval.csv")
-        
-        # Calculate Sigmoid (1 / (1 + exp(-x))) for Rerank scores (Logits)
-        import numpy as np
-        
+        df = load_snapshot_table(RETRIEVAL_FILE)
+        if df is None:
+            df = compaction.compact(pd.read_csv(data_dir() / RETRIEVAL_FILE))
+
         # FAISS score is Cosine Similarity (already 0-1)
         df["faiss_sigmoid"] = df["faiss_avg_score"]
-        
-        # Rerank score is Logit -> Apply Sigmoid to get Probability (0-1)
-        df["rerank_sigmoid"] = 1 / (1 + np.exp(-df["rerank_avg_score"]))
-        df["rerank_top1_sigmoid"] = 1 / (1 + np.exp(-df["rerank_top1"]))
-        
+
+        # Rerank scores are logits -> one vectorized sigmoid over both columns
+        logits = df[["rerank_avg_score", "rerank_top1"]].to_numpy(dtype=float)
+        probs = 1 / (1 + np.exp(-logits))
+        df["rerank_sigmoid"] = probs[:, 0].astype(np.float32)
+        df["rerank_top1_sigmoid"] = probs[:, 1].astype(np.float32)
+
+        # Success flags used by the effectiveness summary (thresholded at full precision)
+        df["success_70"] = probs[:, 1] >= 0.7
+        df["success_50"] = probs[:, 1] >= 0.5
+
         return df
     except Exception as e:
         st.error(f"Error loading retrieval results: {e}")
         return pd.DataFrame()
 
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_retrieval_data_final(versions):
+    """Aggregate retrieval results per subject"""
+    df = load_retrieval_frame()
+    if df.empty:
+        return pd.DataFrame()
+
+    # Aggregate by Subject
+    agg_df = df.groupby("mata_kuliah", observed=True).agg({
+        "rerank_sigmoid": "mean",
+        "total_time_ms": "mean"
+    }).reset_index()
+
+    # Rename columns to match the UI expectations
+    agg_df.columns = ["Mata Kuliah", "P(relevant)", "Response Time (ms)"]
+
+    # Convert to percentage for display consistency (0-1 -> 0-100)
+    agg_df["P(relevant)"] = agg_df["P(relevant)"] * 100
+
+    # Bootstrap intervals next to the per-subject means (20 queries each)
+    intervals = load_retrieval_intervals()
+    by_subject = intervals.set_index(["group", "metric"])
+    for metric, column in (("rerank_sigmoid", "P(relevant)"), ("total_time_ms", "Response Time (ms)")):
+        agg_df[f"CI 95% {column}"] = [
+            format_interval({**by_subject.loc[(subject, metric)].to_dict(), "metric": metric})
+            for subject in agg_df["Mata Kuliah"]
+        ]
+
+    # Tail latency next to the mean
+    sketches = load_latency_sketches()
+    agg_df["P95 Response Time (ms)"] = [
+        sketches[(subject, "total_time_ms")].quantile(0.95) for subject in agg_df["Mata Kuliah"]
+    ]
+
+    return agg_df
+
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_latency_sketches(versions):
+    """DDSketch per (mata_kuliah, stage), plus ("Semua", stage) merged from the subjects"""
+    df = load_retrieval_frame()
+    sketches = {}
+    if df.empty:
+        return sketches
+
+    # Stream the log in chunks; only bucket counts are kept per sketch
+    for start in range(0, len(df), LATENCY_CHUNK_ROWS):
+        chunk = df.iloc[start:start + LATENCY_CHUNK_ROWS]
+        for subject, group in chunk.groupby("mata_kuliah", observed=True):
+            for stage in LATENCY_STAGES:
+                sketches.setdefault((subject, stage), DDSketch()).add(group[stage].to_numpy())
+
+    for stage in LATENCY_STAGES:
+        overall = DDSketch()
+        for (subject, sketch_stage), sketch in list(sketches.items()):
+            if sketch_stage == stage:
+                overall.merge(sketch)
+        sketches[("Semua", stage)] = overall
+    return sketches
+
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_latency_percentiles(versions):
+    """p50/p90/p95/p99/max per mata_kuliah and stage from the latency sketches"""
+    rows = []
+    for (subject, stage), sketch in load_latency_sketches().items():
+        p50, p90, p95, p99 = sketch.quantiles(LATENCY_PERCENTILES)
+        rows.append({
+            "Mata Kuliah": subject,
+            "Komponen": LATENCY_STAGES[stage],
+            "P50": p50, "P90": p90, "P95": p95, "P99": p99,
+            "Max": sketch.max,
+        })
+    return pd.DataFrame(rows)
+
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_retrieval_intervals(versions):
+    """Bootstrap 95% intervals of the retrieval summary metrics, overall ("Semua") and per mata_kuliah"""
+    df = load_retrieval_frame()
+    if df.empty:
+        return pd.DataFrame()
+    means = [m for m in BOOTSTRAP_METRICS if m not in BOOTSTRAP_RATES]
+    return bootstrap.intervals(df, means=means, rates=BOOTSTRAP_RATES, by="mata_kuliah")
+
+def format_interval(row):
+    """"[low, high]" of an interval row, in its metric's display format"""
+    if not row["n"]:
+        return "–"  # no rows with a value
+    fmt = BOOTSTRAP_METRICS[row["metric"]][1]
+    return f"[{fmt.format(row['low'])}, {fmt.format(row['high'])}]"
+
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_rag_effectiveness(versions):
+    """Summarize RAG effectiveness from retrieval results"""
+    df = load_retrieval_frame()
+    if df.empty:
+        return pd.DataFrame()
+
+    # Calculate summary metrics
+    avg_top_k = df["rerank_sigmoid"].mean()
+    avg_top_1 = df["rerank_top1_sigmoid"].mean()
+    success_70 = df["success_70"].mean() * 100
+    success_50 = df["success_50"].mean() * 100
+    avg_time = df["total_time_ms"].mean()
+
+    # Create summary dataframe with new labels
+    summary_data = {
+        "Metrik": [
+            "Avg P(relevant) - Top-K",
+            "Avg P(relevant) - Top-1", 
+            "Success Rate (P ≥ 70%)",
+            "Success Rate (P ≥ 50%)",
+            "Avg Response Time (ms)"
+        ],
+        "Nilai": [
+            f"{avg_top_k:.4f} ({avg_top_k*100:.1f}%)",
+            f"{avg_top_1:.4f} ({avg_top_1*100:.1f}%)",
+            f"{success_70:.0f}%",
+            f"{success_50:.0f}%",
+            f"{avg_time:.2f} ms"
+        ]
+    }
+
+    # Bootstrap intervals, in the same metric order
+    intervals = load_retrieval_intervals()
+    overall = intervals[intervals["group"] == "Semua"].set_index("metric")
+    summary_data["CI 95%"] = [format_interval({**overall.loc[m].to_dict(), "metric": m}) for m in BOOTSTRAP_METRICS]
+
+    return pd.DataFrame(summary_data)
+
+def load_sigmoid_analysis():
+    """Per-query retrieval results with sigmoid scores"""
+    return load_retrieval_frame()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_csv_row_offsets(version):
+    """Row-offset index of one version of a CSV file"""
+    return csv_index.row_offsets(version[0])
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_json_record_spans(version):
+    """Byte range of every record of one version of a JSON array file"""
+    buf = json_index.open_buffer(version[0])
+    spans = [(r["start"], r["end"]) for r in json_index.scan_records(buf, decode=False)]
+    return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+@cache_on_files(*RETRIEVAL_RUN_PATTERNS)
+def load_retrieval_runs(versions):
+    """Every retrieval run under hasil/, keyed by its path relative to hasil/"""
+    runs = {}
+    for name in expand_sources(RETRIEVAL_RUN_PATTERNS):
+        try:
+            runs[name] = pd.read_csv(data_dir() / name)
+        except Exception as e:
+            st.warning(f"Gagal memuat run {name}: {e}")
+    return runs
+
+@cache_on_files(*RETRIEVAL_RUN_PATTERNS)
+def load_run_comparison(versions, baseline, compared, metric):
+    """Per-query deltas and per-run summary of ``compared`` runs against ``baseline``"""
+    runs = load_retrieval_runs()
+    return run_compare.compare_runs({name: runs[name] for name in (baseline, *compared)}, baseline, metric)
+
+@cache_on_files(*QUERY_CATALOG_PATTERNS, *RETRIEVAL_RUN_PATTERNS)
+def load_query_catalog(versions):
+    """Catalog queries per subject, each joined to its rows in every retrieval run (one row per match)"""
+    catalog = {}
+    for name in expand_sources(QUERY_CATALOG_PATTERNS):
+        try:
+            pairs = query_catalog.parse_catalog((data_dir() / name).read_text(encoding="utf-8"))
+        except OSError:
+            continue
+        for subject, query in pairs:
+            catalog.setdefault((subject.lower(), query), (subject, query))
+    columns = ["mata_kuliah", "no", "query", "run", "rerank_top1_sigmoid", "faiss_sigmoid", "total_time_ms"]
+    if not catalog:
+        return pd.DataFrame(columns=columns)
+
+    runs = [df.assign(run=name) for name, df in load_retrieval_runs().items()
+            if {"mata_kuliah", "query", "rerank_top1", "faiss_avg_score", "total_time_ms"} <= set(df.columns)]
+    frame = pd.concat(runs, ignore_index=True) if runs else pd.DataFrame(
+        columns=["mata_kuliah", "query", "rerank_top1", "faiss_avg_score", "total_time_ms", "run"])
+    subjects, queries = map(list, zip(*catalog.values()))
+    matches = query_catalog.QueryIndex(frame).join(subjects, queries)
+
+    # Subject names as the retrieval runs spell them ("ALGORITMA DAN PEMROGRAMAN" -> "Algoritma dan Pemrograman")
+    spelled = {str(s).strip().lower(): str(s) for s in frame["mata_kuliah"].dropna().unique()}
+    subjects = np.array([spelled.get(s.strip().lower(), s) for s in subjects], dtype=object)
+    numbers = pd.Series(subjects).groupby(subjects, sort=False).cumcount().to_numpy() + 1
+
+    # One output row per (catalog query, matched row); unmatched queries keep one row without scores
+    counts = np.array([max(len(m), 1) for m in matches])
+    catalog_pos = np.repeat(np.arange(len(matches)), counts)
+    rows = np.array([r for m in matches for r in (m or [-1])], dtype=np.int64)
+    found = rows >= 0
+
+    def matched(values):
+        out = np.full(len(rows), np.nan)
+        out[found] = np.asarray(values, dtype=float)[rows[found]]
+        return out
+
+    run = np.full(len(rows), None, dtype=object)
+    run[found] = frame["run"].to_numpy(dtype=object)[rows[found]]
+    return pd.DataFrame({
+        "mata_kuliah": subjects[catalog_pos],
+        "no": numbers[catalog_pos],
+        "query": np.array(queries, dtype=object)[catalog_pos],
+        "run": run,
+        "rerank_top1_sigmoid": 1 / (1 + np.exp(-matched(frame["rerank_top1"]))),
+        "faiss_sigmoid": matched(frame["faiss_avg_score"]),   # cosine similarity, already 0-1
+        "total_time_ms": matched(frame["total_time_ms"]),
+    }, columns=columns)
+
+def _filter_mask(df, filters):
+    """Boolean mask of the rows matching every (column, value) pair in ``filters``"""
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in filters:
+        mask &= (df[column] == value).to_numpy()
+    return mask
+
+@cache_on_files(RETRIEVAL_FILE, snapshot_backed=True)
+def load_retrieval_band_counts(versions, column, filters=()):
+    """Relevance band counts of a retrieval score column, cached per filter combination"""
+    df = load_retrieval_frame()
+    if df.empty:
+        return np.zeros(len(bands.SCHEMES["relevance"]), dtype=np.int64)
+    return bands.SCHEMES["relevance"].counts(df[column].to_numpy(), _filter_mask(df, filters))
+
+@cache_on_files(RETRIEVAL_FILE, shared=True, snapshot_backed=True)
+def load_retrieval_detail(versions, subject="Semua"):
+    """Per-query retrieval scores of one subject ("Semua": all) as a paged, sortable table"""
+    df = load_retrieval_frame()
+    if subject != "Semua":
+        df = df[df["mata_kuliah"] == subject]
+    return table_view.TableView(pd.DataFrame({
+        "Mata Kuliah": df["mata_kuliah"],
+        "Query": df["query"],
+        "FAISS": df["faiss_sigmoid"],
+        "P(relevant)": df["rerank_sigmoid"] * 100,
+        "P(relevant) Top-1": df["rerank_top1_sigmoid"] * 100,
+    }))
+
+@cache_on_files(EVALUATIONS_FILE, shared=True, snapshot_backed=True)
+def load_evaluation_index(versions):
+    """Group indexes of the expert evaluations on the filter columns, built once per data version"""
+    return filter_index.GroupIndex(load_evaluation_frame(), EVALUATION_FILTER_COLUMNS)
+
+def evaluation_counts(df):
+    """Evaluators, evaluated assessments and evaluations in a frame of expert evaluations"""
+    if df.empty:
+        return 0, 0, 0
+    return df["evaluator_name"].nunique(), df["assessment_id"].nunique(), len(df)
+
+@cache_on_files(EVALUATIONS_FILE, shared=True, snapshot_backed=True)
+def load_evaluation_view(versions, filters=()):
+    """Paged table, band counts and comments of the expert evaluations matching ``filters``, memoized per filter tuple"""
+    df = load_evaluation_frame()
+    view = df.iloc[load_evaluation_index().rows(filters)]
+    comments = view[view["comments"].fillna("").astype(str).str.len() > 0]
+    return {
+        "table": table_view.TableView(view[list(EVALUATION_TABLE_COLUMNS)].rename(columns=EVALUATION_TABLE_COLUMNS),
+                                      {"Overall": ("RdYlGn", 1, 5)}),
+        "band_counts": bands.SCHEMES["evaluation"].counts(view["overall"].to_numpy(dtype=float)),
+        "comments": len(comments),
+        "comments_html": soal_html.render_page([
+            soal_html.render_note(f"💬 {evaluator} - {topic}", str(comment))
+            for evaluator, topic, comment in zip(comments["evaluator_name"], comments["topic"], comments["comments"])
+        ]),
+    }
+
 def calculate_evaluation_stats(evaluations):
     """Calculate statistics from evaluations"""
     if not evaluations:
         return {}
+    return overview.evaluation_stats(overview.evaluation_totals(pd.DataFrame(evaluations)))
 
-    df = pd.DataFrame(evaluations)
+# Delta files folded into the running aggregates (see overview.py)
+INBOX_PATTERNS = [f"{overview.INBOX_DIR}/*{suffix}" for suffix in overview.INBOX_SOURCES]
 
-    return {
-        "total_evaluations": len(df),
-        "unique_evaluators": df["evaluator_name"].nunique(),
-        "unique_assessments": df["assessment_id"].nunique(),
-        "avg_overall": df["overall"].mean(),
-        "avg_relevance": df["relevance"].mean(),
-        "avg_difficulty_match": df["difficulty_match"].mean(),
-        "avg_structure": df["structure"].mean(),
-        "avg_pedagogical": df["pedagogical_value"].mean(),
-        "excellent_count": len(df[df["overall"] >= 4.25]),
-        "good_count": len(df[(df["overall"] >= 3.5) & (df["overall"] < 4.25)]),
-        "needs_improvement": len(df[df["overall"] < 3.5]),
-    }
+# Group columns of the running evaluation aggregates and their labels
+EVALUATION_GROUP_LABELS = {"mata_kuliah": "Mata Kuliah", "evaluator_name": "Evaluator", "difficulty": "Kesulitan"}
+
+@cache_on_files(EVALUATIONS_FILE, ASSESSMENTS_FILE, RETRIEVAL_FILE, *INBOX_PATTERNS)
+def load_overview(versions):
+    """Running aggregates, updated incrementally in hasil/.overview/ when the sources or inbox grow"""
+    return overview.open_overview(data_dir())
 
 # ================== MAIN APP ==================
 
+SECTIONS = ["🏠 Overview", "🔍 Efektivitas RAG", "🔀 Perbandingan Run", "📄 Hasil Generate Soal", "📋 Evaluasi Expert", "⚙️ Profil Pipeline", "📈 Data Mentah"]
+
+def _ingest_sources():
+    """Parallel parse of stale sources into the snapshot; the per-file report, or None if fresh"""
+    return ingest.refresh_snapshot(data_dir(), workers=INGEST_WORKERS)
+
+# The cache key includes how arguments were passed: call exactly as the sections do
+
+def _prefetch_band_counts():
+    """The RAG distribution's default view: first score column, all subjects"""
+    load_retrieval_band_counts(next(iter(RELEVANCE_BAND_COLUMNS)), ())
+
+def _prefetch_retrieval_detail():
+    """The per-query detail table's default view: all subjects"""
+    load_retrieval_detail("Semua")
+
+def _prefetch_evaluation_view():
+    """Evaluasi Expert's default view: no filters"""
+    if not load_evaluation_frame().empty:
+        load_evaluation_view(())
+
+def _prefetch_soal_page():
+    """The assessment viewer's default view: first page of the first subject"""
+    index = load_assessment_index()
+    if not index.empty:
+        first_subject = sorted(index["mata_kuliah"].unique().tolist())[0]
+        render_soal_page(index, index[index["mata_kuliah"] == first_subject].iloc[:SOAL_PAGE_SIZES[0]], 1)
+
+def _prefetch_run_comparison():
+    """The run comparison's default view: first run against all others on the first metric"""
+    runs = load_retrieval_runs()
+    if len(runs) >= 2:
+        baseline, *compared = runs
+        load_run_comparison(baseline, tuple(compared), next(iter(run_compare.METRICS)))
+
+# Loaders behind each section's default view, warmed in the background
+PREFETCH_LOADERS = {
+    "🔍 Efektivitas RAG": [load_rag_effectiveness, load_retrieval_data_final, load_retrieval_intervals,
+                          load_query_catalog, _prefetch_band_counts, load_latency_percentiles, load_latency_sketches,
+                          _prefetch_retrieval_detail],
+    "🔀 Perbandingan Run": [load_retrieval_runs, _prefetch_run_comparison],
+    "📄 Hasil Generate Soal": [load_assessment_index, load_search_index, _prefetch_soal_page],
+    "📋 Evaluasi Expert": [load_evaluation_index, _prefetch_evaluation_view, load_overview],
+    "⚙️ Profil Pipeline": [load_pipeline_performance],
+}
+
+@st.cache_resource(show_spinner=False)
+def load_popularity():
+    """Process-wide section visit counts, persisted under hasil/.prefetch/"""
+    return prefetch.Popularity(BASE_PATH / POPULARITY_FILE)
+
+@st.cache_resource(show_spinner=False)
+def start_prefetch(directory):
+    """Start warming the section loaders of a dataset once per process; None when disabled"""
+    if not PREFETCH_ENABLED:
+        return None
+
+    def in_dataset(func):
+        @functools.wraps(func)
+        def run():
+            with use_dataset(directory):
+                return func()
+        return run
+
+    order = prefetch.popularity_order(list(PREFETCH_LOADERS), load_popularity().counts())
+    tasks = [(f"{section} · {func.__name__}", in_dataset(func)) for section in order for func in PREFETCH_LOADERS[section]]
+    setup = (INGEST_TASK, in_dataset(_ingest_sources)) if INGEST_WORKERS > 0 else None
+    return prefetch.Prefetcher(tasks, max_workers=PREFETCH_WORKERS, setup=setup).start()
+
+def render_debug_panel(summary):
+    """Sidebar panel with this rerun's timings and the process-wide cache counters"""
+    with st.sidebar.expander("🛠️ Debug: Performa", expanded=True):
+        st.markdown(f"**{summary['section']}** — {summary['duration_ms']:.0f} ms")
+        st.caption(f"Loader {summary['loader_ms']:.0f} ms · Render {summary['render_ms']:.0f} ms "
+                   f"· Cache miss {summary['cache_misses']}")
+        if summary["loaders"]:
+            st.dataframe(pd.DataFrame(summary["loaders"]), hide_index=True, width="stretch")
+
+        st.markdown("**Waktu render per bagian (ms)**")
+        st.dataframe(instrumentation.REGISTRY.section_table().round(1), hide_index=True, width="stretch")
+
+        st.markdown("**Cache loader**")
+        loaders = instrumentation.REGISTRY.loader_table()
+        st.dataframe(loaders.round({"hit_rate": 2, "avg_ms": 1, "avg_miss_ms": 1, "cached_mb": 2}),
+                     hide_index=True, width="stretch")
+        st.caption(f"Total cache: {loaders['cached_mb'].sum():.1f} MB (perkiraan)")
+
+        if len(DATASETS) > 1:
+            st.markdown("**Dataset (LRU)**")
+            names = {str(path): name for name, path in DATASETS.items()}
+            table = pd.DataFrame(datasets.CACHE.table(), columns=["dataset", "entries", "cached_mb", "idle_s"])
+            table["dataset"] = table["dataset"].map(lambda d: names.get(d, d))
+            st.dataframe(table.round({"cached_mb": 2, "idle_s": 0}), hide_index=True, width="stretch")
+            rss = datasets.rss_bytes()
+            st.caption(f"Anggaran {datasets.CACHE.budget_bytes / 2**20:.0f} MB (perkiraan, bukan RSS) · "
+                       f"{datasets.CACHE.evictions} dataset dikeluarkan"
+                       + (f" · RSS proses {rss / 2**20:.0f} MB" if rss else ""))
+
+        prefetcher = start_prefetch(str(data_dir()))
+        if prefetcher is not None:
+            st.markdown("**Prefetch**")
+            st.dataframe(pd.DataFrame(prefetcher.status()).round({"seconds": 2}), hide_index=True, width="stretch")
+            report = prefetcher.result(INGEST_TASK)
+            if report is not None:
+                st.markdown("**Ingest paralel**")
+                st.dataframe(report.round({"mb": 1, "parse_s": 2}), hide_index=True, width="stretch")
+                st.caption(f"{len(report)} file dalam {report.attrs['wall_s']:.2f} s "
+                           f"({report['parse_s'].sum():.2f} s parsing, {INGEST_WORKERS} proses)")
+
 def main():
+    instrumentation.begin_run()
+
     # Header
     st.markdown('<h1 class="main-header">📊 Hasil Penelitian RAG-LLM Assessment Generator</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Dashboard Interaktif untuk Sidang Ujian Skripsi</p>', unsafe_allow_html=True)
 
     # Sidebar Navigation
     st.sidebar.title("📑 Navigasi")
-    section = st.sidebar.radio(
-        "Pilih Bagian:",
-        ["🏠 Overview", "🔍 Efektivitas RAG", "📄 Hasil Generate Soal", "📋 Evaluasi Expert", "📈 Data Mentah"]
-    )
+    # Dataset selection comes first: every loader below reads from it
+    dataset = next(iter(DATASETS))
+    if len(DATASETS) > 1:
+        dataset = st.sidebar.selectbox("📂 Dataset:", list(DATASETS), key="dataset",
+                                       help="Direktori hasil yang ditampilkan")
+    directory = DATASETS[dataset]
+    _active_dir.set(directory)
+    datasets.CACHE.touch(str(directory))
+
+    # Returns at once; the loaders warm up on background threads
+    start_prefetch(str(directory))
+
+    section = st.sidebar.radio("Pilih Bagian:", SECTIONS)
 
     # Sidebar info
     st.sidebar.markdown("---")
@@ -351,118 +1034,115 @@ def main():
     if section == "🏠 Overview":
         st.markdown("## 📊 Ringkasan Hasil Penelitian")
 
-        # Static metrics for instant loading (no data loading needed)
+        # Aggregates come from the small overview snapshot, not the raw files
+        overview_state = load_overview()
+        stats = overview.evaluation_stats(overview_state.get("evaluations", {}))
+        assessments = overview_state.get("assessments", {})
+        rag_df, success_rate, n_queries = overview.retrieval_summary(overview_state.get("retrieval", {}))
+
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            st.metric("Total Evaluasi Expert", "50", delta="9 Evaluator")
+            st.metric("Total Evaluasi Expert", stats.get("total_evaluations", 0),
+                      delta=f"{stats.get('unique_evaluators', 0)} Evaluator")
 
         with col2:
-            st.metric("Skor Rata-rata", "4.21/5.00", delta="Sangat Baik")
+            avg_overall = stats.get("avg_overall", float("nan"))
+            st.metric("Skor Rata-rata", f"{avg_overall:.2f}/5.00",
+                      delta=bands.SCHEMES["evaluation"].name_of(avg_overall))
 
         with col3:
-            st.metric("Total Soal Dihasilkan", "26", delta="5 Mata Kuliah")
+            st.metric("Total Soal Dihasilkan", assessments.get("count", 0),
+                      delta=f"{len(assessments.get('subjects', []))} Mata Kuliah")
 
         with col4:
             st.metric(
                 label="RAG Success Rate",
-                value="74.1%",
-                delta="100 Query"
+                value=f"{success_rate:.1f}%",
+                delta=f"{n_queries} Query"
             )
         
         st.markdown("---")
 
-        # Two column layout for charts (static data for instant load)
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("### 📊 Distribusi Skor Evaluasi")
 
-            # Static chart data
+            evaluation_bands = bands.SCHEMES["evaluation"]
             chart_data = pd.DataFrame({
-                "Kategori": ["Sangat Baik", "Baik", "Perlu Perbaikan"],
-                "Jumlah": [28, 19, 3]
+                "Kategori": evaluation_bands.names,
+                "Jumlah": [stats.get("excellent_count", 0), stats.get("good_count", 0),
+                           stats.get("needs_improvement", 0)]
             })
             st.bar_chart(chart_data.set_index("Kategori"))
 
             # Legend
-            st.markdown("""
-            | Kategori | Jumlah |
-            |----------|--------|
-            | 🌟 Sangat Baik (≥4.25) | 28 |
-            | ✅ Baik (3.5-4.24) | 19 |
-            | ⚠️ Perlu Perbaikan (<3.5) | 3 |
-            """)
+            legend = "\n".join(
+                f"| {icon} {label} | {count} |"
+                for icon, label, count in zip(["🌟", "✅", "⚠️"], evaluation_bands.labels, chart_data["Jumlah"])
+            )
+            st.markdown("| Kategori | Jumlah |\n|----------|--------|\n" + legend)
 
         with col2:
             st.markdown("### 📈 Skor Per Aspek Evaluasi")
 
-            # Static data
             aspect_df = pd.DataFrame({
-                "Aspek": ["Relevansi Materi", "Kesesuaian Kesulitan", "Struktur Soal", "Nilai Pedagogis", "**Rata-rata Overall**"],
-                "Skor": [4.25, 4.17, 4.29, 4.15, 4.21]
+                "Aspek": list(overview.ASPECTS.values()) + ["**Rata-rata Overall**"],
+                "Skor": [stats.get(key, float("nan")) for key in
+                         ("avg_relevance", "avg_difficulty_match", "avg_structure", "avg_pedagogical", "avg_overall")]
             })
 
-            st.dataframe(
-                aspect_df.style.format({"Skor": "{:.2f}"}).background_gradient(
-                    cmap="Blues", subset=["Skor"], vmin=1, vmax=5
-                ),
-                width="stretch",
-                hide_index=True
+            render_table_view(
+                table_view.TableView(aspect_df, {"Skor": ("Blues", 1, 5)}), "aspect_scores",
+                formats={"Skor": "{:.2f}"}
             )
 
             # Show image if available
-            img_path = BASE_PATH / "grafik_skor_per_aspek.png"
+            img_path = data_dir() / "grafik_skor_per_aspek.png"
             if img_path.exists():
                 st.image(str(img_path), caption="Grafik Skor Expert Evaluation per Aspek")
 
         st.markdown("---")
 
-        # RAG Retrieval Summary (static data for instant load)
         st.markdown("### 🔍 Efektivitas Retrieval RAG per Mata Kuliah")
 
-        # Static RAG data
-        rag_df = pd.DataFrame({
-            "Mata Kuliah": ["Algoritma dan Pemrograman", "Basis Data", "OOP", "Pemrograman Mobile", "Pemrograman Website"],
-            "P(relevant)": [82.5, 78.3, 75.1, 71.2, 68.9],
-            "Response Time (ms)": [285, 312, 298, 325, 301]
-        })
-
-        st.dataframe(
-            rag_df.style.format({
+        render_table_view(
+            table_view.TableView(rag_df, {"P(relevant)": ("Greens", 0, 100)}), "overview_retrieval",
+            formats={
                 "P(relevant)": "{:.2f}%",
                 "Response Time (ms)": "{:.0f}"
-            }).background_gradient(
-                cmap="Greens", subset=["P(relevant)"], vmin=0, vmax=100
-            ),
-            width="stretch",
-            hide_index=True
+            }
         )
 
         st.info("💡 **Detail data lengkap tersedia di menu Efektivitas RAG**")
 
     # ==================== EVALUASI EXPERT ====================
     elif section == "📋 Evaluasi Expert":
-        # Lazy load: only load data needed for this section
-        evaluations = load_evaluations()
+        eval_frame = load_evaluation_frame()
 
         st.markdown("## 📋 Hasil Evaluasi Expert")
-        st.info("**9 evaluator** melakukan evaluasi terhadap **26 sampel soal** yang dihasilkan sistem, menghasilkan **50 evaluasi** total.")
+        n_evaluators, n_samples, n_evaluations = evaluation_counts(eval_frame)
+        st.info(f"**{n_evaluators} evaluator** melakukan evaluasi terhadap **{n_samples} sampel soal** yang dihasilkan sistem, "
+                f"menghasilkan **{n_evaluations} evaluasi** total.")
+
+        if eval_frame.empty:
+            st.warning("Belum ada data evaluasi expert (Data_Evaluasi_Expert.json).")
+        else:
+            # Group indexes are built once per data version; each filter combination's view is memoized
+            eval_index = load_evaluation_index()
 
-        if evaluations:
-            df_eval = pd.DataFrame(evaluations)
-            
             # Filters in columns
             col1, col2, col3 = st.columns(3)
             with col1:
                 selected_matkul = st.selectbox(
                     "Filter Mata Kuliah:",
-                    ["Semua"] + sorted(df_eval["mata_kuliah"].unique().tolist())
+                    ["Semua"] + eval_index.values("mata_kuliah")
                 )
             with col2:
                 selected_evaluator = st.selectbox(
                     "Filter Evaluator:",
-                    ["Semua"] + sorted(df_eval["evaluator_name"].unique().tolist())
+                    ["Semua"] + eval_index.values("evaluator_name")
                 )
             with col3:
                 selected_difficulty = st.selectbox(
@@ -470,55 +1150,51 @@ def main():
                     ["Semua", "Mudah", "Sedang", "Sulit"]
                 )
             
-            # Apply filters
-            filtered_df = df_eval.copy()
-            if selected_matkul != "Semua":
-                filtered_df = filtered_df[filtered_df["mata_kuliah"] == selected_matkul]
-            if selected_evaluator != "Semua":
-                filtered_df = filtered_df[filtered_df["evaluator_name"] == selected_evaluator]
-            if selected_difficulty != "Semua":
-                filtered_df = filtered_df[filtered_df["difficulty"] == selected_difficulty]
-            
-            st.markdown(f"### Menampilkan {len(filtered_df)} evaluasi")
-            
-            # Display table
-            display_cols = [
-                "evaluator_name", "mata_kuliah", "topic", "difficulty",
-                "relevance", "difficulty_match", "structure", "pedagogical_value",
-                "overall", "interpretation"
-            ]
+            filters = tuple((column, value) for column, value in (
+                ("mata_kuliah", selected_matkul),
+                ("evaluator_name", selected_evaluator),
+                ("difficulty", selected_difficulty),
+            ) if value != "Semua")
+            view = load_evaluation_view(filters)
+
+            st.markdown(f"### Menampilkan {len(view['table'])} evaluasi")
+            st.caption(" · ".join(
+                f"{label}: {count}" for label, count in zip(bands.SCHEMES["evaluation"].labels, view["band_counts"])
+            ))
             
-            st.dataframe(
-                filtered_df[display_cols].rename(columns={
-                    "evaluator_name": "Evaluator",
-                    "mata_kuliah": "Mata Kuliah",
-                    "topic": "Topik",
-                    "difficulty": "Kesulitan",
-                    "relevance": "Relevansi",
-                    "difficulty_match": "Kesesuaian",
-                    "structure": "Struktur",
-                    "pedagogical_value": "Pedagogis",
-                    "overall": "Overall",
-                    "interpretation": "Interpretasi"
-                }).style.format({
+            # Display table: one page at a time, colours precomputed in the view
+            render_table_view(
+                view["table"], f"evaluations_{'_'.join(value for _, value in filters)}",
+                formats={
                     "Relevansi": "{:.0f}",
                     "Kesesuaian": "{:.0f}",
                     "Struktur": "{:.0f}",
                     "Pedagogis": "{:.0f}",
                     "Overall": "{:.2f}"
-                }).background_gradient(cmap="RdYlGn", subset=["Overall"], vmin=1, vmax=5),
-                width="stretch",
-                hide_index=True
+                }
             )
             
-            # Comments section
+            # Per-group statistics from the running aggregates, which include inbox deltas
+            with st.expander("📊 Statistik per Kelompok (termasuk data inbox)"):
+                group_column = st.selectbox(
+                    "Kelompokkan menurut:", list(EVALUATION_GROUP_LABELS),
+                    format_func=EVALUATION_GROUP_LABELS.get, key="evaluation_group_column"
+                )
+                group_stats = overview.group_summary(load_overview().get("evaluations", {}), group_column)
+                st.dataframe(
+                    group_stats.rename(columns={
+                        "value": EVALUATION_GROUP_LABELS[group_column], "n": "Jumlah", "mean": "Rata-rata",
+                        "std": "Std", "median": "Median", "p90": "P90",
+                    }).style.format({"Rata-rata": "{:.2f}", "Std": "{:.2f}", "Median": "{:.2f}", "P90": "{:.2f}"}),
+                    width="stretch", hide_index=True
+                )
+                st.caption("Median dan P90 diperkirakan dari sketsa kuantil (galat relatif ≤ 1%).")
+
+            # Comments section: one pre-rendered block of collapsible items per filter combination
             st.markdown("---")
             st.markdown("### 💬 Komentar Evaluator")
-            comments = filtered_df[filtered_df["comments"].str.len() > 0][["evaluator_name", "topic", "comments"]]
-            if not comments.empty:
-                for _, row in comments.iterrows():
-                    with st.expander(f"💬 {row['evaluator_name']} - {row['topic']}"):
-                        st.write(row["comments"])
+            if view["comments"]:
+                st.html(view["comments_html"])
             else:
                 st.info("Tidak ada komentar untuk filter yang dipilih.")
 
@@ -565,60 +1241,40 @@ def main():
         
         # Interpretation thresholds
         st.markdown("**Interpretasi Probabilitas Relevansi:**")
-        col1, col2, col3, col4 = st.columns(4)
-        col1.success("🟢 **≥90%** Sangat Relevan")
-        col2.info("🔵 **70-89%** Relevan")
-        col3.warning("🟡 **50-69%** Cukup Relevan")
-        col4.error("🔴 **<50%** Kurang Relevan")
+        relevance_bands = bands.SCHEMES["relevance"]
+        band_styles = [("success", "🟢"), ("info", "🔵"), ("warning", "🟡"), ("error", "🔴")]
+        for i, (col, label) in enumerate(zip(st.columns(len(relevance_bands)), relevance_bands.labels)):
+            last = i == len(relevance_bands) - 1
+            style, icon = band_styles[-1] if last else band_styles[min(i, len(band_styles) - 2)]
+            getattr(col, style)(f"{icon} **{label}**")
         
         st.markdown("---")
         
         # Query Test Section
-        st.markdown("### 📝 100 Query Test untuk Evaluasi RAG")
-        st.info("**100 query** (20 per mata kuliah) digunakan untuk menguji efektivitas retrieval RAG system.")
-        
-        @st.cache_data
-        def load_queries_from_md():
-            """Load queries from Daftar_Query_Evaluasi.md"""
-            queries = {}
-            current_subject = None
-            try:
-                md_path = BASE_PATH / "Daftar_Query_Evaluasi.md"
-                if not md_path.exists():
-                    return {}
-                
-                with open(md_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith("## 📚"):
-                        # Extract subject name: "## 📚 Algoritma dan Pemrograman (20 Query)" -> "Algoritma dan Pemrograman"
-                        parts = line.replace("## 📚", "").strip().split("(")
-                        current_subject = parts[0].strip()
-                        queries[current_subject] = []
-                    elif line and line[0].isdigit() and ". " in line and current_subject:
-                        # Extract query: "1. Query text" -> "Query text"
-                        query_text = line.split(". ", 1)[1].strip()
-                        queries[current_subject].append(query_text)
-                        
-                return queries
-            except Exception as e:
-                st.warning(f"Gagal memuat daftar query: {e}")
-                return {}
+        catalog = load_query_catalog()
+        per_subject = catalog.groupby("mata_kuliah", sort=False)["no"].nunique()
+        total = int(per_subject.sum())
+        st.markdown(f"### 📝 {total} Query Test untuk Evaluasi RAG")
+        per_subject_note = f" ({per_subject.iloc[0]} per mata kuliah)" if per_subject.nunique() == 1 else ""
+        if catalog.empty:
+            st.info("Daftar query tidak ditemukan (Daftar_Query_Evaluasi.md atau QUERY_TEST*.md).")
+        else:
+            st.info(f"**{total} query**{per_subject_note} digunakan untuk menguji efektivitas retrieval RAG system.")
 
-        # Load queries from MD file
-        queries = load_queries_from_md()
-        
-        # Fallback if empty (prevent errors)
-        if not queries:
-            queries = {}
-        
-        # Display queries per subject
-        for subject, query_list in queries.items():
-            with st.expander(f"📚 {subject} (20 Query)"):
-                for i, q in enumerate(query_list, 1):
-                    st.markdown(f"**{i}.** {q}")
+        # Display queries per subject, with their scores in each retrieval run
+        for subject, queries_df in catalog.groupby("mata_kuliah", sort=False):
+            with st.expander(f"📚 {subject} ({queries_df['no'].nunique()} Query)"):
+                st.dataframe(
+                    queries_df.rename(columns={
+                        "no": "No", "query": "Query", "run": "Run",
+                        "rerank_top1_sigmoid": "P(relevant) Top-1", "faiss_sigmoid": "FAISS",
+                        "total_time_ms": "Response Time (ms)",
+                    }).drop(columns="mata_kuliah").style.format({
+                        "P(relevant) Top-1": "{:.1%}", "FAISS": "{:.3f}", "Response Time (ms)": "{:.0f}",
+                    }, na_rep="–"),
+                    width="stretch",
+                    hide_index=True
+                )
         
         st.markdown("---")
         
@@ -632,20 +1288,31 @@ def main():
         # Retrieval per Subject
         st.markdown("### 📈 Performa Retrieval per Mata Kuliah")
         if not retrieval_data.empty:
-            st.dataframe(
-                retrieval_data.style.format({
+            render_table_view(
+                table_view.TableView(retrieval_data, {"P(relevant)": ("Blues", 0, 100)}), "retrieval_subjects",
+                formats={
                     "P(relevant)": "{:.1f}%",
-                    "Response Time (ms)": "{:.0f}"
-                }).background_gradient(
-                    cmap="Blues", subset=["P(relevant)"], vmin=0, vmax=100
-                ),
-                width="stretch",
-                hide_index=True
+                    "Response Time (ms)": "{:.0f}",
+                    "P95 Response Time (ms)": "{:.0f}"
+                }
             )
             
             st.bar_chart(
                 retrieval_data.set_index("Mata Kuliah")[["P(relevant)"]]
             )
+
+            with st.expander("🎯 Interval Kepercayaan Bootstrap (95%)"):
+                intervals = load_retrieval_intervals()
+                ci_table = pd.DataFrame({
+                    "Mata Kuliah": intervals["group"],
+                    "Metrik": [BOOTSTRAP_METRICS[m][0] for m in intervals["metric"]],
+                    "Estimasi": [BOOTSTRAP_METRICS[m][1].format(v) for m, v in zip(intervals["metric"], intervals["estimate"])],
+                    "CI 95%": [format_interval(row) for row in intervals.to_dict("records")],
+                    "n": intervals["n"],
+                })
+                st.dataframe(ci_table, width="stretch", hide_index=True)
+                st.caption(f"{bootstrap.DEFAULT_REPLICATES:,} replikasi bootstrap; success rate memakai distribusi "
+                           "binomial, rata-rata memakai resampling multinomial.")
         
         st.markdown("---")
 
@@ -653,28 +1320,23 @@ def main():
         st.markdown("### 📊 Distribusi Probabilitas Relevansi")
         
         if not sigmoid_data.empty:
-            # Categorize based on Average Sigmoid Score
-            def get_category(score):
-                if score >= 0.90: return "Sangat Relevan (≥ 90%)"
-                elif score >= 0.70: return "Relevan (70-90%)"
-                elif score >= 0.50: return "Cukup Relevan (50-70%)"
-                else: return "Kurang Relevan (< 50%)"
-            
-            # Use 'rerank_sigmoid' which is 0-1
-            dist_series = sigmoid_data["rerank_sigmoid"].apply(get_category)
-            dist_counts = dist_series.value_counts().reindex([
-                "Sangat Relevan (≥ 90%)", 
-                "Relevan (70-90%)", 
-                "Cukup Relevan (50-70%)", 
-                "Kurang Relevan (< 50%)"
-            ], fill_value=0)
-            
-            total_q = len(sigmoid_data)
-            
+            col1, col2 = st.columns(2)
+            with col1:
+                band_column = st.selectbox("Skor:", list(RELEVANCE_BAND_COLUMNS),
+                                           format_func=RELEVANCE_BAND_COLUMNS.get, key="band_column")
+            with col2:
+                band_subject = st.selectbox(
+                    "Mata Kuliah:", ["Semua"] + sorted(sigmoid_data["mata_kuliah"].unique().tolist()), key="band_subject"
+                )
+
+            filters = () if band_subject == "Semua" else (("mata_kuliah", band_subject),)
+            dist_counts = load_retrieval_band_counts(band_column, filters)
+            total_q = int(dist_counts.sum())
+
             dist_df = pd.DataFrame({
-                "Kategori": dist_counts.index,
-                "Jumlah Query": dist_counts.values,
-                "Persentase": [(x/total_q * 100) for x in dist_counts.values]
+                "Kategori": relevance_bands.labels,
+                "Jumlah Query": dist_counts,
+                "Persentase": dist_counts / max(total_q, 1) * 100
             })
             
             # Format Persentase
@@ -717,6 +1379,37 @@ def main():
                 hide_index=True
             )
 
+            # Tail latency: means hide the slow queries our SLOs are written against
+            st.markdown("**Persentil Latensi (ms)**")
+            latency_percentiles = load_latency_percentiles()
+            latency_subject = st.selectbox(
+                "Mata Kuliah:",
+                ["Semua"] + sorted(sigmoid_data["mata_kuliah"].unique().tolist()),
+                key="latency_filter"
+            )
+            st.dataframe(
+                latency_percentiles[latency_percentiles["Mata Kuliah"] == latency_subject]
+                .drop(columns="Mata Kuliah")
+                .style.format("{:.1f}", subset=["P50", "P90", "P95", "P99", "Max"]),
+                width="stretch",
+                hide_index=True
+            )
+
+            st.markdown("**Histogram Latensi**")
+            latency_stage = st.selectbox(
+                "Komponen:",
+                list(LATENCY_STAGES),
+                format_func=LATENCY_STAGES.get,
+                key="latency_stage"
+            )
+            counts, edges = load_latency_sketches()[(latency_subject, latency_stage)].histogram(bins=30)
+            st.bar_chart(
+                pd.DataFrame({
+                    "Latensi (ms)": (edges[:-1] + edges[1:]) / 2,
+                    "Jumlah Query": counts
+                }).set_index("Latensi (ms)")
+            )
+
         st.markdown("---")
         st.markdown("### 🔬 Perbandingan Skor Retrieval")
         if not sigmoid_data.empty:
@@ -741,48 +1434,29 @@ def main():
             subjects = sorted(sigmoid_data["mata_kuliah"].unique().tolist())
             selected_subject = st.selectbox("Filter Mata Kuliah:", ["Semua"] + subjects, key="sigmoid_filter")
             
-            filtered_sigmoid = sigmoid_data.copy()
-            if selected_subject != "Semua":
-                filtered_sigmoid = filtered_sigmoid[filtered_sigmoid["mata_kuliah"] == selected_subject]
-            
-            # Prepare display dataframe
-            display_df = filtered_sigmoid.copy()
-            display_df["FAISS"] = display_df["faiss_sigmoid"].round(2)
-            display_df["P(relevant)"] = (display_df["rerank_sigmoid"] * 100).round(1).astype(str) + "%"
-            display_df["P(relevant) Top-1"] = (display_df["rerank_top1_sigmoid"] * 100).round(1).astype(str) + "%"
-            
-            # Shorten query text for display (removed, show full)
-            display_df["Query"] = display_df["query"]
-            
-            # Display table
-            display_table = display_df[["mata_kuliah", "Query", "FAISS", "P(relevant)", "P(relevant) Top-1"]].copy()
-            display_table.columns = ["Mata Kuliah", "Query", "FAISS", "P(relevant)", "P(relevant) Top-1"]
-            
-            st.dataframe(
-                display_table,
-                width="stretch",
-                hide_index=True,
-                height=400
+            # Built once per subject; the table is sorted and paged on the server
+            render_table_view(
+                load_retrieval_detail(selected_subject), f"retrieval_detail_{selected_subject}",
+                formats={"FAISS": "{:.2f}", "P(relevant)": "{:.1f}%", "P(relevant) Top-1": "{:.1f}%"}
             )
             
             # Removed st.info count display as per user request
 
     # ==================== HASIL GENERATE SOAL ====================
     elif section == "📄 Hasil Generate Soal":
-        # Lazy load: only load data needed for this section
-        assessments = load_assessments()
+        # Lazy load: only the offset index, content is decoded per expanded soal
+        index = load_assessment_index()
 
         st.markdown("## 📄 Hasil Generate Soal Sistem")
 
-        if assessments:
+        if not index.empty:
             # Statistics
-            total_soal = len(assessments)
-            subjects = sorted(set(a["mata_kuliah"] for a in assessments))
-            
-            complete_count = sum(1 for a in assessments if a.get("metrics", {}).get("structure_compliance", 0) == 1.0)
-            compliance_rate = (complete_count / total_soal * 100) if total_soal > 0 else 0
-            avg_time = sum(a.get("metrics", {}).get("processing_time_s", 0) for a in assessments) / total_soal if total_soal > 0 else 0
-            
+            total_soal = len(index)
+            subjects = sorted(index["mata_kuliah"].unique().tolist())
+
+            compliance_rate = (index["structure_compliance"] == 1.0).mean() * 100
+            avg_time = index["processing_time_s"].mean()
+
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Total Soal", total_soal)
             col2.metric("Mata Kuliah", len(subjects))
@@ -793,14 +1467,11 @@ def main():
             
             # Distribution
             st.markdown("### 📈 Distribusi per Mata Kuliah")
-            subject_counts = {}
-            for a in assessments:
-                subj = a["mata_kuliah"]
-                subject_counts[subj] = subject_counts.get(subj, 0) + 1
-            
+            subject_counts = index["mata_kuliah"].value_counts(sort=False)
+
             dist_df = pd.DataFrame({
-                "Mata Kuliah": list(subject_counts.keys()),
-                "Jumlah Soal": list(subject_counts.values())
+                "Mata Kuliah": subject_counts.index,
+                "Jumlah Soal": subject_counts.values
             }).sort_values("Jumlah Soal", ascending=False)
             
             col1, col2 = st.columns([1, 1])
@@ -811,37 +1482,244 @@ def main():
             
             st.markdown("---")
             
+            # Keyword search
+            st.markdown("### 🔎 Cari Soal")
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                query = st.text_input("Kata kunci (contoh: rekursif, JOIN, abstract class):", key="soal_search")
+            with col2:
+                search_subject = st.selectbox("Filter Mata Kuliah:", ["Semua"] + subjects, key="soal_search_subject")
+            if query:
+                search = load_search_index()
+                subject = None if search_subject == "Semua" else search_subject
+                results = search.search(query, limit=10, subject=subject) if search else []
+                if not results:
+                    st.info("Tidak ada soal yang cocok dengan kata kunci tersebut.")
+                for rank, (doc, score) in enumerate(results, 1):
+                    meta = search.docs[doc]
+                    st.markdown(
+                        f"**{rank}. {meta['topic']}** · {meta['mata_kuliah']} · {meta['difficulty']} · skor {score:.2f}"
+                    )
+                    st.markdown(
+                        search_index.highlight_snippet(search.content(doc), query),
+                        unsafe_allow_html=True
+                    )
+
+            st.markdown("---")
+
             # View soal
             st.markdown("### 📄 Lihat Detail Soal")
             
             detail_subject = st.selectbox("Pilih Mata Kuliah:", subjects)
-            detail_filtered = [a for a in assessments if a["mata_kuliah"] == detail_subject]
-            
-            st.info(f"Menampilkan **{len(detail_filtered)} soal** untuk {detail_subject}")
+            detail_filtered = index[index["mata_kuliah"] == detail_subject]
+            total = len(detail_filtered)
             
-            for i, assessment in enumerate(detail_filtered, 1):
-                topic = assessment.get("topic", "Unknown")
-                difficulty = assessment["difficulty"]
-                
-                with st.expander(f"📄 Soal {i}: {topic} ({difficulty})"):
-                    if "metrics" in assessment:
-                        metrics = assessment["metrics"]
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Processing Time", f"{metrics.get('processing_time_s', 0):.1f}s")
-                        col2.metric("Has Soal", "✅" if metrics.get('has_soal') else "❌")
-                        col3.metric("Has Kunci", "✅" if metrics.get('has_kunci_jawaban') else "❌")
-                    
-                    st.markdown("---")
-                    st.markdown(assessment.get("content", "No content"))
+            st.info(f"Menampilkan **{total} soal** untuk {detail_subject}")
+
+            # Only the visible page is rendered and sent; each soal's HTML is cached per data version
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                page_size = st.selectbox("Soal per halaman:", SOAL_PAGE_SIZES, key="soal_page_size")
+            total_pages = max(1, -(-total // page_size))
+            with col2:
+                page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1,
+                                       key=f"soal_page_{detail_subject}_{page_size}")
+            first = (page - 1) * page_size
+            st.caption(f"Soal {first + 1 if total else 0}–{min(total, first + page_size)} dari {total} "
+                       f"(halaman {page}/{total_pages}) · klik judul soal untuk membuka isinya")
+            st.html(render_soal_page(index, detail_filtered.iloc[first:first + page_size], first + 1))
         else:
             st.error("Data assessments tidak dapat dimuat.")
     
+    # ==================== PERBANDINGAN RUN ====================
+    elif section == "🔀 Perbandingan Run":
+        runs = load_retrieval_runs()
+
+        st.markdown("## 🔀 Perbandingan Run Retrieval")
+
+        if len(runs) < 2:
+            st.info("Perbandingan membutuhkan minimal dua file hasil retrieval di hasil/.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                baseline = st.selectbox("Baseline:", list(runs), key="compare_baseline")
+            with col2:
+                candidates = [name for name in runs if name != baseline]
+                compared = st.multiselect("Dibandingkan dengan:", candidates, default=candidates, key="compare_runs")
+            with col3:
+                metric = st.selectbox("Metrik:", list(run_compare.METRICS),
+                                      format_func=lambda m: run_compare.METRICS[m][0], key="compare_metric")
+
+            st.caption("Query dicocokkan per (mata kuliah, query ternormalisasi); query yang terpotong \"...\" "
+                       "dicocokkan dengan prefiksnya bila hanya ada satu kandidat.")
+
+            if compared:
+                pairs, summary = load_run_comparison(baseline, tuple(compared), metric)
+                metric_label, higher_is_better = run_compare.METRICS[metric]
+
+                st.markdown("### 📊 Ringkasan per Run")
+                summary_df = summary.rename(columns={
+                    "run": "Run", "queries_base": "Query Baseline", "queries_run": "Query Run",
+                    "matched": "Cocok", "exact": "Exact", "prefix": "Prefix",
+                    "wins": "Menang", "losses": "Kalah", "ties": "Seri",
+                    **{f"mean_delta_{m}": f"Δ {label}" for m, (label, _) in run_compare.METRICS.items()},
+                })
+                st.dataframe(
+                    summary_df.style.format({f"Δ {label}": "{:+.4f}" for label, _ in run_compare.METRICS.values()}),
+                    width="stretch",
+                    hide_index=True
+                )
+                st.caption(f"Menang/Kalah dihitung dari {metric_label} "
+                           f"({'lebih tinggi' if higher_is_better else 'lebih rendah'} lebih baik).")
+
+                if pairs.empty:
+                    st.warning("Tidak ada query yang cocok antara run yang dipilih.")
+                else:
+                    st.markdown(f"### 📚 Δ {metric_label} per Mata Kuliah")
+                    per_subject = pairs.groupby(["run", "mata_kuliah"])[f"delta_{metric}"].agg(["count", "mean", "median"])
+                    per_subject = per_subject.reset_index().rename(columns={
+                        "run": "Run", "mata_kuliah": "Mata Kuliah", "count": "Query Cocok",
+                        "mean": "Δ Rata-rata", "median": "Δ Median",
+                    })
+                    st.dataframe(
+                        per_subject.style.format({"Δ Rata-rata": "{:+.4f}", "Δ Median": "{:+.4f}"}),
+                        width="stretch",
+                        hide_index=True
+                    )
+
+                    st.markdown("### 📉 Regresi Terbesar")
+                    regressions = run_compare.biggest_regressions(pairs, metric, limit=10)
+                    if regressions.empty:
+                        st.success("Tidak ada query yang memburuk.")
+                    else:
+                        st.dataframe(
+                            regressions[["run", "mata_kuliah", "query", "match",
+                                         f"{metric}_base", f"{metric}_run", f"delta_{metric}"]].rename(columns={
+                                "run": "Run", "mata_kuliah": "Mata Kuliah", "query": "Query", "match": "Cocok",
+                                f"{metric}_base": "Baseline", f"{metric}_run": "Run Ini", f"delta_{metric}": "Δ",
+                            }).style.format({"Baseline": "{:.4f}", "Run Ini": "{:.4f}", "Δ": "{:+.4f}"}),
+                            width="stretch",
+                            hide_index=True
+                        )
+
+    # ==================== PROFIL PIPELINE ====================
+    elif section == "⚙️ Profil Pipeline":
+        # Lazy load: only load data needed for this section
+        perf = load_pipeline_performance()
+
+        st.markdown("## ⚙️ Profil Pipeline Generate Soal")
+
+        if perf.empty:
+            st.warning("Belum ada log performa pipeline (Log_Performa_*.csv).")
+        else:
+            stage_cols = list(PIPELINE_STAGES) + ["overhead_ms"]
+            stage_labels = {**PIPELINE_STAGES, "overhead_ms": "Lainnya"}
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Dokumen Diproses", len(perf))
+            col2.metric("Rata-rata Total", f"{perf['total_ms'].mean() / 1000:.1f}s")
+            col3.metric("Throughput", f"{len(perf) / (perf['total_ms'].sum() / 3_600_000):.0f} soal/jam")
+            col4.metric("Porsi LLM", f"{perf['llm_ms'].sum() / perf['total_ms'].sum() * 100:.1f}%")
+
+            st.markdown("---")
+
+            # Share of wall time per stage
+            st.markdown("### 🧮 Porsi Waktu per Tahap")
+            totals = perf[stage_cols].sum()
+            share_df = pd.DataFrame({
+                "Tahap": [stage_labels[c] for c in stage_cols],
+                "Rata-rata (ms)": perf[stage_cols].mean().values,
+                "P95 (ms)": perf[stage_cols].quantile(0.95).values,
+                "Porsi Waktu": (totals / perf["total_ms"].sum() * 100).values
+            })
+            col1, col2 = st.columns([3, 2])
+            with col1:
+                st.dataframe(
+                    share_df.style.format({
+                        "Rata-rata (ms)": "{:.2f}",
+                        "P95 (ms)": "{:.2f}",
+                        "Porsi Waktu": "{:.2f}%"
+                    }),
+                    width="stretch",
+                    hide_index=True
+                )
+            with col2:
+                st.bar_chart(share_df.set_index("Tahap")[["Porsi Waktu"]])
+
+            st.markdown("---")
+
+            # Per-run waterfall
+            st.markdown("### 🌊 Waterfall per Dokumen")
+            run_labels = (perf["log"].astype(str) + " · " + perf["filename"].astype(str)).tolist()
+            run = st.selectbox("Pilih dokumen:", range(len(perf)), format_func=run_labels.__getitem__, key="pipeline_run")
+            durations = perf.loc[run, stage_cols].astype(float).to_numpy()
+            ends = np.cumsum(durations)
+            waterfall_df = pd.DataFrame({
+                "Tahap": [stage_labels[c] for c in stage_cols],
+                "Mulai (ms)": ends - durations,
+                "Selesai (ms)": ends,
+                "Durasi (ms)": durations
+            })
+            log_scale = st.toggle("Skala logaritmik", value=True, key="pipeline_log_scale")
+            st.vega_lite_chart(
+                waterfall_df.assign(**{"Mulai (ms)": waterfall_df["Mulai (ms)"].clip(lower=1)} if log_scale else {}),
+                {
+                    "mark": {"type": "bar", "cornerRadius": 3},
+                    "encoding": {
+                        "y": {"field": "Tahap", "type": "nominal", "sort": None},
+                        "x": {"field": "Mulai (ms)", "type": "quantitative",
+                              "scale": {"type": "log"} if log_scale else {}},
+                        "x2": {"field": "Selesai (ms)"},
+                        "color": {"field": "Tahap", "type": "nominal", "legend": None},
+                        "tooltip": [{"field": "Tahap"}, {"field": "Durasi (ms)", "format": ".2f"}]
+                    }
+                },
+                width="stretch"
+            )
+
+            st.markdown("---")
+
+            # Breakdown per subject / difficulty
+            st.markdown("### 🗂️ Rincian per Mata Kuliah dan Kesulitan")
+            group_by = st.radio("Kelompokkan berdasarkan:", ["mata_kuliah", "difficulty"],
+                                format_func={"mata_kuliah": "Mata Kuliah", "difficulty": "Kesulitan"}.get,
+                                horizontal=True, key="pipeline_group")
+            breakdown = perf.groupby(group_by, observed=True).agg(
+                **{"Jumlah": ("total_ms", "size")},
+                **{stage_labels[c]: (c, "mean") for c in stage_cols},
+                **{"Total (ms)": ("total_ms", "mean")}
+            ).reset_index().rename(columns={"mata_kuliah": "Mata Kuliah", "difficulty": "Kesulitan"})
+            st.dataframe(
+                breakdown.style.format("{:.1f}", subset=[stage_labels[c] for c in stage_cols] + ["Total (ms)"]),
+                width="stretch",
+                hide_index=True
+            )
+
+            st.markdown("---")
+
+            # What drives LLM time
+            st.markdown("### 🔗 Korelasi Waktu LLM")
+            drivers = [c for c in ["output_length", "num_contexts", "num_chunks"] if c in perf]
+            corr_df = pd.DataFrame({
+                "Variabel": drivers,
+                "Korelasi Pearson (r)": [perf["llm_ms"].corr(perf[c].astype(float)) for c in drivers]
+            })
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                st.dataframe(corr_df.style.format({"Korelasi Pearson (r)": "{:.3f}"}), width="stretch", hide_index=True)
+            with col2:
+                # Plot against the first driver the log has (output_length when present)
+                if drivers:
+                    st.scatter_chart(perf, x=drivers[0], y="llm_ms", color="difficulty" if "difficulty" in perf else None)
+                else:
+                    st.info("Log tidak memuat output_length, num_contexts atau num_chunks.")
+
     # ==================== DATA MENTAH ====================
     elif section == "📈 Data Mentah":
         st.markdown("## 📈 Data Mentah Penelitian")
         
         # Get list of files in hasil directory
-        data_files = sorted([f for f in BASE_PATH.iterdir() if f.suffix in ['.csv', '.json']], key=lambda x: x.name)
+        data_files = sorted([f for f in data_dir().iterdir() if f.suffix in ['.csv', '.json']], key=lambda x: x.name)
         
         if not data_files:
             st.warning("Belum ada data mentah yang tersedia.")
@@ -866,33 +1744,58 @@ def main():
             with col1:
                 selected_file_name = st.selectbox("Pilih file untuk dilihat:", [f.name for f in data_files])
             
-            selected_file_path = BASE_PATH / selected_file_name
-            
-            # Prepare data for download and preview
-            data_to_download = None
-            mime_type = "text/plain"
-            
+            selected_file_path = data_dir() / selected_file_name
+            mime_type = {".csv": "text/csv", ".json": "application/json"}.get(selected_file_path.suffix, "text/plain")
+
             try:
-                if selected_file_path.suffix == '.csv':
-                    df = pd.read_csv(selected_file_path)
-                    st.dataframe(df, width="stretch")
-                    data_to_download = df.to_csv(index=False).encode('utf-8')
-                    mime_type = "text/csv"
-                    
-                elif selected_file_path.suffix == '.json':
-                    with open(selected_file_path, 'r', encoding='utf-8') as f:
-                        json_data = json.load(f)
-                    st.json(json_data, expanded=False)
-                    data_to_download = json.dumps(json_data, indent=2).encode('utf-8')
-                    mime_type = "application/json"
-                
+                # Preview one page at a time from a cached row/record offset index
+                version = file_version(selected_file_name)
+                is_records = selected_file_path.suffix == '.csv' or json_index.is_array(
+                    json_index.open_buffer(selected_file_path)
+                )
+
+                if not version[1]:
+                    st.info("File ini kosong.")
+                elif is_records:
+                    if selected_file_path.suffix == '.csv':
+                        offsets = load_csv_row_offsets(version)
+                        total_rows = max(len(offsets) - 2, 0)  # row 0 is the header
+                    else:
+                        spans = load_json_record_spans(version)
+                        total_rows = len(spans)
+
+                    pcol1, pcol2 = st.columns([1, 1])
+                    with pcol1:
+                        page_size = st.selectbox("Baris per halaman:", PREVIEW_PAGE_SIZES, key="raw_page_size")
+                    total_pages = max(1, -(-total_rows // page_size))
+                    with pcol2:
+                        page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, key="raw_page")
+                    first = (page - 1) * page_size
+                    last = min(total_rows, first + page_size)
+                    st.caption(f"Menampilkan baris {first + 1 if total_rows else 0}–{last} dari {total_rows} (halaman {page}/{total_pages})")
+
+                    if selected_file_path.suffix == '.csv':
+                        st.dataframe(csv_index.read_rows(selected_file_path, offsets, first, page_size), width="stretch")
+                    else:
+                        st.json(
+                            [json_index.read_span(selected_file_path, span) for span in spans[first:last]],
+                            expanded=False
+                        )
+                elif selected_file_path.stat().st_size <= PREVIEW_MAX_DOCUMENT_BYTES:
+                    st.json(json_index.read_span(selected_file_path, (0, selected_file_path.stat().st_size)), expanded=False)
+                else:
+                    with open(selected_file_path, "r", encoding="utf-8", errors="replace") as f:
+                        st.code(f.read(64 * 1024), language="json")
+                    st.caption("File terlalu besar untuk preview penuh; menampilkan 64 KB pertama.")
+
                 with col2:
                     st.write("") # Spacer to align button
                     st.write("") 
-                    if data_to_download:
+                    # Hand out the original bytes: no parse / re-serialize round trip
+                    with open(selected_file_path, "rb") as f:
                         st.download_button(
                             label="⬇️ Download File",
-                            data=data_to_download,
+                            data=f,
                             file_name=selected_file_name,
                             mime=mime_type,
                             type="primary",
@@ -901,6 +1804,14 @@ def main():
             except Exception as e:
                 st.error(f"Gagal memuat file: {e}")
     
+    summary = instrumentation.end_run(section)
+    # Count a visit when the session switches section, not on every widget rerun
+    if st.session_state.get("_last_section") != section:
+        st.session_state["_last_section"] = section
+        load_popularity().record(section)
+    if DEBUG_PANEL or st.query_params.get("debug") == "1":
+        render_debug_panel(summary)
+
     # Footer
     st.markdown("---")
     st.markdown("""
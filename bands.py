@@ -0,0 +1,104 @@
+"""
+Vectorized score banding with configurable thresholds.
+
+A band scheme is a list of ``(lower bound, name)`` pairs, highest band first.
+The last band has no lower bound. ``BandScheme.codes`` bins a whole column
+with one ``np.searchsorted`` call, and ``counts`` reduces the codes with
+``np.bincount``, so no Python code runs per row. Thresholds can be overridden
+from a JSON file named by ``DASHBOARD_BANDS``:
+
+    {"relevance": [[0.9, "Sangat Relevan"], [0.7, "Relevan"], [0.5, "Cukup Relevan"], [null, "Kurang Relevan"]]}
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SCHEMES = {
+    # Probability-like retrieval scores (rerank sigmoid, top-1 sigmoid, FAISS cosine), 0-1
+    "relevance": [(0.90, "Sangat Relevan"), (0.70, "Relevan"), (0.50, "Cukup Relevan"), (None, "Kurang Relevan")],
+    # Expert overall score, 1-5; the evaluation statistics expect exactly three bands
+    "evaluation": [(4.25, "Sangat Baik"), (3.5, "Baik"), (None, "Perlu Perbaikan")],
+}
+
+# How each scheme's bounds appear in band labels: number format and unit
+BOUND_FORMATS = {
+    "relevance": (lambda v: f"{v * 100:.0f}", "%"),
+    "evaluation": (lambda v: f"{v:g}", ""),
+}
+
+FIXED_BAND_COUNTS = {"evaluation": 3}
+
+
+class BandScheme:
+    """Ordered score bands; band 0 is the highest"""
+
+    def __init__(self, bands, fmt=str, unit=""):
+        bounds = [bound for bound, _ in bands[:-1]]
+        if not bands or bands[-1][0] is not None or any(b is None for b in bounds):
+            raise ValueError("Only the last band may (and must) have no lower bound")
+        if any(a <= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("Band lower bounds must be strictly decreasing")
+        self.bands = [(bound, name) for bound, name in bands]
+        self.names = [name for _, name in bands]
+        self.bounds = np.asarray(bounds[::-1], dtype=np.float64)   # ascending, for searchsorted
+        self.fmt = fmt
+        self.unit = unit
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def labels(self):
+        """Band names with their ranges, e.g. "Relevan (70-90%)" """
+        labels = []
+        for i, (bound, name) in enumerate(self.bands):
+            upper = self.fmt(self.bands[i - 1][0]) if i else None
+            if i == 0 and bound is not None:
+                labels.append(f"{name} (≥ {self.fmt(bound)}{self.unit})")
+            elif bound is None:
+                labels.append(f"{name} (< {upper}{self.unit})" if i else name)
+            else:
+                labels.append(f"{name} ({self.fmt(bound)}-{upper}{self.unit})")
+        return labels
+
+    def codes(self, values):
+        """Band index of every value (0 = highest band), -1 for NaN"""
+        values = np.asarray(values, dtype=np.float64)
+        codes = (len(self.names) - 1 - np.searchsorted(self.bounds, values, side="right")).astype(np.int64)
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def counts(self, values, mask=None):
+        """Number of values in each band (highest first), optionally only where ``mask``"""
+        codes = self.codes(values)
+        if mask is not None:
+            codes = codes[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self.names))
+
+    def categorize(self, values):
+        """Values as an ordered Categorical of band labels"""
+        return pd.Categorical.from_codes(self.codes(values), categories=self.labels, ordered=True)
+
+    def name_of(self, value):
+        """Band name of a single value (None for NaN)"""
+        code = int(self.codes([value])[0])
+        return self.names[code] if code >= 0 else None
+
+
+def load_schemes(path=None):
+    """Default schemes, with any overridden in the JSON file at ``path``"""
+    bands = dict(DEFAULT_SCHEMES)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+        for name, scheme in overrides.items():
+            if name in FIXED_BAND_COUNTS and len(scheme) != FIXED_BAND_COUNTS[name]:
+                raise ValueError(f"Band scheme {name!r} must have {FIXED_BAND_COUNTS[name]} bands")
+            bands[name] = [(bound, label) for bound, label in scheme]
+    return {name: BandScheme(scheme, *BOUND_FORMATS.get(name, (str, ""))) for name, scheme in bands.items()}
+
+
+SCHEMES = load_schemes(os.environ.get("DASHBOARD_BANDS"))
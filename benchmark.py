@@ -0,0 +1,277 @@
+"""
+Benchmark suite for the dashboard loaders and section render paths.
+
+Runs every loader (cache cold and warm) and renders every section of
+``app.main()`` through Streamlit's AppTest, against the bundled hasil/ data
+and synthetic copies scaled by row count (generated by synthetic_data.py).
+Wall time and peak traced memory are written to a JSON results file and
+compared against a stored baseline. Every scale runs on a copy in a temporary
+directory, so cold runs can also wipe the state the dashboard persists next
+to the data (overview totals, search index, snapshot) without touching hasil/.
+
+    python benchmark.py                          # scales 1,10,1000
+    python benchmark.py --scales 1,10,1000,100000 --max-bytes 20e9
+    python benchmark.py --save-baseline          # store results as the baseline
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import synthetic_data
+
+ROOT = Path(__file__).parent
+DEFAULT_DATA_DIR = ROOT / "hasil"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results.json"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+# Loaders benchmarked by name; calculate_evaluation_stats gets the evaluations as input
+LOADERS = [
+    "load_evaluations",
+    "load_assessment_index",
+    "load_retrieval_data_final",
+    "load_rag_effectiveness",
+    "load_sigmoid_analysis",
+    "load_latency_sketches",
+    "load_retrieval_intervals",
+    "load_query_catalog",
+    "load_pipeline_performance",
+    "load_overview",
+    "calculate_evaluation_stats",
+]
+
+
+# ---------------------------------------------------------------- synthetic data
+
+def scaled_size(data_dir, factor):
+    """Approximate bytes of a copy of ``data_dir`` scaled by ``factor``"""
+    return sum(
+        p.stat().st_size * (factor if p.suffix in (".csv", ".json") else 1)
+        for p in Path(data_dir).rglob("*") if p.is_file() and not any(part.startswith(".") for part in p.parts)
+    )
+
+
+def make_scaled_copy(data_dir, target, factor, seed=0):
+    """Generate a synthetic copy of ``data_dir`` in ``target`` with ``factor`` times the rows"""
+    synthetic_data.generate(data_dir, target, scale=factor, seed=seed)
+    return Path(target)
+
+
+# ---------------------------------------------------------------- measurement
+
+def _measure(func, repeat, setup=None):
+    """Median wall time over ``repeat`` runs, then peak traced memory of one more run"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"wall_s": statistics.median(times), "peak_mb": peak / 2**20}
+
+
+def persisted_dirs(keep_snapshot=False):
+    """Directories under a data directory holding state the dashboard persists between processes"""
+    import app
+    import overview
+    import snapshot
+
+    dirs = [Path(overview.OVERVIEW_FILE).parent, Path(app.SEARCH_INDEX_FILE).parent, Path(app.POPULARITY_FILE).parent]
+    return dirs if keep_snapshot else dirs + [Path(snapshot.SNAPSHOT_DIR)]
+
+
+def _clear_caches(data_dir=None, keep_snapshot=False):
+    """Clear the in-process caches and, given ``data_dir``, the state persisted under it"""
+    import streamlit as st
+
+    import datasets
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    datasets.CACHE.clear()
+    if data_dir is not None:
+        for name in persisted_dirs(keep_snapshot):
+            shutil.rmtree(Path(data_dir) / name, ignore_errors=True)
+
+
+def bench_loaders(app, repeat, clear=_clear_caches):
+    results = []
+    for name in LOADERS:
+        func = getattr(app, name)
+        if name == "calculate_evaluation_stats":
+            call = lambda: func(app.load_evaluations())
+        else:
+            call = func
+        results.append({"name": name, "kind": "loader", "cache": "cold", **_measure(call, repeat, clear)})
+        call()
+        results.append({"name": name, "kind": "loader", "cache": "warm", **_measure(call, repeat)})
+    return results
+
+
+def bench_sections(app_path, sections, repeat, clear=_clear_caches):
+    """
+    Time the rerun that renders each section; session start-up is excluded.
+
+    Start-up renders the default section, so for that section the session
+    first switches to another one. Cold runs clear caches after start-up.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for section in sections:
+        state = {}
+
+        def start_session(cold):
+            at = AppTest.from_file(str(app_path), default_timeout=600).run()
+            if at.sidebar.radio[0].value == section:
+                at = at.sidebar.radio[0].set_value(next(s for s in sections if s != section)).run()
+            if cold:
+                clear()
+            state["at"] = at
+
+        def render():
+            at = state["at"].sidebar.radio[0].set_value(section).run()
+            if at.exception:
+                raise RuntimeError(f"{section}: {at.exception[0].value}")
+
+        results.append({"name": section, "kind": "section", "cache": "cold",
+                        **_measure(render, repeat, lambda: start_session(True))})
+        results.append({"name": section, "kind": "section", "cache": "warm",
+                        **_measure(render, repeat, lambda: start_session(False))})
+    return results
+
+
+# ---------------------------------------------------------------- baseline
+
+def compare(results, baseline, tolerance):
+    """Benchmarks slower than baseline by more than ``tolerance`` (fraction)"""
+    key = lambda r: (r["name"], r["kind"], r["cache"], r["scale"])
+    reference = {key(r): r for r in baseline.get("results", []) if "wall_s" in r}
+    regressions = []
+    for r in results:
+        ref = reference.get(key(r))
+        if ref and "wall_s" in r and r["wall_s"] > ref["wall_s"] * (1 + tolerance):
+            regressions.append({**r, "baseline_wall_s": ref["wall_s"], "ratio": r["wall_s"] / ref["wall_s"]})
+    return regressions
+
+
+def _environment():
+    import numpy
+    import pandas
+    import streamlit
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard loaders and sections")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    parser.add_argument("--scales", default="1,10,1000", help="comma-separated row multipliers")
+    parser.add_argument("--max-bytes", type=float, default=2e9, help="skip scales whose data would exceed this size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic scaled copies")
+    parser.add_argument("--no-sections", action="store_true", help="only benchmark loaders")
+    parser.add_argument("--snapshot", action="store_true", help="build a columnar snapshot for each scaled copy")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline")
+    args = parser.parse_args(argv)
+
+    import streamlit  # noqa: F401  (configures its loggers before we quiet them)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    # Background prefetch and ingestion would warm caches behind the cold measurements
+    os.environ["DASHBOARD_PREFETCH"] = "0"
+    sys.path.insert(0, str(ROOT))
+    import app
+    import snapshot
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    results = []
+    workdir = Path(tempfile.mkdtemp(prefix="hasil-bench-"))
+    try:
+        for scale in scales:
+            size = scaled_size(args.data_dir, scale)
+            if size > args.max_bytes:
+                print(f"scale x{scale}: skipped ({size / 1e9:.1f} GB > --max-bytes)")
+                results.append({"name": "*", "kind": "skipped", "cache": "-", "scale": scale, "bytes": size})
+                continue
+
+            target = workdir / f"x{scale}"
+            if scale == 1:
+                data_dir = Path(shutil.copytree(args.data_dir, target, ignore=shutil.ignore_patterns(".*")))
+            else:
+                data_dir = make_scaled_copy(args.data_dir, target, scale, args.seed)
+            clear = functools.partial(_clear_caches, data_dir, args.snapshot)
+            clear()
+            if args.snapshot:
+                snapshot.build_snapshot(data_dir)
+            app.BASE_PATH = data_dir
+            os.environ["HASIL_DIR"] = str(data_dir)
+
+            scale_results = bench_loaders(app, args.repeat, clear)
+            if not args.no_sections:
+                scale_results += bench_sections(ROOT / "app.py", app.SECTIONS, args.repeat, clear)
+            for r in scale_results:
+                r["scale"] = scale
+                print(f"x{scale:<7} {r['kind']:<8} {r['cache']:<5} {r['name']:<30} "
+                      f"{r['wall_s'] * 1000:10.1f} ms {r['peak_mb']:9.1f} MB")
+            results += scale_results
+            shutil.rmtree(data_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": _environment(), "results": results}
+
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    for r in report.get("regressions", []):
+        print(f"REGRESSION x{r['scale']} {r['kind']} {r['cache']} {r['name']}: "
+              f"{r['wall_s'] * 1000:.1f} ms vs {r['baseline_wall_s'] * 1000:.1f} ms ({r['ratio']:.2f}x)")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
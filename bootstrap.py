@@ -0,0 +1,122 @@
+"""
+Batched bootstrap confidence intervals for summary metrics.
+
+All replicates are drawn at once, with no Python loop per replicate:
+
+- Rates (0/1 columns) use the exact bootstrap distribution of a proportion,
+  a binomial draw per replicate.
+- Means of up to ``EXACT_MAX_ROWS`` rows share one resample count matrix
+  (replicates x rows), built with one ``bincount`` over uniformly drawn row
+  indices. Every mean column of the group is then a single matrix product.
+- Means of larger groups bin the rows into ``MAX_BINS`` quantile bins of the
+  first column. Bin counts are drawn as independent Poisson counts (the
+  Poisson bootstrap) and each replicate is normalized by its own total.
+  Each column's within-bin variance is added back as normal noise, so the
+  interval stays close to the row-level bootstrap at a fraction of the cost.
+
+``rng.multinomial`` with ``size=replicates`` is avoided: it loops over the
+replicates one by one.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_REPLICATES = 10_000
+CONFIDENCE = 0.95
+SEED = 0
+
+EXACT_MAX_ROWS = 256
+MAX_BINS = 64
+
+
+def _row_means(values, replicates, rng):
+    """(replicates, columns) bootstrap means from one row-level resample matrix"""
+    n = len(values)
+    rows = rng.integers(0, n, size=(replicates, n))
+    rows += np.arange(replicates)[:, None] * n
+    counts = np.bincount(rows.ravel(), minlength=replicates * n).reshape(replicates, n)
+    return counts @ values / n
+
+
+def _binned_means(values, replicates, rng):
+    """(replicates, columns) bootstrap means of a large group from one resample matrix over bins"""
+    n = len(values)
+    # Rows are binned on the quantiles of the first column; every column shares the bins
+    edges = np.unique(np.quantile(values[:, 0], np.linspace(0, 1, MAX_BINS + 1)[1:-1]))
+    codes = np.searchsorted(edges, values[:, 0], side="right")
+    sizes = np.bincount(codes, minlength=len(edges) + 1).astype(np.float64)
+    keep = sizes > 0
+    sizes = sizes[keep]
+    means = np.empty((len(sizes), values.shape[1]))
+    variances = np.empty_like(means)
+    for j in range(values.shape[1]):
+        sums = np.bincount(codes, weights=values[:, j], minlength=len(keep))[keep]
+        squares = np.bincount(codes, weights=values[:, j] ** 2, minlength=len(keep))[keep]
+        means[:, j] = sums / sizes
+        variances[:, j] = np.maximum(squares / sizes - means[:, j] ** 2, 0.0)
+
+    counts = rng.poisson(sizes, size=(replicates, len(sizes))).astype(np.float64)
+    noise = rng.standard_normal((replicates, values.shape[1])) * np.sqrt(counts @ variances)
+    return (counts @ means + noise) / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+
+def _interval(samples, confidence):
+    alpha = (1 - confidence) / 2
+    return np.quantile(samples, [alpha, 1 - alpha], axis=0)
+
+
+def _empty(column):
+    """Interval row of a metric with no rows"""
+    return {"metric": column, "estimate": np.nan, "low": np.nan, "high": np.nan, "n": 0}
+
+
+def group_intervals(df, means=(), rates=(), replicates=DEFAULT_REPLICATES, confidence=CONFIDENCE, rng=None):
+    """
+    Point estimate and bootstrap interval of each mean and rate column of ``df``.
+
+    Returns a list of dicts: metric, estimate, low, high, n. Metrics without
+    any (non-NaN) rows get NaN estimate and interval with n=0.
+    """
+    rng = rng if rng is not None else np.random.default_rng(SEED)
+    rows = []
+    n = len(df)
+    if not n:
+        return [_empty(column) for column in [*means, *rates]]
+
+    if means:
+        values = df[list(means)].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values).any(axis=1)]
+        if not len(values):
+            rows += [_empty(column) for column in means]
+        else:
+            if len(values) <= EXACT_MAX_ROWS:
+                samples = _row_means(values, replicates, rng)
+            else:
+                samples = _binned_means(values, replicates, rng)
+            low, high = _interval(samples, confidence)
+            for j, column in enumerate(means):
+                rows.append({"metric": column, "estimate": values[:, j].mean(), "low": low[j], "high": high[j],
+                             "n": len(values)})
+
+    for column in rates:
+        flags = df[column].to_numpy(dtype=bool)
+        p = flags.mean()
+        samples = rng.binomial(n, p, size=replicates) / n
+        low, high = _interval(samples, confidence)
+        rows.append({"metric": column, "estimate": p, "low": low, "high": high, "n": n})
+    return rows
+
+
+def intervals(df, means=(), rates=(), by=None, overall="Semua",
+              replicates=DEFAULT_REPLICATES, confidence=CONFIDENCE, seed=SEED):
+    """
+    Bootstrap intervals for the whole frame (group ``overall``) and per ``by`` group.
+
+    Returns a DataFrame with group, metric, estimate, low, high and n.
+    """
+    rng = np.random.default_rng(seed)
+    rows = [{"group": overall, **r} for r in group_intervals(df, means, rates, replicates, confidence, rng)]
+    if by is not None:
+        for group, part in df.groupby(by, observed=True, sort=True):
+            rows += [{"group": group, **r} for r in group_intervals(part, means, rates, replicates, confidence, rng)]
+    return pd.DataFrame(rows, columns=["group", "metric", "estimate", "low", "high", "n"])
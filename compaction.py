@@ -0,0 +1,105 @@
+"""
+Compact in-memory representation of the hasil/ tables.
+
+``compact`` narrows a parsed DataFrame without changing its values as the
+dashboard uses them:
+
+- text columns with few distinct values (subjects, evaluators, difficulty,
+  topics, interpretations) become categoricals;
+- integers are downcast to the smallest type that holds them (ratings to
+  int8);
+- floats become float32 (scores, timings) when their magnitude keeps
+  float32's seven significant digits meaningful.
+
+The snapshot is written from compacted frames, so memory-mapped columns are
+narrow as well. The generation log's long text is not held at all: the
+dashboard indexes it and reads each assessment's content from disk on demand.
+
+``python compaction.py [DATA_DIR ...]`` reports the memory footprint of each
+source, and of each dataset in total, before and after compaction.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+# Floats above this magnitude (e.g. epoch timestamps) stay float64
+FLOAT32_MAX_MAGNITUDE = 2 ** 24
+
+
+def _is_text(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(series.dtype):
+        return True
+    return series.dtype == object and series.dropna().map(type).eq(str).all()
+
+
+def compact_column(series, keep_text=()):
+    """``series`` in its narrowest lossless-enough dtype"""
+    if series.name in keep_text:
+        return series
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy()
+        finite = values[np.isfinite(values)]
+        if not len(finite) or np.abs(finite).max() < FLOAT32_MAX_MAGNITUDE:
+            return series.astype(np.float32)
+        return series
+    if _is_text(series) and series.nunique() <= max(1, CATEGORY_RATIO * len(series)):
+        return series.astype("category")
+    return series
+
+
+def compact(df, keep_text=()):
+    """``df`` with narrow dtypes (see module docstring); columns in ``keep_text`` are left as they are"""
+    columns = {column: compact_column(df[column], keep_text) for column in df.columns}
+    out = pd.DataFrame(columns, index=df.index, copy=False)
+    out.attrs.update(df.attrs)
+    return out
+
+
+def footprint(df):
+    """Bytes held by a DataFrame (deep)"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def report(data_dir):
+    """One row per source of ``data_dir``: rows and MB with default and compact dtypes"""
+    import snapshot
+
+    rows = []
+    for source in snapshot.source_files(data_dir):
+        df = snapshot.tabulate(Path(data_dir) / source)
+        before = footprint(df)
+        after = footprint(compact(df, keep_text=snapshot.LAZY_TEXT_COLUMNS))
+        rows.append({"source": source, "rows": len(df), "default_mb": before / 2**20, "compact_mb": after / 2**20})
+    return pd.DataFrame(rows, columns=["source", "rows", "default_mb", "compact_mb"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory footprint of hasil/ tables before and after compaction")
+    parser.add_argument("data_dirs", nargs="*", default=[str(Path(__file__).parent / "hasil")])
+    args = parser.parse_args(argv)
+
+    for data_dir in args.data_dirs:
+        table = report(data_dir)
+        print(f"== {data_dir}")
+        for row in table.itertuples():
+            print(f"{row.source}: {row.rows} rows, {row.default_mb:.2f} MB -> {row.compact_mb:.2f} MB")
+        before, after = table["default_mb"].sum(), table["compact_mb"].sum()
+        print(f"Total: {before:.2f} MB -> {after:.2f} MB ({after / before:.0%})" if before else "Total: 0 MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Row-offset index over CSV files in hasil/.
+
+Finds the byte offset of every row (newlines inside quoted fields are not
+row breaks) with vectorized chunked scans, so a page of rows can be parsed
+without reading the rows before it.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+import json_index
+
+CHUNK_SIZE = 1 << 26
+
+
+def row_offsets(path, chunk_size=CHUNK_SIZE):
+    """
+    Start offset of every row of ``path`` plus the end of the file.
+
+    Row 0 is the header, so data row ``i`` spans ``offsets[i + 1]`` to
+    ``offsets[i + 2]``.
+    """
+    buf = json_index.open_buffer(path)
+    size = len(buf)
+    starts = [np.zeros(1, dtype=np.int64)]
+    quote_parity = 0
+    for pos in range(0, size, chunk_size):
+        chunk = np.frombuffer(buf, dtype=np.uint8, count=min(chunk_size, size - pos), offset=pos)
+        quotes = np.cumsum(chunk == ord('"'), dtype=np.int64) + quote_parity
+        newlines = np.flatnonzero(chunk == ord("\n"))
+        # A newline ends a row only when it is outside a quoted field
+        breaks = newlines[quotes[newlines] % 2 == 0]
+        starts.append(breaks.astype(np.int64) + pos + 1)
+        quote_parity = int(quotes[-1] % 2) if len(quotes) else quote_parity
+    offsets = np.concatenate(starts)
+    if offsets[-1] != size:
+        offsets = np.append(offsets, size)
+    return offsets
+
+
+def read_rows(path, offsets, first, count):
+    """Parse ``count`` data rows starting at data row ``first``"""
+    n_rows = len(offsets) - 2
+    if n_rows < 0:
+        return pd.DataFrame()  # empty file: not even a header
+    first = max(0, min(first, n_rows))
+    last = min(n_rows, first + count)
+    with open(path, "rb") as f:
+        header = f.read(int(offsets[1]))
+        f.seek(int(offsets[first + 1]))
+        body = f.read(int(offsets[last + 1] - offsets[first + 1]))
+    df = pd.read_csv(io.BytesIO(header + body))
+    df.index = pd.RangeIndex(first, first + len(df))
+    return df
@@ -0,0 +1,144 @@
+"""
+Several result directories served from one dashboard process.
+
+``DASHBOARD_DATASETS`` lists extra result directories, separated by
+``os.pathsep``. Each entry is a path, a ``name=path`` pair or a glob matching
+several directories:
+
+    DASHBOARD_DATASETS="/data/runs/*:baseline=/data/old/hasil" streamlit run app.py
+
+Loader results are accounted per dataset in ``CACHE``. When the estimated
+size of all cached results exceeds ``DASHBOARD_MEMORY_BUDGET_MB``, whole
+datasets are evicted, least recently used first, so switching back to a
+recent dataset stays a cache hit while memory stays bounded however many
+datasets are registered.
+
+The budget is approximate: it bounds the sum of the entries' estimated
+sizes (see instrumentation.estimate_size), not the process's resident
+memory. Snapshot-backed columns are counted at full size although their
+pages are shared and can be dropped by the OS, while parser scratch,
+allocator slack and Streamlit's own state are not counted at all. Evicting
+by RSS would not help either, since freed memory is not always returned to
+the OS. ``rss_bytes`` reports the actual resident size next to the estimate.
+"""
+
+import glob
+import os
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_BUDGET_MB = 1024
+
+
+def discover(default_dir, spec=None):
+    """
+    Registered datasets as an ordered dict of name -> directory.
+
+    ``default_dir`` comes first under its directory name. ``spec`` is the
+    ``DASHBOARD_DATASETS`` value; missing directories are skipped and
+    duplicate names get a numeric suffix.
+    """
+    found = {}
+
+    def register(name, path):
+        path = Path(path)
+        if not path.is_dir() or path.resolve() in (p.resolve() for p in found.values()):
+            return
+        unique, n = name, 2
+        while unique in found:
+            unique, n = f"{name} ({n})", n + 1
+        found[unique] = path
+
+    register(Path(default_dir).name, default_dir)
+    for entry in (spec or "").split(os.pathsep):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, path = entry.partition("=")
+        if not sep:
+            name, path = None, entry
+        for match in sorted(glob.glob(os.path.expanduser(path))) or [path]:
+            register(name or Path(match).name, match)
+    return found
+
+
+def rss_bytes():
+    """Resident set size of this process, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class DatasetCache:
+    """
+    LRU accounting of cached loader results, grouped by dataset.
+
+    ``add`` records an entry with its estimated size and a callable that
+    clears it. ``evict`` drops whole datasets, least recently used first,
+    until the estimated total fits in ``budget_bytes`` (not a bound on
+    RSS); the dataset being served is never evicted.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._entries = {}                 # dataset -> {entry key: (size, clear)}
+        self._used = {}                    # dataset -> last use (monotonic), in LRU order
+        self.evictions = 0
+
+    def touch(self, dataset):
+        """Mark ``dataset`` as the most recently used"""
+        with self._lock:
+            self._used.pop(dataset, None)
+            self._used[dataset] = time.monotonic()
+
+    def add(self, dataset, key, size, clear):
+        with self._lock:
+            self._entries.setdefault(dataset, {})[key] = (size or 0, clear)
+            if dataset not in self._used:
+                self._used[dataset] = time.monotonic()
+
+    def clear(self):
+        """Forget every entry (the caches themselves are cleared by the caller)"""
+        with self._lock:
+            self._entries.clear()
+            self._used.clear()
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(size for entries in self._entries.values() for size, _ in entries.values())
+
+    def evict(self, keep=None):
+        """Evict least recently used datasets (other than ``keep``) while over budget; returns their names"""
+        evicted = []
+        while True:
+            with self._lock:
+                total = sum(size for entries in self._entries.values() for size, _ in entries.values())
+                victims = [d for d in self._used if d != keep and self._entries.get(d)]
+                if total <= self.budget_bytes or not victims:
+                    break
+                dataset = victims[0]
+                entries = self._entries.pop(dataset)
+                self.evictions += 1
+            for _, clear in entries.values():
+                clear()
+            evicted.append(dataset)
+        return evicted
+
+    def table(self):
+        """Per-dataset cached entries and MB, most recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "dataset": dataset,
+                "entries": len(self._entries.get(dataset, {})),
+                "cached_mb": sum(size for size, _ in self._entries.get(dataset, {}).values()) / 2**20,
+                "idle_s": now - used,
+            } for dataset, used in reversed(self._used.items())]
+
+
+# Process-wide, like instrumentation.REGISTRY: app.py is re-executed on every rerun
+CACHE = DatasetCache(float(os.environ.get("DASHBOARD_MEMORY_BUDGET_MB", DEFAULT_BUDGET_MB)) * 2**20)
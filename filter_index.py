@@ -0,0 +1,48 @@
+"""
+Group indexes for filtering a table on equality with a few columns.
+
+``GroupIndex`` keeps, for every value of each indexed column, the sorted row
+positions holding it. A filter combination, a tuple of ``(column, value)``
+pairs, resolves by intersecting the position arrays of its values, smallest
+first, with a binary search of each remaining group. The cost follows the
+size of the smallest group rather than the length of the table, and no
+boolean mask over all rows is built.
+"""
+
+import numpy as np
+import pandas as pd
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class GroupIndex:
+    """Sorted row positions per value of each indexed column"""
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.groups = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            # One stable sort per column: each value's rows are a contiguous, ascending run
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.groups[column] = {
+                value: order[bounds[i]:bounds[i + 1]].astype(np.int64) for i, value in enumerate(uniques)
+            }
+
+    def values(self, column):
+        """Distinct values of an indexed column, sorted"""
+        return list(self.groups[column])
+
+    def rows(self, filters=()):
+        """Ascending row positions matching every ``(column, value)`` pair in ``filters``"""
+        if not filters:
+            return np.arange(self.n_rows, dtype=np.int64)
+        groups = sorted((self.groups[column].get(value, _EMPTY) for column, value in filters), key=len)
+        rows = groups[0]
+        for group in groups[1:]:
+            if not len(rows):
+                break
+            found = np.searchsorted(group, rows)
+            rows = rows[group[np.minimum(found, len(group) - 1)] == rows] if len(group) else _EMPTY
+        return rows
@@ -0,0 +1,132 @@
+"""
+Parallel ingestion of the sources in hasil/.
+
+``python ingest.py [DATA_DIR] [--workers N]`` parses every CSV and JSON source
+on a process pool and compiles the results into the columnar snapshot (see
+snapshot.py), printing the parse time of each file. Files are independent, so
+they are handed out largest first and the cold-load time shrinks with the
+number of cores until the largest file dominates.
+
+Workers return compacted frames (see compaction.py): repetitive text comes
+back as categoricals and numbers in narrow dtypes, so only codes, distinct
+strings and narrow arrays cross the process boundary. Small datasets are
+parsed in-process, where starting a pool would cost more than it saves.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+import compaction
+import snapshot
+
+# Below this many bytes in total, parse in-process instead of starting a pool
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+
+def parse_source(data_dir, source):
+    """Parse one source in a worker; returns the compacted table with the size and hash of the parsed bytes, and its timing"""
+    start = time.perf_counter()
+    parsed = snapshot.parse(Path(data_dir) / source)
+    df = compaction.compact(parsed["table"], keep_text=snapshot.LAZY_TEXT_COLUMNS)
+    return {
+        "source": source,
+        "table": df,
+        "size": parsed["size"],
+        "hash": parsed["hash"],
+        "rows": len(df),
+        "seconds": time.perf_counter() - start,
+        "pid": os.getpid(),
+    }
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def ingest(data_dir, sources=None, workers=None):
+    """
+    Parse ``sources`` (default: every source under ``data_dir``) on up to ``workers`` processes.
+
+    Returns ``(tables, report)``: a dict of source name -> parsed source
+    (table, size and hash, as snapshot.build_snapshot takes them) and one
+    report row per file (source, rows, mb, parse_s, pid), plus the wall time
+    in ``report.attrs["wall_s"]``.
+    """
+    data_dir = Path(data_dir)
+    sources = snapshot.source_files(data_dir) if sources is None else list(sources)
+    sizes = {source: (data_dir / source).stat().st_size for source in sources}
+    # Longest jobs first keeps the pool busy until the end
+    order = sorted(sources, key=sizes.get, reverse=True)
+    workers = min(workers or default_workers(), len(order))
+
+    start = time.perf_counter()
+    if workers <= 1 or sum(sizes.values()) < PARALLEL_MIN_BYTES:
+        results = [parse_source(data_dir, source) for source in order]
+    else:
+        # spawn: the dashboard server is multi-threaded, which fork does not survive safely
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(parse_source, str(data_dir), source) for source in order]
+            results = [future.result() for future in as_completed(futures)]
+
+    tables = {r["source"]: {key: r[key] for key in ("table", "size", "hash")} for r in results}
+    report = pd.DataFrame([{
+        "source": r["source"], "rows": r["rows"], "mb": sizes[r["source"]] / 1e6,
+        "parse_s": r["seconds"], "pid": r["pid"],
+    } for r in results], columns=["source", "rows", "mb", "parse_s", "pid"])
+    report = report.sort_values("parse_s", ascending=False, ignore_index=True)
+    report.attrs["wall_s"] = time.perf_counter() - start
+    return tables, report
+
+
+def stale_sources(data_dir):
+    """Sources that are missing from the snapshot or changed since it was built"""
+    manifest = snapshot.load_manifest(data_dir)
+    return [s for s in snapshot.source_files(data_dir) if not snapshot.is_fresh(data_dir, s, manifest)]
+
+
+def refresh_snapshot(data_dir, workers=None):
+    """
+    Bring the snapshot of ``data_dir`` up to date, parsing only the stale sources.
+
+    The stale sources are parsed on a parallel ingestion; the others keep
+    their column files and manifest entries. Returns the ingestion report,
+    or None when the snapshot was already fresh.
+    """
+    stale = stale_sources(data_dir)
+    if not stale:
+        return None
+    tables, report = ingest(data_dir, sources=stale, workers=workers)
+    snapshot.build_snapshot(data_dir, tables=tables, reuse=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse hasil/ on a process pool and compile the snapshot")
+    parser.add_argument("data_dir", nargs="?", default=str(Path(__file__).parent / "hasil"))
+    parser.add_argument("--workers", type=int, default=default_workers(), help="worker processes (default: cores)")
+    parser.add_argument("--no-snapshot", action="store_true", help="only parse and report, do not write the snapshot")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tables, report = ingest(args.data_dir, workers=args.workers)
+    for row in report.itertuples():
+        print(f"{row.source}: {row.rows} rows, {row.mb:.1f} MB, {row.parse_s:.2f}s")
+    total = report["parse_s"].sum()
+    wall = report.attrs["wall_s"]
+    print(f"Parsed {len(report)} files in {wall:.2f}s ({total:.2f}s of parsing, x{total / wall if wall else 1:.1f})")
+    if not args.no_snapshot:
+        snapshot.build_snapshot(args.data_dir, tables=tables)
+        print(f"Snapshot written to {Path(args.data_dir) / snapshot.SNAPSHOT_DIR} "
+              f"in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
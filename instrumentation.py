@@ -0,0 +1,251 @@
+"""
+Render-time and cache instrumentation for the dashboard.
+
+Every cached loader call records its wall time, whether the cache missed and
+the approximate size of the object it cached; every rerun records the render
+time of the selected section. Section render times are kept in DDSketches,
+so p50/p95 stay cheap for long-lived processes. When a log target is
+configured each rerun is also written as one JSON line:
+
+    DASHBOARD_METRICS_LOG=stderr streamlit run app.py
+    DASHBOARD_METRICS_LOG=/var/log/dashboard/metrics.jsonl streamlit run app.py
+"""
+
+import itertools
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import DDSketch
+
+LOGGER = logging.getLogger("dashboard.metrics")
+
+# Containers larger than this are sized from a sample of their items
+SIZE_SAMPLE = 100
+SIZE_MAX_DEPTH = 4
+
+# Loader calls kept per rerun (loaders called outside a rerun never reset the list)
+RUN_MAX_CALLS = 1000
+
+
+def estimate_size(obj, depth=0):
+    """Approximate bytes held by ``obj`` (DataFrames exactly, containers by sampling)"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if depth >= SIZE_MAX_DEPTH or isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        items = [v for kv in itertools.islice(obj.items(), SIZE_SAMPLE) for v in kv]
+        n = len(obj) * 2
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(itertools.islice(obj, SIZE_SAMPLE))
+        n = len(obj)
+    elif hasattr(obj, "__dict__"):
+        return size + estimate_size(vars(obj), depth + 1)
+    else:
+        return size
+    if not items:
+        return size
+    sampled = sum(estimate_size(item, depth + 1) for item in items)
+    return size + int(sampled * n / len(items))
+
+
+class _LoaderStats:
+    def __init__(self):
+        self.calls = 0
+        self.misses = 0
+        self.seconds = 0.0
+        self.miss_seconds = 0.0
+        self.entries = {}                  # cache key -> approximate bytes
+
+
+class Registry:
+    """Process-wide counters shared by every session"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaders = {}
+        self.sections = {}                 # section -> DDSketch of render ms
+
+    def record_loader(self, name, seconds, miss, key=None, size=None):
+        with self._lock:
+            stats = self.loaders.setdefault(name, _LoaderStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            if miss:
+                stats.misses += 1
+                stats.miss_seconds += seconds
+                if size is not None:
+                    stats.entries[key] = size
+
+    def entry_size(self, name, key):
+        """Recorded bytes of one cache entry of ``name``, or None"""
+        with self._lock:
+            stats = self.loaders.get(name)
+            return stats.entries.get(_cache_key(key)) if stats else None
+
+    def forget_entry(self, name, key):
+        """Drop one recorded cache entry of ``name`` (it was evicted)"""
+        with self._lock:
+            if name in self.loaders:
+                self.loaders[name].entries.pop(_cache_key(key), None)
+
+    def forget_entries(self, name):
+        """Drop the recorded cache entries of ``name`` (its cache was cleared)"""
+        with self._lock:
+            if name in self.loaders:
+                self.loaders[name].entries.clear()
+
+    def record_section(self, section, seconds):
+        """Add a render time and return the section's sketch"""
+        with self._lock:
+            sketch = self.sections.setdefault(section, DDSketch())
+            sketch.add(seconds * 1000)
+            return sketch
+
+    def loader_table(self):
+        """Per-loader calls, hits, misses, timings and cached bytes"""
+        with self._lock:
+            rows = [{
+                "loader": name,
+                "calls": s.calls,
+                "hits": s.calls - s.misses,
+                "misses": s.misses,
+                "hit_rate": (s.calls - s.misses) / s.calls if s.calls else np.nan,
+                "avg_ms": s.seconds / s.calls * 1000 if s.calls else np.nan,
+                "avg_miss_ms": s.miss_seconds / s.misses * 1000 if s.misses else np.nan,
+                "entries": len(s.entries),
+                "cached_mb": sum(s.entries.values()) / 2**20,
+            } for name, s in self.loaders.items()]
+        return pd.DataFrame(rows, columns=["loader", "calls", "hits", "misses", "hit_rate",
+                                           "avg_ms", "avg_miss_ms", "entries", "cached_mb"])
+
+    def section_table(self):
+        """Per-section render count and p50/p95/max in milliseconds"""
+        with self._lock:
+            rows = []
+            for section, sketch in self.sections.items():
+                p50, p95 = sketch.quantiles([0.5, 0.95])
+                rows.append({"section": section, "renders": sketch.count,
+                             "p50_ms": p50, "p95_ms": p95, "max_ms": sketch.max})
+        return pd.DataFrame(rows, columns=["section", "renders", "p50_ms", "p95_ms", "max_ms"])
+
+
+REGISTRY = Registry()
+
+# Loader calls of the rerun running in this thread (Streamlit runs each session's script in its own thread)
+_run = threading.local()
+
+
+def begin_run():
+    """Start collecting loader calls for a new rerun"""
+    _run.calls = []
+    _run.stack = []
+    _run.started = time.perf_counter()
+
+
+def run_calls():
+    """Loader calls recorded so far in this rerun: dicts with loader, ms, miss, depth"""
+    return list(getattr(_run, "calls", []))
+
+
+def mark_miss():
+    """Called from inside a cached function body: the innermost loader call missed"""
+    stack = getattr(_run, "stack", None)
+    if stack:
+        stack[-1]["miss"] = True
+
+
+def _cache_key(args):
+    try:
+        hash(args)
+        return args
+    except TypeError:
+        return repr(args)
+
+
+@contextmanager
+def loader_call(name):
+    """
+    Time one call of loader ``name``.
+
+    The cached function body calls ``mark_miss()``. On a miss, the caller's
+    ``frame["result"]`` is sized and recorded as the cache entry
+    ``frame["key"]``.
+    """
+    stack = getattr(_run, "stack", None)
+    if stack is None:
+        begin_run()
+        stack = _run.stack
+    frame = {"loader": name, "miss": False, "depth": len(stack)}
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        result = frame.pop("result", None)
+        key = _cache_key(frame.pop("key", None))
+        size = estimate_size(result) if frame["miss"] else None
+        REGISTRY.record_loader(name, seconds, frame["miss"], key, size)
+        if len(_run.calls) < RUN_MAX_CALLS:
+            _run.calls.append({**frame, "ms": seconds * 1000})
+
+
+def end_run(section):
+    """
+    Record the render time of ``section`` for the current rerun.
+
+    Returns the rerun summary (also logged as JSON when logging is configured):
+    total, loader and remaining render milliseconds plus the loader calls.
+    """
+    total_ms = (time.perf_counter() - getattr(_run, "started", time.perf_counter())) * 1000
+    calls = run_calls()
+    loader_ms = sum(c["ms"] for c in calls if c["depth"] == 0)
+    sketch = REGISTRY.record_section(section, total_ms / 1000)
+    summary = {
+        "event": "section_render",
+        "section": section,
+        "duration_ms": round(total_ms, 2),
+        "loader_ms": round(loader_ms, 2),
+        "render_ms": round(max(total_ms - loader_ms, 0.0), 2),
+        "cache_misses": sum(c["miss"] for c in calls),
+        "loaders": [{"loader": c["loader"], "ms": round(c["ms"], 2), "miss": c["miss"]}
+                    for c in calls if c["depth"] == 0],
+        "p95_ms": round(sketch.quantile(0.95), 2),
+    }
+    if LOGGER.handlers:
+        LOGGER.info(json.dumps({"ts": time.time(), **summary}, ensure_ascii=False))
+    return summary
+
+
+_configured = set()
+
+
+def configure_logging(target):
+    """Send JSON metric lines to ``target``: "stderr", "stdout" or a file path (once per process)"""
+    if not target or target in _configured:
+        return
+    if target == "stderr":
+        handler = logging.StreamHandler(sys.stderr)
+    elif target == "stdout":
+        handler = logging.StreamHandler(sys.stdout)
+    else:
+        handler = logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
+    _configured.add(target)
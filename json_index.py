@@ -0,0 +1,97 @@
+"""
+Offset index over JSON array files in hasil/.
+
+Scans a top-level JSON array without building the full object tree: every
+record is located by byte range, its small fields are decoded, and large
+fields (e.g. the generated ``content`` markdown) are only recorded as byte
+spans so they can be decoded on demand.
+"""
+
+import json
+import mmap
+import re
+
+# Strings (with escapes) and structural characters; everything else is a scalar
+# whose span is recovered from the surrounding ":" and "," / "}" positions.
+TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}:,]')
+
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+_OPENERS = (ord("{"), ord("["))
+_LBRACE, _RBRACE = ord("{"), ord("}")
+
+
+def scan_records(buf, skip_keys=(), start=0, limit=None, decode=True):
+    """
+    Yield one entry per object in the top-level array of ``buf``.
+
+    Each entry is a dict with ``start``/``end`` byte offsets of the record,
+    ``fields`` (decoded values) and ``spans`` (byte ranges of ``skip_keys``
+    values, left undecoded). ``start`` may point at any record boundary
+    inside the array, which lets callers resume a previous scan. With
+    ``decode=False`` only the record offsets are produced.
+    """
+    depth = 1 if start else 0
+    key = None
+    value_start = None
+    record_start = fields = spans = None
+    emitted = 0
+
+    def finish(end):
+        if not decode:
+            return
+        if key in skip_keys:
+            spans[key] = (value_start, end)
+        else:
+            fields[key] = json.loads(buf[value_start:end])
+
+    for m in TOKEN_RE.finditer(buf, start):
+        c = buf[m.start()]
+        if c == _QUOTE:
+            if depth == 2 and value_start is None:
+                key = m.group()[1:-1].decode("utf-8")
+            continue
+        if c in _OPENERS:
+            if depth == 1 and c == _LBRACE:
+                record_start, fields, spans = m.start(), {}, {}
+            depth += 1
+        elif c == _COLON:
+            if depth == 2:
+                value_start = m.end()
+        elif c == _COMMA:
+            if depth == 2:
+                finish(m.start())
+                value_start = None
+        else:
+            if depth == 2 and value_start is not None:
+                finish(m.start())
+                value_start = None
+            depth -= 1
+            if depth == 1 and c == _RBRACE:
+                yield {"start": record_start, "end": m.end(), "fields": fields, "spans": spans}
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+            elif depth <= 0:
+                return
+
+
+def open_buffer(path):
+    """Memory-map ``path`` read-only (empty files map to b"")"""
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def is_array(buf):
+    """True if the JSON document in ``buf`` is a top-level array"""
+    return buf[:256].lstrip(b"\xef\xbb\xbf \t\r\n")[:1] == b"["
+
+
+def read_span(path, span):
+    """Decode the JSON value stored at ``span`` (start, end) of ``path``"""
+    start, end = span
+    with open(path, "rb") as f:
+        f.seek(start)
+        return json.loads(f.read(end - start))
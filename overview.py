@@ -0,0 +1,419 @@
+"""
+Running aggregates behind the dashboard's summary metrics.
+
+The Overview, the RAG summary and the per-group evaluation statistics need
+only additive aggregates: counts, sums, sums of squares, band counts and
+quantile sketches, overall and per subject, evaluator and difficulty. They
+are persisted in ``hasil/.overview/metrics.json`` with the byte offset
+consumed from each source file. When a source only grew (the bytes before
+that offset are unchanged), just the appended rows are parsed and folded in;
+any other change recomputes that source from scratch.
+
+New results can also be dropped into ``hasil/inbox/`` as deltas: ``*.jsonl``
+files of expert evaluations (one record per line, fields as in
+Data_Evaluasi_Expert.json) and ``*.csv`` files of retrieval rows (columns as
+in Raw_Data_Retrieval.csv). Inbox files are sources like the others, so
+appending lines or adding a file costs time proportional to the new rows,
+not to the history. A line (JSONL record or CSV row) is consumed once it is complete.
+"""
+
+import copy
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import bands
+import json_index
+from quantile_sketch import DDSketch
+
+OVERVIEW_FILE = ".overview/metrics.json"
+FORMAT_VERSION = 3
+
+# Delta files folded into the aggregates, relative to the data directory
+INBOX_DIR = "inbox"
+
+EVALUATIONS_FILE = "Data_Evaluasi_Expert.json"
+ASSESSMENTS_FILE = "Log_Hasil_Generate_Soal.json"
+RETRIEVAL_FILE = "Raw_Data_Retrieval.csv"
+
+# Expert rating aspects and their labels
+ASPECTS = {
+    "relevance": "Relevansi Materi",
+    "difficulty_match": "Kesesuaian Kesulitan",
+    "structure": "Struktur Soal",
+    "pedagogical_value": "Nilai Pedagogis",
+}
+
+# Evaluation columns with per-value aggregates
+EVALUATION_GROUPS = ("mata_kuliah", "evaluator_name", "difficulty")
+
+# A query is a retrieval success when the top-1 rerank probability reaches this
+SUCCESS_THRESHOLD = 0.7
+# ...and a weaker success at this threshold
+WEAK_SUCCESS_THRESHOLD = 0.5
+
+# Retrieval latency columns with quantile sketches
+LATENCY_COLUMNS = ("faiss_time_ms", "rerank_time_ms", "total_time_ms")
+
+CSV_CHUNK_ROWS = 100_000
+
+# Read size when hashing the consumed bytes of a source
+DIGEST_BLOCK = 1 << 20
+
+
+# ---------------------------------------------------------------- aggregates
+
+def _moments(totals, name, values):
+    """Add the sum and sum of squares of ``values`` to ``totals`` as sum_<name> and sumsq_<name>"""
+    values = np.asarray(values, dtype=float)
+    totals[f"sum_{name}"] = float(np.nansum(values))
+    totals[f"sumsq_{name}"] = float(np.nansum(values * values))
+
+
+def _counts(values):
+    """{value: count} of the non-null ``values``, keyed by string so the keys survive JSON"""
+    return {str(value): int(n) for value, n in values.dropna().value_counts(sort=False).items()}
+
+
+def _score_totals(df):
+    """Count, moments, band counts and sketch of the overall score and aspects of some evaluations"""
+    overall = df["overall"].to_numpy(dtype=float)
+    scheme = bands.SCHEMES["evaluation"]
+    totals = {
+        "count": len(df),
+        "band_counts": dict(zip(scheme.names, scheme.counts(overall).tolist())),
+        "sketch_overall": DDSketch().add(overall).to_dict(),
+    }
+    _moments(totals, "overall", overall)
+    for aspect in ASPECTS:
+        _moments(totals, aspect, df[aspect])
+    return totals
+
+
+def evaluation_totals(df):
+    """Additive totals of a DataFrame of expert evaluations, overall and per ``EVALUATION_GROUPS`` value"""
+    if df.empty:
+        return {}
+    totals = _score_totals(df)
+    totals["evaluators"] = _counts(df["evaluator_name"].astype(str))
+    totals["assessments"] = _counts(df["assessment_id"].dropna().astype(int))
+    if "timestamp" in df:
+        stamps = df["timestamp"].dropna().astype(str)
+        if len(stamps):
+            totals["last_timestamp"] = stamps.max()
+    totals["groups"] = {
+        column: {str(value): _score_totals(group) for value, group in df.groupby(column, sort=True, observed=True)}
+        for column in EVALUATION_GROUPS if column in df
+    }
+    return totals
+
+
+def assessment_totals(df):
+    """Additive totals of a DataFrame of generated assessments"""
+    if df.empty:
+        return {}
+    return {"count": len(df), "subjects": _counts(df["mata_kuliah"])}
+
+
+def retrieval_totals(df):
+    """Additive per-subject totals of a DataFrame of raw retrieval results"""
+    if df.empty:
+        return {}
+    probs = 1 / (1 + np.exp(-df[["rerank_avg_score", "rerank_top1"]].to_numpy(dtype=float)))
+    relevance = bands.SCHEMES["relevance"]
+    subjects = df["mata_kuliah"].astype(str).to_numpy()
+    totals = {}
+    for subject in np.unique(subjects):
+        rows = np.flatnonzero(subjects == subject)
+        top1 = probs[rows, 1]
+        subject_totals = {
+            "count": len(rows),
+            "success": int((top1 >= SUCCESS_THRESHOLD).sum()),
+            "success_50": int((top1 >= WEAK_SUCCESS_THRESHOLD).sum()),
+            "band_counts": dict(zip(relevance.names, relevance.counts(top1).tolist())),
+        }
+        _moments(subject_totals, "p_relevant", probs[rows, 0])
+        _moments(subject_totals, "p_top1", top1)
+        _moments(subject_totals, "faiss", df["faiss_avg_score"].to_numpy(dtype=float)[rows])
+        _moments(subject_totals, "time_ms", df["total_time_ms"].to_numpy(dtype=float)[rows])
+        for column in LATENCY_COLUMNS:
+            if column in df:
+                subject_totals[f"sketch_{column}"] = DDSketch().add(df[column].to_numpy(dtype=float)[rows]).to_dict()
+        totals[subject] = subject_totals
+    return totals
+
+
+def merge_totals(a, b):
+    """
+    Fold totals ``b`` into ``a`` in place and return ``a``: numbers add,
+    sketches merge, last_* keep the maximum, nested dicts (including value
+    counts) merge. The cost follows the size of ``b``, not of ``a``.
+    """
+    for key, value in b.items():
+        if key not in a:
+            a[key] = copy.deepcopy(value)
+        elif key.startswith("sketch_"):
+            a[key] = DDSketch.from_dict(a[key]).merge(DDSketch.from_dict(value)).to_dict()
+        elif key.startswith("last_"):
+            a[key] = max(a[key], value)
+        elif isinstance(value, dict):
+            merge_totals(a[key], value)
+        else:
+            a[key] = a[key] + value
+    return a
+
+
+def evaluation_stats(totals):
+    """Evaluation statistics (see app.calculate_evaluation_stats) from evaluation totals"""
+    n = totals.get("count", 0)
+    if not n:
+        return {}
+    excellent, good, needs_improvement = (totals["band_counts"].get(name, 0)
+                                          for name in bands.SCHEMES["evaluation"].names)
+    return {
+        "total_evaluations": n,
+        "unique_evaluators": len(totals["evaluators"]),
+        "unique_assessments": len(totals["assessments"]),
+        "avg_overall": totals["sum_overall"] / n,
+        "avg_relevance": totals["sum_relevance"] / n,
+        "avg_difficulty_match": totals["sum_difficulty_match"] / n,
+        "avg_structure": totals["sum_structure"] / n,
+        "avg_pedagogical": totals["sum_pedagogical_value"] / n,
+        "excellent_count": excellent,
+        "good_count": good,
+        "needs_improvement": needs_improvement,
+    }
+
+
+def group_summary(totals, column):
+    """Per-value n, mean, standard deviation, median, p90 and band counts of the overall score over one ``EVALUATION_GROUPS`` column"""
+    names = bands.SCHEMES["evaluation"].names
+    rows = []
+    for value, t in sorted(totals.get("groups", {}).get(column, {}).items()):
+        n = t["count"]
+        if not n:
+            continue
+        mean = t["sum_overall"] / n
+        # Sample variance from the running moments; clipped against rounding below zero
+        var = max(t["sumsq_overall"] - n * mean * mean, 0.0) / (n - 1) if n > 1 else float("nan")
+        median, p90 = DDSketch.from_dict(t["sketch_overall"]).quantiles([0.5, 0.9])
+        rows.append({"value": value, "n": n, "mean": mean, "std": var ** 0.5, "median": median, "p90": p90,
+                     **{name: t["band_counts"].get(name, 0) for name in names}})
+    return pd.DataFrame(rows, columns=["value", "n", "mean", "std", "median", "p90", *names])
+
+
+def retrieval_summary(totals):
+    """Per-subject P(relevant) (%) and mean response time, plus overall success rate and query count"""
+    rows = [{
+        "Mata Kuliah": subject,
+        "P(relevant)": t["sum_p_relevant"] / t["count"] * 100,
+        "Response Time (ms)": t["sum_time_ms"] / t["count"],
+    } for subject, t in sorted(totals.items()) if t["count"]]
+    queries = sum(t["count"] for t in totals.values())
+    success = sum(t["success"] for t in totals.values())
+    return (pd.DataFrame(rows, columns=["Mata Kuliah", "P(relevant)", "Response Time (ms)"]),
+            success / queries * 100 if queries else float("nan"), queries)
+
+
+# ---------------------------------------------------------------- incremental reads
+
+def _digest(path, end, digest=None, start=0):
+    """
+    Hash of the first ``end`` bytes of ``path``: any edit before the consumed
+    offset changes it. ``digest``, already fed the bytes before ``start``, is
+    extended instead of re-reading them.
+    """
+    digest = digest or hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        f.seek(start)
+        while end > f.tell():
+            block = f.read(min(DIGEST_BLOCK, end - f.tell()))
+            if not block:
+                break
+            digest.update(block)
+    return digest
+
+
+def _appended_json(path, start):
+    """DataFrame of the array records after byte ``start`` of ``path``, and the new consumed offset"""
+    buf = json_index.open_buffer(path)
+    if not json_index.is_array(buf):
+        return pd.DataFrame(), start
+    fields, end = [], start
+    for record in json_index.scan_records(buf, skip_keys=("content", "comments"), start=start):
+        fields.append(record["fields"])
+        end = record["end"]
+    return pd.DataFrame(fields), end
+
+
+def _line_end(path, size):
+    """Offset just past the last newline in the first ``size`` bytes of ``path`` (0 if there is none)"""
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            step = min(DIGEST_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            found = f.read(step).rfind(b"\n")
+            if found >= 0:
+                return pos + found + 1
+    return 0
+
+
+def _appended_csv(path, start):
+    """Chunks of the complete CSV rows after byte ``start`` of ``path``, and the new consumed offset"""
+    size = os.path.getsize(path)
+    # A row still being written is left for the next pass
+    end = _line_end(path, size)
+    if end <= start:
+        return [], start
+    if not start and end == size:
+        return pd.read_csv(path, chunksize=CSV_CHUNK_ROWS), end
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(max(start, len(header)))
+        body = f.read(end - f.tell()) if end > f.tell() else b""
+    if not body.strip():
+        return [], end
+    return pd.read_csv(io.BytesIO(header + body), chunksize=CSV_CHUNK_ROWS), end
+
+
+def _appended_jsonl(path, start):
+    """DataFrame of the complete JSON lines after byte ``start`` of ``path``, and the new consumed offset"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    # A last line without its newline counts once it parses (an object's prefix never does)
+    lines, end = data.splitlines(), len(data)
+    if data and not data.endswith(b"\n"):
+        try:
+            json.loads(lines[-1])
+        except ValueError:
+            lines, end = lines[:-1], data.rfind(b"\n") + 1
+    records = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # a corrupt line is skipped, not retried
+        if isinstance(record, dict):
+            record.pop("comments", None)
+            records.append(record)
+    return pd.DataFrame(records), start + end
+
+
+# Source file -> (aggregate key, reader, totals function) for each aggregate in the snapshot
+SOURCES = {
+    EVALUATIONS_FILE: ("evaluations", _appended_json, evaluation_totals),
+    ASSESSMENTS_FILE: ("assessments", _appended_json, assessment_totals),
+    RETRIEVAL_FILE: ("retrieval", _appended_csv, retrieval_totals),
+}
+
+# Inbox file suffix -> (aggregate key, reader, totals function)
+INBOX_SOURCES = {
+    ".jsonl": ("evaluations", _appended_jsonl, evaluation_totals),
+    ".csv": ("retrieval", _appended_csv, retrieval_totals),
+}
+
+
+def _sources(data_dir):
+    """(name relative to ``data_dir``, key, reader, totals function) of every existing source"""
+    sources = [(name, *spec) for name, spec in SOURCES.items() if (data_dir / name).is_file()]
+    inbox = data_dir / INBOX_DIR
+    for suffix, spec in INBOX_SOURCES.items():
+        sources += [(path.relative_to(data_dir).as_posix(), *spec)
+                    for path in sorted(inbox.glob(f"*{suffix}")) if path.is_file()]
+    return sources
+
+
+def update(data_dir, state=None):
+    """
+    Bring ``state`` up to date with the sources in ``data_dir``.
+
+    Returns the new state and whether anything changed. Each source keeps its
+    own totals; the combined aggregate of a key takes appended rows as a
+    delta and is only rebuilt from the per-source totals when a source of
+    that key is rewritten or removed. A missing source leaves empty totals.
+    """
+    data_dir = Path(data_dir)
+    # Band counts depend on the configured thresholds: recount when they change
+    scheme = [list(band) for band in bands.SCHEMES["evaluation"].bands]
+    if not state or state.get("format_version") != FORMAT_VERSION or state.get("evaluation_bands") != scheme:
+        state = {"format_version": FORMAT_VERSION, "evaluation_bands": scheme, "sources": {}, "totals": {}}
+    changed, stale = False, set()
+    sources = _sources(data_dir)
+
+    present = {name for name, *_ in sources}
+    for name in [name for name in state["sources"] if name not in present]:
+        stale.add(state["sources"].pop(name)["key"])
+        state["totals"].pop(name, None)
+        changed = True
+
+    for name, key, read_appended, totals_of in sources:
+        path = data_dir / name
+        consumed = state["sources"].get(name)
+        size = path.stat().st_size
+        prefix = _digest(path, consumed["end"]) if consumed and size >= consumed["end"] else None
+        if prefix and prefix.hexdigest() == consumed["digest"]:
+            if size == consumed["end"]:
+                continue
+            start = consumed["end"]
+        else:
+            start, prefix = 0, None
+            if consumed:
+                stale.add(key)  # the combined totals still hold the old contents
+
+        appended, end = read_appended(path, start)
+        if start and end == start:
+            continue  # only an incomplete line so far
+        delta = {}
+        for chunk in [appended] if isinstance(appended, pd.DataFrame) else appended:
+            delta = merge_totals(delta, totals_of(chunk))
+        state["totals"][name] = merge_totals(state["totals"].get(name, {}) if start else {}, delta)
+        if key not in stale:
+            state[key] = merge_totals(state.get(key, {}), delta)
+        digest = _digest(path, end, prefix and prefix.copy(), start)
+        state["sources"][name] = {"key": key, "end": end, "digest": digest.hexdigest()}
+        changed = True
+
+    for key in stale:
+        state[key] = {}
+        for name, source in state["sources"].items():
+            if source["key"] == key:
+                state[key] = merge_totals(state[key], state["totals"][name])
+    for key, _, _ in SOURCES.values():
+        if key not in state:
+            state[key] = {}
+            changed = True
+    return state, changed
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def open_overview(data_dir, overview_path=None):
+    """Load the persisted overview state for ``data_dir``, update it and save it back"""
+    overview_path = Path(overview_path or Path(data_dir) / OVERVIEW_FILE)
+    state, changed = update(data_dir, load_state(overview_path))
+    if changed or not overview_path.exists():
+        try:
+            overview_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = overview_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, overview_path)
+        except OSError:
+            pass  # read-only deployment: keep the in-memory state
+    return state
@@ -0,0 +1,124 @@
+"""
+Background warm-up of the dashboard's loader caches.
+
+Sections load their data lazily, so the first visit to a section after a
+deploy pays the full parse cost. ``Prefetcher`` runs the section loaders on a
+small thread pool instead, most popular section first, while the first
+session renders the Overview. Streamlit holds a compute lock per cache key,
+so a user who opens a section mid warm-up waits for the in-flight load
+rather than starting a second one.
+
+Section popularity is counted per process and flushed to a small JSON file
+at most every ``FLUSH_SECONDS``, so the order survives restarts.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+FLUSH_SECONDS = 60
+
+
+class Prefetcher:
+    """
+    Runs ``(name, func)`` tasks on a thread pool, in submission order.
+
+    An optional ``setup`` task runs alone before the others, e.g. to build
+    the files the loaders read. Each task's return value is kept for
+    ``result(name)``.
+    """
+
+    def __init__(self, tasks, max_workers=2, setup=None):
+        self.tasks = list(tasks)
+        self.setup = setup
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._status = {name: {"task": name, "state": "pending", "seconds": None, "error": None}
+                        for name, _ in ([setup] if setup else []) + self.tasks}
+        self._results = {}
+        self._executor = None
+
+    def _run(self, name, func):
+        with self._lock:
+            self._status[name]["state"] = "running"
+        start = time.perf_counter()
+        try:
+            self._results[name] = func()
+            state, error = "done", None
+        except Exception as e:  # a failed warm-up only means a cold first visit
+            state, error = "failed", str(e)
+        with self._lock:
+            self._status[name].update(state=state, seconds=time.perf_counter() - start, error=error)
+
+    def _submit(self):
+        if self.setup:
+            self._run(*self.setup)
+        for name, func in self.tasks:
+            self._executor.submit(self._run, name, func)
+        # Let the workers exit once the queue is drained
+        self._executor.shutdown(wait=False)
+
+    def start(self):
+        """Run the setup task and submit every task in the background; returns immediately"""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        threading.Thread(target=self._submit, name="prefetch-setup", daemon=True).start()
+        return self
+
+    def result(self, name):
+        """Return value of a finished task, or None"""
+        return self._results.get(name)
+
+    def status(self):
+        """One dict per task: task, state (pending/running/done/failed), seconds, error"""
+        with self._lock:
+            return [dict(s) for s in self._status.values()]
+
+    @property
+    def finished(self):
+        return all(s["state"] in ("done", "failed") for s in self.status())
+
+
+class Popularity:
+    """Process-wide section visit counts, persisted to ``path``"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._flushed_at = float("-inf")   # the first visit is written straight away
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._counts = {str(k): int(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def counts(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def record(self, section):
+        with self._lock:
+            self._counts[section] = self._counts.get(section, 0) + 1
+            if time.monotonic() - self._flushed_at < FLUSH_SECONDS:
+                return
+            self._flushed_at = time.monotonic()
+            counts = dict(self._counts)
+        self.flush(counts)
+
+    def flush(self, counts=None):
+        counts = counts if counts is not None else self.counts()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(counts, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only deployment: counts stay in memory
+
+
+def popularity_order(sections, counts):
+    """``sections`` sorted by visit count, most visited first; ties keep their given order"""
+    return sorted(sections, key=lambda s: -counts.get(s, 0))
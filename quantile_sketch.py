@@ -0,0 +1,142 @@
+"""
+Mergeable streaming quantile sketch (DDSketch) for latency percentiles.
+
+Values are counted in logarithmic buckets, so any quantile is returned
+within ``relative_accuracy`` of the true value while memory grows with the
+value range, not the number of values. Sketches of different chunks,
+subjects or runs merge by adding bucket counts.
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class DDSketch:
+    """Relative-error quantile sketch over non-negative values"""
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.offset = 0                            # bucket key of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0                        # values <= min_value
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _grow(self, lo, hi):
+        """Make the dense bucket array cover keys ``lo``..``hi``"""
+        if not len(self.counts):
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + len(self.counts) - 1)
+        if new_lo == self.offset and new_hi == self.offset + len(self.counts) - 1:
+            return
+        counts = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        counts[self.offset - new_lo:self.offset - new_lo + len(self.counts)] = self.counts
+        self.offset, self.counts = new_lo, counts
+
+    def add(self, values):
+        """Add an array (or scalar) of values; NaNs are ignored"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > self.min_value]
+        self.zero_count += len(values) - len(positive)
+        if len(positive):
+            keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            lo, hi = int(keys.min()), int(keys.max())
+            self._grow(lo, hi)
+            self.counts += np.bincount(keys - self.offset, minlength=len(self.counts))[:len(self.counts)]
+        return self
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if len(other.counts):
+            self._grow(other.offset, other.offset + len(other.counts) - 1)
+            start = other.offset - self.offset
+            self.counts[start:start + len(other.counts)] += other.counts
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bucket_values(self):
+        """Representative value of each dense bucket"""
+        keys = np.arange(self.offset, self.offset + len(self.counts))
+        return 2 * self.gamma ** keys / (self.gamma + 1)
+
+    def quantiles(self, qs):
+        """Estimates for each quantile in ``qs`` (0..1); NaN when empty"""
+        qs = np.asarray(qs, dtype=np.float64)
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+        ranks = qs * (self.count - 1)
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        idx = np.searchsorted(cumulative, ranks, side="right")
+        values = np.where(
+            ranks < self.zero_count,
+            0.0,
+            self._bucket_values()[np.minimum(idx, len(self.counts) - 1)] if len(self.counts) else 0.0,
+        )
+        # Exact extremes are tracked separately
+        return np.clip(values, self.min, self.max)
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def histogram(self, bins=30):
+        """Counts over ``bins`` equal-width bins between min and max, as (counts, edges)"""
+        if not self.count:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        weights = np.concatenate([[self.zero_count], self.counts])
+        values = np.concatenate([[0.0], np.clip(self._bucket_values(), self.min, self.max)])
+        return np.histogram(values, bins=bins, range=(self.min, self.max), weights=weights)
+
+    def to_dict(self):
+        """JSON-serializable state"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "offset": self.offset,
+            "counts": self.counts.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["relative_accuracy"], state["min_value"])
+        sketch.offset = state["offset"]
+        sketch.counts = np.asarray(state["counts"], dtype=np.int64)
+        sketch.zero_count = state["zero_count"]
+        sketch.count = state["count"]
+        sketch.sum = state["sum"]
+        if state["count"]:
+            sketch.min, sketch.max = state["min"], state["max"]
+        return sketch
@@ -0,0 +1,86 @@
+"""
+Query catalogs and their link to retrieval results.
+
+A catalog is a markdown file with one ``## <subject> (<n> Query)`` heading
+per subject followed by one query per line. Both layouts in use are read:
+
+    ## 📚 Algoritma dan Pemrograman (20 Query)      ## ALGORITMA DAN PEMROGRAMAN (20 Query)
+    1. Apa itu Git?                                 Apa itu Git?
+
+``QueryIndex`` joins catalog queries to retrieval rows, keyed by
+(subject, normalized query) with the normalization of run_compare.
+Full queries are found through a hash index. Queries the retrieval log
+truncated with "..." are kept in a prefix index bucketed by key length,
+so a catalog query is matched by one hash lookup per distinct truncation
+length instead of a scan over all rows.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+import run_compare
+
+_HEADING = re.compile(r"^##\s+(?P<subject>.+?)\s*\((?P<count>\d+)\s*Query\)\s*$", re.IGNORECASE)
+_NUMBERED = re.compile(r"^\d+[.)]\s+")
+# Markdown that is not a query line
+_SKIP = re.compile(r"^(#|>|---|\*\*\*|\|)")
+
+
+def parse_catalog(text):
+    """(subject, query) pairs of a catalog, in file order"""
+    pairs, subject = [], None
+    for line in text.splitlines():
+        line = line.strip()
+        heading = _HEADING.match(line)
+        if heading:
+            # Drop a leading emoji or bullet: "📚 Basis Data" -> "Basis Data"
+            subject = re.sub(r"^[^\w]+", "", heading.group("subject")).strip()
+            continue
+        if not line or subject is None or _SKIP.match(line):
+            continue
+        query = _NUMBERED.sub("", line).strip()
+        if query:
+            pairs.append((subject, query))
+    return pairs
+
+
+def _keys(subjects, queries):
+    """Join keys (lowercased subject + normalized query) and truncation flags"""
+    norm, truncated = run_compare.normalize_queries(pd.Series(queries, dtype=object))
+    subjects = pd.Series(subjects, dtype=object).fillna("").astype(str).str.strip().str.lower()
+    return subjects.to_numpy(dtype=object) + run_compare.KEY_SEP + norm, truncated
+
+
+def _group(keys, rows):
+    """{key: [row positions]} over ``rows``"""
+    if not len(rows):
+        return {}
+    return pd.Series(rows).groupby(keys[rows], sort=False).agg(list).to_dict()
+
+
+class QueryIndex:
+    """Rows of a retrieval frame by (subject, query), including rows whose query was truncated"""
+
+    def __init__(self, frame):
+        keys, truncated = _keys(frame["mata_kuliah"].astype(object), frame["query"].astype(object))
+        self.exact = _group(keys, np.flatnonzero(~truncated))      # full key -> [rows]
+        self.prefixes = {}                                         # key length -> {truncated key: [rows]}
+        for key, rows in _group(keys, np.flatnonzero(truncated)).items():
+            self.prefixes.setdefault(len(key), {})[key] = rows
+
+    def lookup(self, key):
+        """Row positions for one catalog key: exact matches, else truncated queries it starts with"""
+        if key in self.exact:
+            return list(self.exact[key])
+        rows = []
+        for length, bucket in self.prefixes.items():
+            if length <= len(key):
+                rows += bucket.get(key[:length], ())
+        return rows
+
+    def join(self, subjects, queries):
+        """Row positions matching each catalog (subject, query) pair"""
+        keys, _ = _keys(subjects, queries)
+        return [self.lookup(key) for key in keys]
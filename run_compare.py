@@ -0,0 +1,165 @@
+"""
+Run-to-run comparison of retrieval results.
+
+Each run is a CSV with the Raw_Data_Retrieval.csv columns. Queries are keyed
+by (mata_kuliah, normalized query). Runs are joined first through a hash
+index on the full key. Queries truncated with "..." are then matched by
+prefix through a sorted key array (``np.searchsorted``), so a join stays
+O(n log n) on 100k-query runs. A prefix that matches more than one query
+is left unmatched instead of guessed.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Separator between subject and query in join keys (never part of either)
+KEY_SEP = "\x1f"
+# Sorts after every character, closing a prefix range for searchsorted
+PREFIX_END = "\U0010ffff"
+
+# Per-query metrics compared between runs: column -> (label, higher is better)
+METRICS = {
+    "p_top1": ("P(relevant) Top-1", True),
+    "p_topk": ("P(relevant) Top-K", True),
+    "faiss_avg_score": ("FAISS Cosine", True),
+    "total_time_ms": ("Total Time (ms)", False),
+}
+
+# Differences smaller than this count as ties
+TIE_TOLERANCE = 1e-9
+
+
+def normalize_queries(queries):
+    """Normalized query text and whether each query was truncated with "..." """
+    text = queries.fillna("").astype(str).str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    truncated = text.str.endswith("...") | text.str.endswith("…")
+    text = text.str.replace(r"(\.\.\.|…)$", "", regex=True).str.rstrip()
+    return text.to_numpy(dtype=object), truncated.to_numpy(dtype=bool)
+
+
+def prepare_run(df):
+    """One row per (mata_kuliah, normalized query) with the mean of each metric"""
+    norm, truncated = normalize_queries(df["query"])
+    logits = df[["rerank_top1", "rerank_avg_score"]].to_numpy(dtype=float)
+    probs = 1 / (1 + np.exp(-logits))
+    frame = pd.DataFrame({
+        "key": df["mata_kuliah"].astype(str).to_numpy(dtype=object) + KEY_SEP + norm,
+        "mata_kuliah": df["mata_kuliah"].astype(str).to_numpy(),
+        "query": df["query"].astype(str).to_numpy(),
+        "truncated": truncated,
+        "p_top1": probs[:, 0],
+        "p_topk": probs[:, 1],
+        "faiss_avg_score": df["faiss_avg_score"].to_numpy(dtype=float),
+        "total_time_ms": df["total_time_ms"].to_numpy(dtype=float),
+    })
+    grouped = frame.groupby("key", sort=True)
+    run = grouped[list(METRICS)].mean()
+    run["mata_kuliah"] = grouped["mata_kuliah"].first()
+    run["query"] = grouped["query"].first()
+    run["truncated"] = grouped["truncated"].all()
+    run["n"] = grouped.size()
+    return run.reset_index()
+
+
+def _prefix_matches(prefix_keys, sorted_keys):
+    """Position in ``sorted_keys`` of the single key starting with each prefix, or -1"""
+    if not len(prefix_keys) or not len(sorted_keys):
+        return np.full(len(prefix_keys), -1, dtype=np.int64)
+    prefixes = np.asarray(prefix_keys, dtype=str)
+    keys = np.asarray(sorted_keys, dtype=str)
+    lo = np.searchsorted(keys, prefixes, side="left")
+    hi = np.searchsorted(keys, np.char.add(prefixes, PREFIX_END), side="left")
+    return np.where(hi - lo == 1, lo, -1)
+
+
+def join_runs(base, other):
+    """
+    Pair the rows of two prepared runs.
+
+    Returns a DataFrame of ``base_row``, ``other_row`` (positions) and
+    ``match`` ("exact" or "prefix").
+    """
+    # 1. Hash index on the full key
+    exact = pd.Index(other["key"]).get_indexer(base["key"])
+    pairs = [pd.DataFrame({"base_row": np.flatnonzero(exact >= 0), "other_row": exact[exact >= 0], "match": "exact"})]
+
+    # 2. Truncated queries on either side, by prefix among the still unmatched keys
+    base_left = np.flatnonzero(exact < 0)
+    other_left = np.setdiff1d(np.arange(len(other)), exact[exact >= 0])
+    base_keys = base["key"].to_numpy()[base_left]
+    other_keys = other["key"].to_numpy()[other_left]
+    base_order, other_order = np.argsort(base_keys), np.argsort(other_keys)
+
+    trunc = base["truncated"].to_numpy()[base_left]
+    found = _prefix_matches(base_keys[trunc], other_keys[other_order])
+    hit = found >= 0
+    pairs.append(pd.DataFrame({"base_row": base_left[trunc][hit],
+                               "other_row": other_left[other_order[found[hit]]], "match": "prefix"}))
+
+    trunc = other["truncated"].to_numpy()[other_left]
+    found = _prefix_matches(other_keys[trunc], base_keys[base_order])
+    hit = found >= 0
+    pairs.append(pd.DataFrame({"base_row": base_left[base_order[found[hit]]],
+                               "other_row": other_left[trunc][hit], "match": "prefix"}))
+
+    joined = pd.concat(pairs, ignore_index=True).drop_duplicates(["base_row", "other_row"])
+    # A row claimed by two different prefixes is ambiguous: drop both pairs
+    ambiguous = joined["base_row"].duplicated(keep=False) | joined["other_row"].duplicated(keep=False)
+    return joined[~ambiguous].reset_index(drop=True)
+
+
+def compare_runs(runs, baseline, metric="p_top1"):
+    """
+    Per-query deltas of every run against ``baseline``.
+
+    ``runs`` maps run name -> raw retrieval DataFrame. Returns (pairs, summary):
+    one row per matched query per run with base/other metrics and deltas
+    (other - base), and one summary row per compared run with win/loss
+    counts on ``metric``.
+    """
+    base = prepare_run(runs[baseline])
+    frames, summary = [], []
+    for name, df in runs.items():
+        if name == baseline:
+            continue
+        other = prepare_run(df)
+        joined = join_runs(base, other)
+        b = base.iloc[joined["base_row"]].reset_index(drop=True)
+        o = other.iloc[joined["other_row"]].reset_index(drop=True)
+        frame = pd.DataFrame({
+            "run": name,
+            "mata_kuliah": b["mata_kuliah"],
+            "query": np.where(b["truncated"] & ~o["truncated"], o["query"], b["query"]),
+            "match": joined["match"],
+        })
+        for column in METRICS:
+            frame[f"{column}_base"] = b[column]
+            frame[f"{column}_run"] = o[column]
+            frame[f"delta_{column}"] = o[column] - b[column]
+        frames.append(frame)
+
+        delta = frame[f"delta_{metric}"].to_numpy() * (1 if METRICS[metric][1] else -1)
+        summary.append({
+            "run": name,
+            "queries_base": len(base),
+            "queries_run": len(other),
+            "matched": len(frame),
+            "exact": int((frame["match"] == "exact").sum()),
+            "prefix": int((frame["match"] == "prefix").sum()),
+            "wins": int((delta > TIE_TOLERANCE).sum()),
+            "losses": int((delta < -TIE_TOLERANCE).sum()),
+            "ties": int((np.abs(delta) <= TIE_TOLERANCE).sum()),
+            **{f"mean_delta_{column}": frame[f"delta_{column}"].mean() for column in METRICS},
+        })
+    pairs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return pairs, pd.DataFrame(summary)
+
+
+def biggest_regressions(pairs, metric="p_top1", limit=10):
+    """Matched queries that got worst on ``metric`` relative to the baseline"""
+    if pairs.empty:
+        return pairs
+    higher_is_better = METRICS[metric][1]
+    ordered = pairs.sort_values(f"delta_{metric}", ascending=higher_is_better, kind="stable")
+    worst = ordered[f"delta_{metric}"] < -TIE_TOLERANCE if higher_is_better else ordered[f"delta_{metric}"] > TIE_TOLERANCE
+    return ordered[worst].head(limit)
@@ -0,0 +1,237 @@
+"""
+BM25 full-text search over the generated assessments.
+
+The index covers ``content``, ``topic`` and ``mata_kuliah`` of every record in
+Log_Hasil_Generate_Soal.json and is persisted next to the data: documents and
+terms as JSON, posting lists as one ``.npy`` array loaded without pickle, so
+a tampered index file can at worst fail to load. When the log only grew by
+appended records, ``SearchIndex.open`` indexes just the new ones.
+"""
+
+import hashlib
+import html
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+import json_index
+
+FORMAT_VERSION = 2
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Term-frequency weight of each indexed field (a simplified BM25F)
+FIELD_WEIGHTS = {"content": 1, "topic": 3, "mata_kuliah": 2}
+
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    """Lower-cased word tokens of ``text``"""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _digest(buf, start, end):
+    return hashlib.blake2b(bytes(buf[start:end]), digest_size=16).hexdigest()
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking, one document per generated assessment"""
+
+    def __init__(self, source):
+        self.source = str(source)
+        self._reset()
+
+    def _reset(self):
+        self.docs = []          # per doc: id, mata_kuliah, topic, difficulty, span
+        self.lengths = []       # weighted token count per doc
+        self.postings = {}      # term -> {doc: weighted tf}
+        self.indexed_end = 0    # byte offset just past the last indexed record
+        self.last_start = 0     # start offset and digest of that record, to detect rewrites
+        self.last_digest = None
+        self._arrays = {}
+
+    # ---------------------------------------------------------------- building
+
+    def add_record(self, record):
+        """Index one record produced by ``json_index.scan_records``"""
+        fields = record["fields"]
+        doc = len(self.docs)
+        counts = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = fields.get(field)
+            for term in tokenize(value if isinstance(value, str) else ""):
+                counts[term] = counts.get(term, 0) + weight
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc] = tf
+        self.lengths.append(sum(counts.values()))
+        self.docs.append({
+            "id": fields.get("id"),
+            "mata_kuliah": fields.get("mata_kuliah"),
+            "topic": fields.get("topic", "Unknown"),
+            "difficulty": fields.get("difficulty"),
+            "span": record["spans"].get("content"),
+        })
+        self._arrays.clear()
+
+    def update(self):
+        """Index records appended to the source since the last update; rebuild if it was rewritten"""
+        buf = json_index.open_buffer(self.source)
+        if self.indexed_end and (
+            len(buf) < self.indexed_end
+            or _digest(buf, self.last_start, self.indexed_end) != self.last_digest
+        ):
+            self._reset()
+        added = 0
+        for record in json_index.scan_records(buf, skip_keys=("content",), start=self.indexed_end):
+            span = record["spans"].get("content")
+            if span:
+                record["fields"]["content"] = json.loads(buf[span[0]:span[1]])
+            self.add_record(record)
+            self.last_start, self.indexed_end = record["start"], record["end"]
+            self.last_digest = _digest(buf, record["start"], record["end"])
+            added += 1
+        return added
+
+    # ---------------------------------------------------------------- persistence
+
+    @classmethod
+    def open(cls, source, index_path):
+        """Load the persisted index for ``source``, bring it up to date and save it back"""
+        index_path = Path(index_path)
+        index = cls.load(source, index_path) or cls(source)
+        if index.update() or not index_path.exists():
+            try:
+                index.save(index_path)
+            except OSError:
+                pass  # read-only deployment: keep the in-memory index
+        return index
+
+    @classmethod
+    def load(cls, source, index_path):
+        """Index persisted at ``index_path`` for ``source``, or None if missing, outdated or unreadable"""
+        index_path = Path(index_path)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("format_version") != FORMAT_VERSION or state["source"] != str(source):
+                return None
+            postings = np.load(index_path.parent / state["postings"], allow_pickle=False)
+            bounds = np.cumsum([0] + state["counts"]).tolist()
+            if postings.shape != (2, bounds[-1]) or len(state["terms"]) != len(state["counts"]):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        index = cls(source)
+        index.docs = state["docs"]
+        index.lengths = state["lengths"]
+        index.indexed_end = state["indexed_end"]
+        index.last_start, index.last_digest = state["last_start"], state["last_digest"]
+        docs, tfs = postings.tolist()
+        index.postings = {
+            term: dict(zip(docs[lo:hi], tfs[lo:hi]))
+            for term, lo, hi in zip(state["terms"], bounds[:-1], bounds[1:])
+        }
+        return index
+
+    def save(self, index_path):
+        """Write the index as JSON plus a content-addressed ``<stem>.<hash>.npy`` of the posting lists"""
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        terms = list(self.postings)
+        nnz = sum(len(self.postings[t]) for t in terms)
+        postings = np.empty((2, nnz), dtype=np.int64)
+        postings[0] = np.fromiter((d for t in terms for d in self.postings[t]), dtype=np.int64, count=nnz)
+        postings[1] = np.fromiter((tf for t in terms for tf in self.postings[t].values()), dtype=np.int64, count=nnz)
+        name = f"{index_path.stem}.{hashlib.blake2b(postings.tobytes(), digest_size=8).hexdigest()}.npy"
+
+        # Arrays first, then the JSON naming them: a reader never sees a JSON without its arrays
+        tmp = index_path.parent / f"{name}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, postings, allow_pickle=False)
+        tmp.replace(index_path.parent / name)
+        state = {
+            "format_version": FORMAT_VERSION,
+            "source": self.source,
+            "docs": self.docs,
+            "lengths": self.lengths,
+            "indexed_end": self.indexed_end,
+            "last_start": self.last_start,
+            "last_digest": self.last_digest,
+            "terms": terms,
+            "counts": [len(self.postings[t]) for t in terms],
+            "postings": name,
+        }
+        tmp = index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        tmp.replace(index_path)
+        for old in index_path.parent.glob(f"{index_path.stem}.*.npy"):
+            if old.name != name:
+                old.unlink(missing_ok=True)
+
+    # ---------------------------------------------------------------- querying
+
+    def _term_arrays(self, term):
+        """Posting list of ``term`` as (doc ids, tf) arrays, memoized"""
+        if term not in self._arrays:
+            posting = self.postings.get(term, {})
+            self._arrays[term] = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float64, count=len(posting)),
+            )
+        return self._arrays[term]
+
+    def search(self, query, limit=10, subject=None):
+        """Top documents for ``query`` as a list of (doc index, score), best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        n_docs = len(self.docs)
+        if not terms or not n_docs:
+            return []
+        lengths = self._arrays.get("__lengths__")
+        if lengths is None:
+            lengths = self._arrays["__lengths__"] = np.asarray(self.lengths, dtype=np.float64)
+        norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+
+        scores = np.zeros(n_docs)
+        for term in terms:
+            docs, tf = self._term_arrays(term)
+            if not len(docs):
+                continue
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tf * (K1 + 1) / (tf + norm[docs])
+
+        if subject is not None:
+            subjects = self._arrays.get("__subjects__")
+            if subjects is None:
+                subjects = self._arrays["__subjects__"] = np.array([d["mata_kuliah"] for d in self.docs], dtype=object)
+            scores[subjects != subject] = 0
+        hits = np.flatnonzero(scores)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(int(d), float(scores[d])) for d in hits]
+
+    def content(self, doc):
+        """Decoded content of ``doc``"""
+        span = self.docs[doc]["span"]
+        return json_index.read_span(self.source, span) if span else ""
+
+
+def highlight_snippet(text, query, width=160):
+    """HTML-escaped excerpt of ``text`` around the first query term, with matches in <mark>"""
+    terms = sorted(set(tokenize(query)), key=len, reverse=True)
+    if not text or not terms:
+        return html.escape((text or "")[:width])
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\b", re.IGNORECASE)
+    first = pattern.search(text)
+    center = first.start() if first else 0
+    start = max(0, center - width // 2)
+    end = min(len(text), start + width)
+    # Drop markdown emphasis/heading markers so a cut-off "**" cannot garble the snippet
+    excerpt = " ".join(re.sub(r"[*`#]+", "", text[start:end]).split())
+    marked = pattern.sub(lambda m: f"\x00{m.group(0)}\x01", excerpt)
+    marked = html.escape(marked).replace("\x00", "<mark>").replace("\x01", "</mark>")
+    return ("…" if start else "") + marked + ("…" if end < len(text) else "")
@@ -0,0 +1,319 @@
+"""
+Columnar snapshot of the datasets in hasil/.
+
+``python snapshot.py [DATA_DIR]`` compiles every CSV and JSON source into
+``DATA_DIR/.snapshot``: one ``.npy`` file per numeric column, dictionary
+encoded codes plus a string table (in ``manifest.json``) for repetitive text,
+and a UTF-8 blob with an offsets array for free text. Loaders memory-map the
+arrays, so worker processes share the same pages through the OS page cache
+instead of each parsing and holding its own copy. A source's snapshot is used
+only while the file's content hash matches the one recorded at build time,
+so a rewrite that keeps the size and modification time is still detected.
+"""
+
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import compaction
+
+SNAPSHOT_DIR = ".snapshot"
+MANIFEST = f"{SNAPSHOT_DIR}/manifest.json"
+FORMAT_VERSION = 2
+
+# Free-text columns kept as JSON-encoded bytes and exposed as (start, end)
+# offsets instead of decoded strings; see json_index.read_span.
+LAZY_TEXT_COLUMNS = {"content"}
+
+# Text columns with at most this share of distinct values are dictionary encoded
+CATEGORY_RATIO = 0.5
+
+
+def source_files(data_dir):
+    """All CSV/JSON sources under ``data_dir`` (hidden directories such as .snapshot excluded), relative to it"""
+    data_dir = Path(data_dir)
+    return sorted(
+        p.relative_to(data_dir).as_posix()
+        for p in data_dir.rglob("*")
+        if p.suffix in (".csv", ".json") and p.is_file()
+        and not any(part.startswith(".") for part in p.relative_to(data_dir).parts)
+    )
+
+
+# (path, inode, ctime, mtime, size) -> content hash, so unchanged files are hashed once per process;
+# ctime moves on any rewrite, even one that restores the modification time (cp -p, rsync)
+_hashes = {}
+
+
+def _hash_chunks(chunks):
+    """Hex digest of a sequence of byte chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(path):
+    """Hash of the contents of ``path``, as the dashboard's cache keys use"""
+    stat = os.stat(path)
+    key = (str(path), stat.st_ino, stat.st_ctime_ns, stat.st_mtime_ns, stat.st_size)
+    if key not in _hashes:
+        with open(path, "rb") as f:
+            _hashes[key] = _hash_chunks(iter(lambda: f.read(1 << 20), b""))
+    return _hashes[key]
+
+
+def parse(path):
+    """
+    Read ``path`` once and parse it, returning {"table", "size", "hash"}.
+
+    Size and hash describe the bytes that were parsed, so a file rewritten
+    while it is being read is recorded as the version the table came from
+    and shows up as stale afterwards.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return {"table": tabulate(path, data), "size": len(data), "hash": _hash_chunks([data])}
+
+
+def tabulate(path, data=None):
+    """Parse a source file (or its already read bytes ``data``) into a flat DataFrame"""
+    path = Path(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+    if path.suffix == ".csv":
+        return pd.read_csv(io.BytesIO(data))
+    data = json.loads(data.decode("utf-8"))
+    if isinstance(data, list):
+        return pd.json_normalize(data)
+    # Nested documents (e.g. modul_lab_si.json): flatten the first list of
+    # records, descending into one level of nested record lists.
+    for key, value in data.items():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            nested = [k for k, v in value[0].items() if isinstance(v, list) and v and isinstance(v[0], dict)]
+            if nested:
+                meta = [k for k in value[0] if k not in nested]
+                return pd.json_normalize(value, record_path=nested[0], meta=meta, meta_prefix=f"{key}_")
+            return pd.json_normalize(value)
+    return pd.json_normalize(data)
+
+
+def _codes_dtype(n_categories):
+    """Smallest signed code dtype pandas uses for ``n_categories``"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _write_blob(values, prefix, encode):
+    """Write ``values`` as one UTF-8 blob plus an int64 offsets array"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    with open(f"{prefix}.bin", "wb") as f:
+        for i, value in enumerate(values):
+            data = encode(value)
+            f.write(data)
+            offsets[i + 1] = offsets[i] + len(data)
+    np.save(f"{prefix}.offsets.npy", offsets)
+
+
+def _write_column(series, prefix):
+    """Write one column and return its manifest entry"""
+    name = series.name
+    if name in LAZY_TEXT_COLUMNS:
+        _write_blob(series.tolist(), prefix, lambda v: json.dumps(v, ensure_ascii=False).encode("utf-8"))
+        return {"kind": "lazy_text"}
+
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        np.save(f"{prefix}.npy", series.to_numpy())
+        return {"kind": "numeric"}
+
+    values = series.tolist()
+    if all(v is None or isinstance(v, str) or (isinstance(v, float) and np.isnan(v)) for v in values):
+        codes, categories = pd.factorize(series, sort=True, use_na_sentinel=True)
+        if len(categories) <= max(1, CATEGORY_RATIO * len(series)):
+            np.save(f"{prefix}.npy", codes.astype(_codes_dtype(len(categories))))
+            return {"kind": "category", "categories": [str(c) for c in categories]}
+        _write_blob(values, prefix, lambda v: b"" if not isinstance(v, str) else v.encode("utf-8"))
+        np.save(f"{prefix}.null.npy", np.array([not isinstance(v, str) for v in values]))
+        return {"kind": "text"}
+
+    # Mixed or nested values: keep them as JSON text per row
+    _write_blob(values, prefix, lambda v: json.dumps(v, ensure_ascii=False, default=str).encode("utf-8"))
+    return {"kind": "json"}
+
+
+def _carry(entry, source_dir, staging):
+    """Hard-link (or copy) the column files of a manifest entry into the staging directory"""
+    for column in entry["columns"]:
+        for path in source_dir.glob(f"{column['file']}.*"):
+            try:
+                os.link(path, staging / path.name)
+            except OSError:
+                shutil.copy2(path, staging / path.name)
+
+
+def build_snapshot(data_dir, tables=None, reuse=False):
+    """
+    Compile every source under ``data_dir`` into a fresh snapshot directory.
+
+    ``tables`` optionally maps source names to already parsed sources, as
+    returned by ``parse`` (e.g. from a parallel ingestion stage); other
+    sources are parsed here. With ``reuse=True``, sources still fresh in the
+    current snapshot keep their column files and manifest entry instead of
+    being parsed again. Returns the manifest dict.
+    """
+    data_dir = Path(data_dir)
+    target = data_dir / SNAPSHOT_DIR
+    staging = data_dir / f"{SNAPSHOT_DIR}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    tables = tables or {}
+    sources = source_files(data_dir)
+    current = load_manifest(data_dir) if reuse else None
+    carried = {s: current["tables"][s] for s in sources
+               if s not in tables and is_fresh(data_dir, s, current)}
+    # New tables take file prefixes the carried ones do not use
+    used = {column["file"].split("_")[0] for entry in carried.values() for column in entry["columns"]}
+    prefixes = (f"t{n}" for n in itertools.count() if f"t{n}" not in used)
+
+    built_at = time.time()
+    manifest = {"format_version": FORMAT_VERSION, "built_at": built_at, "tables": {}}
+    for source in sources:
+        if source in carried:
+            _carry(carried[source], target, staging)
+            manifest["tables"][source] = carried[source]
+            continue
+        parsed = tables.get(source) or parse(data_dir / source)
+        # Narrow dtypes here so the memory-mapped columns are narrow too
+        df = compaction.compact(parsed["table"], keep_text=LAZY_TEXT_COLUMNS)
+        prefix = next(prefixes)
+        columns = []
+        for c, column in enumerate(df.columns):
+            entry = _write_column(df[column].rename(column), str(staging / f"{prefix}_c{c}"))
+            entry.update({"name": str(column), "file": f"{prefix}_c{c}"})
+            columns.append(entry)
+        manifest["tables"][source] = {
+            "rows": len(df),
+            "size": parsed["size"],
+            "hash": parsed["hash"],
+            "columns": columns,
+        }
+
+    with open(staging / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    # Swap directories so readers never observe a half-written snapshot
+    old = data_dir / f"{SNAPSHOT_DIR}.old-{os.getpid()}"
+    if target.exists():
+        target.rename(old)
+    staging.rename(target)
+    shutil.rmtree(old, ignore_errors=True)
+    return manifest
+
+
+def load_manifest(data_dir):
+    """Manifest of the snapshot in ``data_dir``, or None if there is none"""
+    try:
+        with open(Path(data_dir) / MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format_version") == FORMAT_VERSION else None
+
+
+def is_fresh(data_dir, source, manifest):
+    """True if ``source`` is in the snapshot and its content is unchanged since it was built"""
+    entry = manifest and manifest["tables"].get(source)
+    if not entry:
+        return False
+    path = Path(data_dir) / source
+    try:
+        if path.stat().st_size != entry["size"]:
+            return False
+        return content_hash(path) == entry["hash"]
+    except FileNotFoundError:
+        return False
+
+
+def _read_blob(prefix):
+    """Memory-map a blob and its offsets"""
+    offsets = np.load(f"{prefix}.offsets.npy", mmap_mode="r")
+    blob = np.memmap(f"{prefix}.bin", dtype=np.uint8, mode="r") if offsets[-1] else np.zeros(0, np.uint8)
+    return blob, offsets
+
+
+def read_table(data_dir, source, manifest=None):
+    """
+    Memory-mapped DataFrame for ``source``, or None if the snapshot is missing or stale.
+
+    Lazy text columns come back as ``<name>_start``/``<name>_end`` offsets into
+    the file given by ``lazy_text_path(data_dir, source, name)``.
+    """
+    manifest = manifest or load_manifest(data_dir)
+    if not is_fresh(data_dir, source, manifest):
+        return None
+    base = Path(data_dir) / SNAPSHOT_DIR
+    columns = {}
+    for entry in manifest["tables"][source]["columns"]:
+        prefix = str(base / entry["file"])
+        name, kind = entry["name"], entry["kind"]
+        if kind == "numeric":
+            columns[name] = np.load(f"{prefix}.npy", mmap_mode="r")
+        elif kind == "category":
+            codes = np.load(f"{prefix}.npy", mmap_mode="r")
+            columns[name] = pd.Categorical.from_codes(codes, categories=pd.Index(entry["categories"]))
+        elif kind == "lazy_text":
+            offsets = np.load(f"{prefix}.offsets.npy", mmap_mode="r")
+            columns[f"{name}_start"] = offsets[:-1]
+            columns[f"{name}_end"] = offsets[1:]
+        else:
+            blob, offsets = _read_blob(prefix)
+            # Copy one row at a time out of the mapping, never the whole blob
+            bounds = offsets.tolist()
+            values = [blob[bounds[i]:bounds[i + 1]].tobytes().decode("utf-8") for i in range(len(bounds) - 1)]
+            if kind == "json":
+                values = [json.loads(v) for v in values]
+            else:
+                nulls = np.load(f"{prefix}.null.npy")
+                values = [None if null else v for v, null in zip(values, nulls)]
+            columns[name] = pd.Series(values, dtype=object)
+    return pd.DataFrame(columns, copy=False)
+
+
+def lazy_text_path(data_dir, source, column, manifest=None):
+    """Blob file holding a lazy text column of ``source``"""
+    manifest = manifest or load_manifest(data_dir)
+    for entry in manifest["tables"][source]["columns"]:
+        if entry["name"] == column:
+            return Path(data_dir) / SNAPSHOT_DIR / f"{entry['file']}.bin"
+    raise KeyError(column)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile hasil/ into a memory-mappable columnar snapshot")
+    parser.add_argument("data_dir", nargs="?", default=str(Path(__file__).parent / "hasil"))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest = build_snapshot(args.data_dir)
+    for source, entry in manifest["tables"].items():
+        print(f"{source}: {entry['rows']} rows, {len(entry['columns'])} columns")
+    print(f"Snapshot written to {Path(args.data_dir) / SNAPSHOT_DIR} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
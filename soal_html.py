@@ -0,0 +1,129 @@
+"""
+Sanitized HTML for the generated-assessment viewer.
+
+Each assessment's markdown is converted once to an HTML fragment (the
+dashboard caches the fragments per data version), and a page of fragments is
+shipped as a single HTML element. Collapsed items are native ``<details>``
+elements, so expanding one happens in the browser without a rerun. The
+expert evaluators' comments use the same items (``render_note``).
+
+Sanitizing: raw HTML in the content is escaped rather than passed through
+(the ``html_block`` preprocessor and ``html`` inline pattern are
+deregistered). Link and image URLs are decoded as a browser would (entities
+unescaped, whitespace and control characters dropped) and kept only when
+relative or in ``SAFE_SCHEMES``; anything else becomes "#".
+``markdown`` is optional; without it the content is shown as escaped,
+preformatted text.
+"""
+
+import html
+import re
+import threading
+
+try:
+    import markdown
+except ImportError:  # optional: fall back to preformatted text
+    markdown = None
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+
+# URL schemes links and images may use; relative URLs are always allowed
+SAFE_SCHEMES = ("http", "https", "mailto")
+
+_URL_TAG = re.compile(r"<(?:a|img)\b[^>]*>")
+_URL_ATTR = re.compile(r'\b(href|src)="([^"]*)"')
+_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*):", re.IGNORECASE)
+# Browsers ignore these inside a URL's scheme ("java\tscript:" is "javascript:")
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+PAGE_STYLE = """
+<style>
+.soal-item { border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 0.5rem; margin-bottom: 0.5rem; }
+.soal-item > summary { cursor: pointer; padding: 0.6rem 0.9rem; font-weight: 600; }
+.soal-meta { display: flex; gap: 1.5rem; padding: 0 0.9rem 0.5rem; font-size: 0.9rem; color: #555; }
+.soal-body { padding: 0 0.9rem 0.5rem; border-top: 1px solid rgba(49, 51, 63, 0.1); overflow-x: auto; }
+.soal-body pre { background: #f6f8fa; padding: 0.75rem; border-radius: 0.4rem; overflow-x: auto; }
+.soal-body table { border-collapse: collapse; }
+.soal-body th, .soal-body td { border: 1px solid #ddd; padding: 0.3rem 0.6rem; }
+</style>
+"""
+
+_local = threading.local()
+
+
+def _converter():
+    """One Markdown instance per thread (instances are not thread-safe)"""
+    md = getattr(_local, "md", None)
+    if md is None:
+        md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, output_format="html")
+        md.preprocessors.deregister("html_block")
+        md.inlinePatterns.deregister("html")
+        _local.md = md
+    return md
+
+
+def _separate_lists(text):
+    """Blank line before a list that directly follows a paragraph, as CommonMark renderers allow"""
+    lines, out, in_fence = text.split("\n"), [], False
+    for line in lines:
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _LIST_ITEM.match(line) and out and out[-1].strip() and not _LIST_ITEM.match(out[-1]):
+            out.append("")
+        out.append(line)
+    return "\n".join(out)
+
+
+def is_safe_url(value):
+    """Whether an attribute value, once decoded by a browser, is relative or uses a ``SAFE_SCHEMES`` scheme"""
+    scheme = _SCHEME.match(_URL_IGNORED.sub("", html.unescape(value)))
+    return scheme is None or scheme.group(1).lower() in SAFE_SCHEMES
+
+
+def _sanitize_urls(rendered):
+    """Point unsafe href and src values of the rendered links and images at "#" instead"""
+    def attr(match):
+        return match.group(0) if is_safe_url(match.group(2)) else f'{match.group(1)}="#"'
+    return _URL_TAG.sub(lambda tag: _URL_ATTR.sub(attr, tag.group(0)), rendered)
+
+
+def render_markdown(text):
+    """Sanitized HTML fragment for a markdown string"""
+    if not text:
+        return "<p><em>No content</em></p>"
+    if markdown is None:
+        return f"<pre>{html.escape(text)}</pre>"
+    md = _converter()
+    try:
+        rendered = md.convert(_separate_lists(text))
+    finally:
+        md.reset()
+    return _sanitize_urls(rendered)
+
+
+def render_item(number, meta, body):
+    """One collapsible assessment: ``meta`` has topic, difficulty and optional metrics; ``body`` is HTML"""
+    title = html.escape(f"📄 Soal {number}: {meta['topic']} ({meta['difficulty']})")
+    details = ""
+    if meta.get("has_metrics"):
+        details = (
+            '<div class="soal-meta">'
+            f"<span>Processing Time: <b>{meta['processing_time_s']:.1f}s</b></span>"
+            f"<span>Has Soal: {'✅' if meta['has_soal'] else '❌'}</span>"
+            f"<span>Has Kunci: {'✅' if meta['has_kunci_jawaban'] else '❌'}</span>"
+            "</div>"
+        )
+    return f'<details class="soal-item"><summary>{title}</summary>{details}<div class="soal-body">{body}</div></details>'
+
+
+def render_note(title, text):
+    """A collapsible plain-text item, e.g. an evaluator's comment; the text is escaped, not rendered"""
+    body = "<p>" + html.escape(text).replace("\n", "<br>") + "</p>"
+    return f'<details class="soal-item"><summary>{html.escape(title)}</summary><div class="soal-body">{body}</div></details>'
+
+
+def render_page(items):
+    """A page of rendered items as one HTML document fragment"""
+    return PAGE_STYLE + "".join(items)
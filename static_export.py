@@ -0,0 +1,638 @@
+"""
+Static export of the dashboard for read-only viewers.
+
+    python static_export.py [DATA_DIR] [--out DIR]
+
+renders Overview, Efektivitas RAG, Hasil Generate Soal, Evaluasi Expert and
+the Data Mentah listing, with their data, into ``DIR/index.html`` (default
+``export/``). The page carries its own CSS and script. Each subject's soal
+list is a page of its own under ``soal/``, loaded into a frame when the
+subject is selected, and the raw files of Data Mentah and the Overview chart
+are copied next to it, so the directory can be served by any static file
+server without a Python session per viewer.
+
+The selectboxes of the live app become ``<select>`` elements that filter in
+the browser: every row a filter applies to is tagged with its values
+(``data-filters``), and views the app computes per selection (band counts,
+latency histograms) are pre-rendered once per combination and shown when
+the combination is selected (``data-view``). Expert evaluation rows carry
+their score band, so the band counts follow the filters without a server.
+Keyword search, Perbandingan Run and Profil Pipeline stay in the live app.
+"""
+
+import argparse
+import html
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import table_view
+
+ROOT = Path(__file__).parent
+
+ALL = "Semua"
+
+# Soal per rendering task of the assessment pages
+SOAL_CHUNK_ROWS = 2000
+
+PAGE_STYLE = """
+body { font-family: Inter, -apple-system, BlinkMacSystemFont, sans-serif; margin: 0; color: #1e293b; }
+nav { position: fixed; top: 0; left: 0; bottom: 0; width: 15rem; padding: 1.5rem 1rem; background: #f0f2f6; }
+nav a { display: block; padding: 0.4rem 0.6rem; border-radius: 0.4rem; color: #1e3a5f; text-decoration: none; }
+nav a.active { background: #dbe4f0; font-weight: 600; }
+main { margin-left: 17rem; padding: 1.5rem 2rem; max-width: 1200px; }
+h1 { color: #1e3a5f; text-align: center; font-size: 2rem; margin-bottom: 0.2rem; }
+.sub-header { color: #64748b; text-align: center; margin-top: 0; }
+h2, h3 { color: #1e3a5f; }
+.metrics { display: flex; gap: 1rem; flex-wrap: wrap; }
+.metric { flex: 1; min-width: 10rem; border: 1px solid #e2e8f0; border-radius: 12px; padding: 1rem 1.2rem;
+          box-shadow: 0 2px 4px rgba(0,0,0,0.08); }
+.metric .label { font-size: 0.85rem; font-weight: 600; text-transform: uppercase; color: #334155; }
+.metric .value { font-size: 2rem; font-weight: 700; color: #1e40af; }
+.metric .delta { font-size: 0.8rem; color: #059669; }
+.columns { display: flex; gap: 2rem; flex-wrap: wrap; }
+.columns > div { flex: 1; min-width: 18rem; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9rem; margin: 0.5rem 0 1rem; }
+th, td { border-bottom: 1px solid #e2e8f0; padding: 0.35rem 0.6rem; text-align: left; vertical-align: top; }
+th { background: #f8fafc; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+.scroll { max-height: 28rem; overflow-y: auto; }
+.bars td.bar { width: 60%; }
+.bars .fill { background: #60a5fa; height: 0.9rem; border-radius: 0.2rem; }
+.info { background: #e8f1fb; border-left: 4px solid #3b82f6; border-radius: 8px; padding: 0.7rem 1rem; margin: 0.8rem 0; }
+.caption { color: #64748b; font-size: 0.85rem; }
+.filters { display: flex; gap: 1rem; flex-wrap: wrap; margin: 0.5rem 0; }
+.filters label { display: flex; flex-direction: column; font-size: 0.85rem; gap: 0.2rem; }
+.filters select { padding: 0.3rem; min-width: 12rem; }
+details.expander { border: 1px solid #e2e8f0; border-radius: 8px; margin-bottom: 0.5rem; padding: 0.3rem 0.8rem; }
+details.expander > summary { cursor: pointer; font-weight: 500; color: #1e3a5f; }
+hr { border: none; border-top: 1px solid #e2e8f0; margin: 1.5rem 0; }
+footer { text-align: center; color: #64748b; font-size: 0.85rem; }
+"""
+
+# Section switching by URL hash, and the client-side filters of each section
+PAGE_SCRIPT = """
+const ALL = %s;
+function showSection() {
+  const sections = document.querySelectorAll("main > section");
+  const id = location.hash.slice(1) || sections[0].id;
+  sections.forEach(s => s.hidden = s.id !== id);
+  document.querySelectorAll("nav a").forEach(a => a.classList.toggle("active", a.hash === "#" + id));
+}
+function applyFilters(section) {
+  const chosen = {};
+  section.querySelectorAll("select[data-filter]").forEach(s => chosen[s.dataset.filter] = s.value);
+  section.querySelectorAll("[data-filters]").forEach(el => {
+    const tags = JSON.parse(el.dataset.filters), exact = el.hasAttribute("data-view");
+    el.hidden = !Object.entries(tags).every(([name, value]) =>
+      !(name in chosen) || value === chosen[name] || (!exact && chosen[name] === ALL));
+  });
+  section.querySelectorAll("[data-count]").forEach(el => {
+    const band = el.dataset.band === undefined ? "" : `[data-band="${el.dataset.band}"]`;
+    el.textContent = section.querySelectorAll(`[data-row="${el.dataset.count}"]${band}:not([hidden])`).length;
+  });
+}
+function loadFrames() {
+  // Frames load on first display only: hidden iframes are not lazy-loaded by browsers
+  document.querySelectorAll("iframe[data-src]:not([src])").forEach(f => {
+    if (!f.closest("[hidden]")) f.src = f.dataset.src;
+  });
+}
+window.addEventListener("hashchange", () => { showSection(); loadFrames(); });
+document.querySelectorAll("main > section").forEach(section => {
+  section.querySelectorAll("select[data-filter]").forEach(s => s.addEventListener("change", () => {
+    applyFilters(section);
+    loadFrames();
+  }));
+  applyFilters(section);
+});
+showSection();
+loadFrames();
+""" % json.dumps(ALL)
+
+e = html.escape
+
+
+# ---------------------------------------------------------------- elements
+
+def _attrs(attrs):
+    return "".join(f' {name}="{e(str(value))}"' for name, value in (attrs or {}).items() if value is not None)
+
+
+def filter_attrs(view=False, **values):
+    """Attributes tagging an element with filter values; ``view`` elements match only their exact selection"""
+    attrs = {"data-filters": json.dumps({k: str(v) for k, v in values.items()}, ensure_ascii=False)}
+    if view:
+        attrs["data-view"] = ""
+    return attrs
+
+
+def div(body, cls=None, attrs=None):
+    return f"<div{_attrs({'class': cls, **(attrs or {})})}>{body}</div>"
+
+
+def info(text):
+    return div(text, "info")
+
+
+def caption(text, attrs=None):
+    return div(text, "caption", attrs)
+
+
+def metric(label, value, delta=None):
+    delta = f'<div class="delta">{e(str(delta))}</div>' if delta is not None else ""
+    return f'<div class="metric"><div class="label">{e(label)}</div><div class="value">{e(str(value))}</div>{delta}</div>'
+
+
+def metrics(*cards):
+    return div("".join(cards), "metrics")
+
+
+def columns(*bodies):
+    return div("".join(div(body) for body in bodies), "columns")
+
+
+def expander(label, body, attrs=None):
+    return f'<details class="expander"{_attrs(attrs)}><summary>{e(label)}</summary>{body}</details>'
+
+
+def select(name, label, options, labels=None):
+    """A client-side filter; ``name`` matches the ``data-filters`` keys it applies to"""
+    opts = "".join(f'<option value="{e(str(o))}">{e(str((labels or {}).get(o, o)))}</option>' for o in options)
+    return f'<label>{e(label)}<select data-filter="{e(name)}">{opts}</select></label>'
+
+
+def filters(*selects):
+    return div("".join(selects), "filters")
+
+
+def table(df, formats=None, gradient=None, row_attrs=None, scroll=False):
+    """
+    HTML table of ``df``.
+
+    ``formats`` maps columns to format strings, ``gradient`` maps columns to
+    ``(cmap, vmin, vmax)`` (see table_view.gradient_css) and ``row_attrs`` is
+    one attribute dict per row.
+    """
+    formats, gradient = formats or {}, gradient or {}
+    head = "".join(f"<th>{e(str(c))}</th>" for c in df.columns)
+    cells = []
+    for column in df.columns:
+        values = df[column].tolist()
+        numeric = pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])
+        fmt = formats.get(column)
+        text = ["" if v is None or (isinstance(v, float) and np.isnan(v)) else fmt.format(v) if fmt else str(v)
+                for v in values]
+        styles = table_view.gradient_css(values, *gradient[column]) if column in gradient else [None] * len(values)
+        cls = "num" if numeric else None
+        cells.append([f"<td{_attrs({'class': cls, 'style': style or None})}>{e(t)}</td>" for t, style in zip(text, styles)])
+    rows = "".join(
+        f"<tr{_attrs(row_attrs[i] if row_attrs else None)}>{''.join(column[i] for column in cells)}</tr>"
+        for i in range(len(df))
+    )
+    body = f"<table><thead><tr>{head}</tr></thead><tbody>{rows}</tbody></table>"
+    return div(body, "scroll") if scroll else body
+
+
+def bars(labels, values, fmt="{:,.0f}", label_name="", value_name=""):
+    """Horizontal bar chart as a table, in place of st.bar_chart"""
+    top = max([v for v in values if np.isfinite(v)] + [0]) or 1
+    rows = "".join(
+        f'<tr><td>{e(str(label))}</td><td class="num">{e(fmt.format(value))}</td>'
+        f'<td class="bar"><div class="fill" style="width: {max(value, 0) / top * 100:.1f}%"></div></td></tr>'
+        for label, value in zip(labels, values)
+    )
+    return f'<table class="bars"><thead><tr><th>{e(label_name)}</th><th>{e(value_name)}</th><th></th></tr></thead>' \
+           f"<tbody>{rows}</tbody></table>"
+
+
+# ---------------------------------------------------------------- sections
+
+def overview_section(app, assets):
+    import bands
+    import overview
+
+    state = app.load_overview()
+    stats = overview.evaluation_stats(state.get("evaluations", {}))
+    assessments = state.get("assessments", {})
+    rag_df, success_rate, n_queries = overview.retrieval_summary(state.get("retrieval", {}))
+    evaluation_bands = bands.SCHEMES["evaluation"]
+    avg_overall = stats.get("avg_overall", float("nan"))
+
+    counts = [stats.get("excellent_count", 0), stats.get("good_count", 0), stats.get("needs_improvement", 0)]
+    aspect_df = pd.DataFrame({
+        "Aspek": list(overview.ASPECTS.values()) + ["Rata-rata Overall"],
+        "Skor": [stats.get(key, float("nan")) for key in
+                 ("avg_relevance", "avg_difficulty_match", "avg_structure", "avg_pedagogical", "avg_overall")],
+    })
+    image = ""
+    if "grafik_skor_per_aspek.png" in assets:
+        image = f'<img src="{assets["grafik_skor_per_aspek.png"]}" alt="Grafik Skor Expert Evaluation per Aspek" ' \
+                f'style="max-width: 100%">' + caption("Grafik Skor Expert Evaluation per Aspek")
+
+    return "".join([
+        "<h2>📊 Ringkasan Hasil Penelitian</h2>",
+        metrics(
+            metric("Total Evaluasi Expert", stats.get("total_evaluations", 0),
+                   f"{stats.get('unique_evaluators', 0)} Evaluator"),
+            metric("Skor Rata-rata", f"{avg_overall:.2f}/5.00", evaluation_bands.name_of(avg_overall)),
+            metric("Total Soal Dihasilkan", assessments.get("count", 0),
+                   f"{len(assessments.get('subjects', []))} Mata Kuliah"),
+            metric("RAG Success Rate", f"{success_rate:.1f}%", f"{n_queries} Query"),
+        ),
+        "<hr>",
+        columns(
+            "<h3>📊 Distribusi Skor Evaluasi</h3>"
+            + bars(evaluation_bands.labels, counts, label_name="Kategori", value_name="Jumlah"),
+            "<h3>📈 Skor Per Aspek Evaluasi</h3>"
+            + table(aspect_df, {"Skor": "{:.2f}"}, {"Skor": ("Blues", 1, 5)}) + image,
+        ),
+        "<hr>",
+        "<h3>🔍 Efektivitas Retrieval RAG per Mata Kuliah</h3>",
+        table(rag_df, {"P(relevant)": "{:.2f}%", "Response Time (ms)": "{:.0f}"},
+              {"P(relevant)": ("Greens", 0, 100)}),
+    ])
+
+
+def rag_section(app):
+    import bands
+    import bootstrap
+
+    rag_effectiveness = app.load_rag_effectiveness()
+    sigmoid_data = app.load_sigmoid_analysis()
+    retrieval_data = app.load_retrieval_data_final()
+    catalog = app.load_query_catalog()
+    relevance_bands = bands.SCHEMES["relevance"]
+    parts = [
+        "<h2>🔍 Efektivitas Retrieval RAG</h2>",
+        "<h3>📐 Normalisasi Skor dengan Fungsi Sigmoid</h3>",
+        columns(
+            "<p>CrossEncoder menghasilkan skor dalam bentuk <b>logit</b> (tanpa batas). Untuk menginterpretasi "
+            "sebagai probabilitas relevansi, digunakan fungsi sigmoid:</p>"
+            "<p style=\"text-align: center; font-size: 1.2rem\">P(relevant) = σ(x) = 1 / (1 + e<sup>−x</sup>)</p>"
+            "<p><b>Keterangan:</b></p><ul><li><b>x</b> = skor CrossEncoder (raw logit)</li>"
+            "<li><b>σ</b> = fungsi sigmoid</li><li><b>P(relevant)</b> = probabilitas relevansi (0-100%)</li></ul>",
+            "<p><b>Tabel Konversi Referensi:</b></p>" + table(pd.DataFrame({
+                "Score": [-2.0, 0.0, 2.0, 4.0],
+                "Sigmoid": [0.12, 0.50, 0.88, 0.98],
+                "P(r)": ["12%", "50%", "88%", "98%"],
+                "Interpretasi": ["Tidak relevan", "Netral", "Relevan", "Sangat relevan"],
+            }), {"Score": "{:.1f}", "Sigmoid": "{:.2f}"}),
+        ),
+        "<p><b>Interpretasi Probabilitas Relevansi:</b> " + " · ".join(e(label) for label in relevance_bands.labels)
+        + "</p>",
+        "<hr>",
+    ]
+
+    per_subject = catalog.groupby("mata_kuliah", sort=False)["no"].nunique()
+    total = int(per_subject.sum())
+    note = f" ({per_subject.iloc[0]} per mata kuliah)" if per_subject.nunique() == 1 else ""
+    parts.append(f"<h3>📝 {total} Query Test untuk Evaluasi RAG</h3>")
+    parts.append(info(f"<b>{total} query</b>{e(note)} digunakan untuk menguji efektivitas retrieval RAG system."
+                      if total else "Daftar query tidak ditemukan."))
+    for subject, queries_df in catalog.groupby("mata_kuliah", sort=False):
+        parts.append(expander(f"📚 {subject} ({queries_df['no'].nunique()} Query)", table(
+            queries_df.drop(columns="mata_kuliah").rename(columns={
+                "no": "No", "query": "Query", "run": "Run", "rerank_top1_sigmoid": "P(relevant) Top-1",
+                "faiss_sigmoid": "FAISS", "total_time_ms": "Response Time (ms)",
+            }),
+            {"P(relevant) Top-1": "{:.1%}", "FAISS": "{:.3f}", "Response Time (ms)": "{:.0f}"},
+        )))
+    parts.append("<hr>")
+
+    if not rag_effectiveness.empty:
+        parts += ["<h3>📊 Ringkasan Efektivitas RAG</h3>", table(rag_effectiveness), "<hr>"]
+
+    parts.append("<h3>📈 Performa Retrieval per Mata Kuliah</h3>")
+    if not retrieval_data.empty:
+        intervals = app.load_retrieval_intervals()
+        ci_table = pd.DataFrame({
+            "Mata Kuliah": intervals["group"],
+            "Metrik": [app.BOOTSTRAP_METRICS[m][0] for m in intervals["metric"]],
+            "Estimasi": [app.BOOTSTRAP_METRICS[m][1].format(v) for m, v in zip(intervals["metric"], intervals["estimate"])],
+            "CI 95%": [app.format_interval(row) for row in intervals.to_dict("records")],
+            "n": intervals["n"],
+        })
+        parts += [
+            table(retrieval_data, {"P(relevant)": "{:.1f}%", "Response Time (ms)": "{:.0f}",
+                                   "P95 Response Time (ms)": "{:.0f}"},
+                  {"P(relevant)": ("Blues", 0, 100)}),
+            bars(retrieval_data["Mata Kuliah"], retrieval_data["P(relevant)"], "{:.1f}%", "Mata Kuliah", "P(relevant)"),
+            expander("🎯 Interval Kepercayaan Bootstrap (95%)", table(ci_table) + caption(
+                f"{bootstrap.DEFAULT_REPLICATES:,} replikasi bootstrap; success rate memakai distribusi binomial, "
+                "rata-rata memakai resampling multinomial.")),
+        ]
+    parts.append("<hr>")
+
+    if sigmoid_data.empty:
+        return "".join(parts)
+    subjects = sorted(sigmoid_data["mata_kuliah"].unique().tolist())
+
+    # One pre-rendered distribution per (score column, subject) selection
+    parts += ["<h3>📊 Distribusi Probabilitas Relevansi</h3>", filters(
+        select("band_column", "Skor:", list(app.RELEVANCE_BAND_COLUMNS), app.RELEVANCE_BAND_COLUMNS),
+        select("band_subject", "Mata Kuliah:", [ALL] + subjects),
+    )]
+    for column in app.RELEVANCE_BAND_COLUMNS:
+        for subject in [ALL] + subjects:
+            counts = app.load_retrieval_band_counts(column, () if subject == ALL else (("mata_kuliah", subject),))
+            dist_df = pd.DataFrame({
+                "Kategori": relevance_bands.labels,
+                "Jumlah Query": counts,
+                "Persentase": [f"{p:.0f}%" for p in counts / max(int(counts.sum()), 1) * 100],
+            })
+            parts.append(div(columns(table(dist_df), bars(dist_df["Kategori"], dist_df["Jumlah Query"])),
+                             attrs=filter_attrs(view=True, band_column=column, band_subject=subject)))
+    parts.append("<hr>")
+
+    parts.append("<h3>⏱️ Analisis Waktu Respons</h3>")
+    avg_faiss = sigmoid_data["faiss_time_ms"].mean()
+    avg_rerank = sigmoid_data["rerank_time_ms"].mean()
+    avg_total = avg_faiss + avg_rerank
+    parts.append(table(pd.DataFrame({
+        "Komponen": ["FAISS Search", "CrossEncoder Rerank", "Total Pipeline"],
+        "Rata-rata (ms)": [avg_faiss, avg_rerank, avg_total],
+        "Persentase": [avg_faiss / avg_total * 100, avg_rerank / avg_total * 100, 100.0],
+    }), {"Rata-rata (ms)": "{:.2f}", "Persentase": "{:.1f}%"}))
+
+    percentiles = app.load_latency_percentiles()
+    sketches = app.load_latency_sketches()
+    parts += ["<p><b>Persentil Latensi (ms)</b></p>", filters(
+        select("latency_filter", "Mata Kuliah:", [ALL] + subjects),
+        select("latency_stage", "Komponen (histogram):", list(app.LATENCY_STAGES), app.LATENCY_STAGES),
+    ), table(percentiles.drop(columns="Mata Kuliah"), dict.fromkeys(["P50", "P90", "P95", "P99", "Max"], "{:.1f}"),
+             row_attrs=[filter_attrs(view=True, latency_filter=s) for s in percentiles["Mata Kuliah"]]),
+        "<p><b>Histogram Latensi</b></p>"]
+    for subject in [ALL] + subjects:
+        for stage in app.LATENCY_STAGES:
+            counts, edges = sketches[(subject, stage)].histogram(bins=30)
+            parts.append(div(bars([f"{m:.1f}" for m in (edges[:-1] + edges[1:]) / 2], counts,
+                                  label_name="Latensi (ms)", value_name="Jumlah Query"),
+                             attrs=filter_attrs(view=True, latency_filter=subject, latency_stage=stage)))
+    parts.append("<hr>")
+
+    parts.append("<h3>🔬 Perbandingan Skor Retrieval</h3>")
+    parts.append(metrics(
+        metric("FAISS (Cosine Similarity)", f"{sigmoid_data['faiss_sigmoid'].mean():.2f}"),
+        metric("Rerank (Probabilitas)", f"{sigmoid_data['rerank_sigmoid'].mean() * 100:.1f}%"),
+        metric("Top-1 Terbaik", f"{sigmoid_data['rerank_top1_sigmoid'].mean() * 100:.1f}%"),
+    ))
+    parts.append(info("💡 <b>FAISS</b> = Cosine similarity (0-1), <b>Rerank/Top-1</b> = Probabilitas relevansi "
+                      "dari CrossEncoder (%)."))
+    detail = pd.DataFrame({
+        "Mata Kuliah": sigmoid_data["mata_kuliah"].astype(str),
+        "Query": sigmoid_data["query"].astype(str),
+        "FAISS": sigmoid_data["faiss_sigmoid"].astype(float),
+        "P(relevant)": sigmoid_data["rerank_sigmoid"].astype(float) * 100,
+        "P(relevant) Top-1": sigmoid_data["rerank_top1_sigmoid"].astype(float) * 100,
+    })
+    parts += [
+        "<h3>📊 Detail Skor Retrieval per Query</h3>",
+        filters(select("sigmoid_filter", "Filter Mata Kuliah:", [ALL] + subjects)),
+        table(detail, {"FAISS": "{:.2f}", "P(relevant)": "{:.1f}%", "P(relevant) Top-1": "{:.1f}%"},
+              row_attrs=[filter_attrs(sigmoid_filter=s) for s in detail["Mata Kuliah"]], scroll=True),
+    ]
+    return "".join(parts)
+
+
+def soal_section(app, out_dir, workers=None):
+    index = app.load_assessment_index()
+    parts = ["<h2>📄 Hasil Generate Soal Sistem</h2>"]
+    if index.empty:
+        return "".join(parts) + info("Data assessments tidak dapat dimuat.")
+
+    subjects = sorted(index["mata_kuliah"].unique().tolist())
+    subject_counts = index["mata_kuliah"].value_counts(sort=False)
+    dist_df = pd.DataFrame({"Mata Kuliah": subject_counts.index.astype(str), "Jumlah Soal": subject_counts.values}) \
+        .sort_values("Jumlah Soal", ascending=False)
+    parts += [
+        metrics(
+            metric("Total Soal", len(index)),
+            metric("Mata Kuliah", len(subjects)),
+            metric("Structure Compliance", f"{(index['structure_compliance'] == 1.0).mean() * 100:.0f}%"),
+            metric("Avg Processing Time", f"{index['processing_time_s'].mean():.1f}s"),
+        ),
+        "<hr>",
+        "<h3>📈 Distribusi per Mata Kuliah</h3>",
+        columns(table(dist_df), bars(dist_df["Mata Kuliah"], dist_df["Jumlah Soal"])),
+        "<hr>",
+        "<h3>📄 Lihat Detail Soal</h3>",
+        filters(select("soal_subject", "Pilih Mata Kuliah:", subjects)),
+    ]
+    # One page per subject, loaded into a frame when its subject is selected: index.html stays small
+    (out_dir / "soal").mkdir(exist_ok=True)
+    pages = {f"soal/{i}.html": index[index["mata_kuliah"] == subject] for i, subject in enumerate(subjects, 1)}
+    rendered = render_soal_pages(index.attrs["content_path"], pages, workers)
+    for subject, (page, rows) in zip(subjects, pages.items()):
+        (out_dir / page).write_text(
+            f'<!DOCTYPE html><html lang="id"><head><meta charset="utf-8"></head><body>{rendered[page]}</body></html>',
+            encoding="utf-8")
+        parts.append(div(
+            info(f"Menampilkan <b>{len(rows)} soal</b> untuk {e(str(subject))}")
+            + caption("Klik judul soal untuk membuka isinya")
+            + f'<iframe data-src="{page}" title="{e(str(subject))}" style="width: 100%; height: 75vh; border: none">'
+              "</iframe>",
+            attrs=filter_attrs(view=True, soal_subject=subject),
+        ))
+    return "".join(parts)
+
+
+def render_soal_items(content_path, rows, first=1):
+    """Collapsed HTML items of ``rows``, numbered from ``first``; identical bodies go through markdown once"""
+    import json_index
+    import soal_html
+
+    rendered, items = {}, []
+    for number, assessment in enumerate(rows.itertuples(index=False), first):
+        start, end = int(assessment.content_start), int(assessment.content_end)
+        content = json_index.read_span(content_path, (start, end)) if end > start else ""
+        if content not in rendered:
+            rendered[content] = soal_html.render_markdown(content)
+        items.append(soal_html.render_item(number, assessment._asdict(), rendered[content]))
+    return items
+
+
+def render_soal_pages(content_path, pages, workers=None):
+    """
+    HTML of each page of soal (page name -> rows of the assessment index).
+
+    Markdown dominates the export time, so the rows are split into chunks of
+    ``SOAL_CHUNK_ROWS`` and rendered on a process pool when there are
+    several chunks and workers.
+    """
+    import ingest
+    import soal_html
+
+    columns = ["topic", "difficulty", "has_metrics", "processing_time_s", "has_soal", "has_kunci_jawaban",
+               "content_start", "content_end"]
+    tasks = [(page, start, rows[columns].iloc[start:start + SOAL_CHUNK_ROWS])
+             for page, rows in pages.items() for start in range(0, len(rows), SOAL_CHUNK_ROWS)]
+    workers = min(workers or ingest.default_workers(), len(tasks))
+    # Fewer soal than one chunk: starting a pool would cost more than it saves
+    if workers <= 1 or sum(len(rows) for rows in pages.values()) < SOAL_CHUNK_ROWS:
+        results = [render_soal_items(content_path, chunk, start + 1) for _, start, chunk in tasks]
+    else:
+        # spawn, as in ingest.py: fork does not mix safely with the threads of an imported app
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(render_soal_items, [content_path] * len(tasks),
+                                    [chunk for _, _, chunk in tasks], [start + 1 for _, start, _ in tasks]))
+    items = {page: [] for page in pages}
+    for (page, _, _), chunk_items in zip(tasks, results):
+        items[page] += chunk_items
+    return {page: soal_html.render_page(page_items) for page, page_items in items.items()}
+
+
+def evaluation_section(app):
+    import bands
+
+    df = app.load_evaluation_frame()
+    n_evaluators, n_samples, n_evaluations = app.evaluation_counts(df)
+    parts = ["<h2>📋 Hasil Evaluasi Expert</h2>", info(
+        f"<b>{n_evaluators} evaluator</b> melakukan evaluasi terhadap <b>{n_samples} sampel soal</b> yang dihasilkan sistem, "
+        f"menghasilkan <b>{n_evaluations} evaluasi</b> total.")]
+    if df.empty:
+        return "".join(parts)
+
+    scheme = bands.SCHEMES["evaluation"]
+    columns_map = {
+        "evaluator_name": "Evaluator", "mata_kuliah": "Mata Kuliah", "topic": "Topik", "difficulty": "Kesulitan",
+        "relevance": "Relevansi", "difficulty_match": "Kesesuaian", "structure": "Struktur",
+        "pedagogical_value": "Pedagogis", "overall": "Overall", "interpretation": "Interpretasi",
+    }
+    display = df[list(columns_map)].rename(columns=columns_map)
+    for column in display.columns:
+        if isinstance(display[column].dtype, pd.CategoricalDtype):
+            display[column] = display[column].astype(object)
+    codes = scheme.codes(df["overall"].to_numpy(dtype=float))
+    tags = [
+        {**filter_attrs(matkul=m, evaluator=ev, difficulty=d), "data-row": "evaluation", "data-band": int(code)}
+        for m, ev, d, code in zip(df["mata_kuliah"].astype(str), df["evaluator_name"].astype(str),
+                                  df["difficulty"].astype(str), codes)
+    ]
+    band_caption = " · ".join(
+        f'{e(label)}: <span data-count="evaluation" data-band="{i}"></span>' for i, label in enumerate(scheme.labels)
+    )
+    parts += [
+        filters(
+            select("matkul", "Filter Mata Kuliah:", [ALL] + sorted(df["mata_kuliah"].astype(str).unique().tolist())),
+            select("evaluator", "Filter Evaluator:", [ALL] + sorted(df["evaluator_name"].astype(str).unique().tolist())),
+            select("difficulty", "Filter Kesulitan:", [ALL, "Mudah", "Sedang", "Sulit"]),
+        ),
+        '<h3>Menampilkan <span data-count="evaluation"></span> evaluasi</h3>',
+        caption(band_caption),
+        table(display, {"Relevansi": "{:.0f}", "Kesesuaian": "{:.0f}", "Struktur": "{:.0f}", "Pedagogis": "{:.0f}",
+                        "Overall": "{:.2f}"},
+              {"Overall": ("RdYlGn", 1, 5)}, row_attrs=tags, scroll=True),
+        "<hr>",
+        "<h3>💬 Komentar Evaluator</h3>",
+    ]
+    # Comment expanders follow the same filters as their table rows
+    for i in np.flatnonzero(df["comments"].fillna("").astype(str).str.len().to_numpy() > 0):
+        row = df.iloc[i]
+        parts.append(expander(f"💬 {row['evaluator_name']} - {row['topic']}", f"<p>{e(str(row['comments']))}</p>",
+                              {"data-filters": tags[i]["data-filters"]}))
+    return "".join(parts)
+
+
+def raw_data_section(data_dir, out_dir, copy_files=True):
+    parts = ["<h2>📈 Data Mentah Penelitian</h2>"]
+    data_files = sorted((f for f in Path(data_dir).iterdir() if f.suffix in (".csv", ".json")), key=lambda f: f.name)
+    if not data_files:
+        return "".join(parts) + info("Belum ada data mentah yang tersedia.")
+
+    rows = []
+    for f in data_files:
+        link = e(f.name)
+        if copy_files:
+            (out_dir / "data").mkdir(exist_ok=True)
+            shutil.copy2(f, out_dir / "data" / f.name)
+            link = f'<a href="data/{e(f.name)}" download>⬇️ {e(f.name)}</a>'
+        rows.append(f"<tr><td>{link}</td><td>{f.suffix.upper().lstrip('.')}</td>"
+                    f'<td class="num">{f.stat().st_size / 1024:.2f} KB</td></tr>')
+    parts.append(f"<table><thead><tr><th>Nama File</th><th>Tipe</th><th>Ukuran</th></tr></thead>"
+                 f"<tbody>{''.join(rows)}</tbody></table>")
+    if not copy_files:
+        parts.append(caption("File tidak disertakan dalam ekspor ini; unduh dari dashboard interaktif."))
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------- export
+
+def export(data_dir, out_dir, copy_files=True, workers=None):
+    """Render the static dashboard of ``data_dir`` into ``out_dir``; returns the path of index.html"""
+    os.environ["DASHBOARD_PREFETCH"] = "0"
+    sys.path.insert(0, str(ROOT))
+    import app
+
+    data_dir, out_dir = Path(data_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    assets = {}
+    image = data_dir / "grafik_skor_per_aspek.png"
+    if image.exists():
+        (out_dir / "assets").mkdir(exist_ok=True)
+        shutil.copy2(image, out_dir / "assets" / image.name)
+        assets[image.name] = f"assets/{image.name}"
+
+    with app.use_dataset(data_dir):
+        sections = [
+            ("overview", "🏠 Overview", overview_section(app, assets)),
+            ("rag", "🔍 Efektivitas RAG", rag_section(app)),
+            ("soal", "📄 Hasil Generate Soal", soal_section(app, out_dir, workers)),
+            ("evaluasi", "📋 Evaluasi Expert", evaluation_section(app)),
+            ("data", "📈 Data Mentah", raw_data_section(data_dir, out_dir, copy_files)),
+        ]
+
+    nav = "".join(f'<a href="#{sid}">{e(title)}</a>' for sid, title, _ in sections)
+    body = "".join(f'<section id="{sid}">{content}</section>' for sid, _, content in sections)
+    generated = time.strftime("%Y-%m-%d %H:%M")
+    page = f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Hasil Penelitian - RAG-LLM Assessment Generator</title>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<nav><h3>📑 Navigasi</h3>{nav}<hr><p><b>📅 Penelitian 2025</b><br>Mahendra - Universitas Hasanuddin</p>
+<p class="caption">Ekspor statis {e(generated)} dari {e(data_dir.name)}/</p></nav>
+<main>
+<h1>📊 Hasil Penelitian RAG-LLM Assessment Generator</h1>
+<p class="sub-header">Dashboard Interaktif untuk Sidang Ujian Skripsi</p>
+{body}
+<hr><footer><p><strong>RAG-LLM Assessment Generator</strong> | Skripsi 2025</p>
+<p>Mahendra - Departemen Matematika, Universitas Hasanuddin</p></footer>
+</main>
+<script>{PAGE_SCRIPT}</script>
+</body>
+</html>
+"""
+    index = out_dir / "index.html"
+    index.write_text(page, encoding="utf-8")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the dashboard as a static HTML bundle")
+    parser.add_argument("data_dir", nargs="?", default=str(ROOT / "hasil"))
+    parser.add_argument("--out", default=str(ROOT / "export"), help="output directory (default: export/)")
+    parser.add_argument("--no-files", action="store_true", help="list the raw files without copying them")
+    parser.add_argument("--workers", type=int, default=None, help="processes rendering the soal pages (default: cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = export(args.data_dir, args.out, copy_files=not args.no_files, workers=args.workers)
+    print(f"Exported {index} ({index.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
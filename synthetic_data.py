@@ -0,0 +1,268 @@
+"""
+Synthetic hasil/ data generator for load and scale testing.
+
+Learns the shape of the bundled result files (subject/topic/difficulty mix,
+score and latency distributions, content lengths) and writes arbitrarily
+large, schema-identical copies:
+
+    python synthetic_data.py --out /tmp/hasil_x1000 --scale 1000 --seed 7
+
+Rows are produced in vectorized chunks and streamed to disk, so memory stays
+bounded by ``--chunk-rows``. The same seed, size and chunk size always
+produce the same files.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RETRIEVAL_FILE = "Raw_Data_Retrieval.csv"
+EVALUATIONS_FILE = "Data_Evaluasi_Expert.json"
+ASSESSMENTS_FILE = "Log_Hasil_Generate_Soal.json"
+PERFORMANCE_FILE = "Log_Performa_Sistem_Lama.csv"
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Multiplicative noise (log-normal sigma) applied to resampled timings
+TIME_JITTER = 0.15
+# Additive noise applied to resampled scores, as a share of the column's std
+SCORE_JITTER = 0.1
+# Share of expert ratings redrawn from their marginal instead of kept with the row
+RATING_RESAMPLE = 0.3
+
+
+def _chunk_rng(seed, dataset, chunk):
+    """Independent, reproducible generator per (seed, dataset, chunk)"""
+    return np.random.default_rng(np.random.SeedSequence([seed, dataset, chunk]))
+
+
+def _chunks(n_rows, chunk_rows):
+    for index, start in enumerate(range(0, n_rows, chunk_rows)):
+        yield index, start, min(chunk_rows, n_rows - start)
+
+
+def _jitter_times(rng, values, sigma=TIME_JITTER):
+    return np.round(values * rng.lognormal(0.0, sigma, size=values.shape), 2)
+
+
+def _timestamps(rng, start, gaps, n):
+    """Increasing ISO timestamps after ``start`` with inter-arrival times resampled from ``gaps``"""
+    seconds = np.cumsum(rng.choice(gaps, size=n)) if len(gaps) else np.arange(1, n + 1)
+    stamps = pd.Timestamp(start) + pd.to_timedelta(seconds, unit="s")
+    return stamps.strftime("%Y-%m-%dT%H:%M:%S.%f").tolist(), stamps[-1] if n else pd.Timestamp(start)
+
+
+def _gaps(timestamps):
+    """Positive inter-arrival times (seconds) of a timestamp column"""
+    ts = pd.to_datetime(pd.Series(timestamps)).sort_values()
+    gaps = ts.diff().dt.total_seconds().dropna().to_numpy()
+    return gaps[gaps > 0]
+
+
+# ---------------------------------------------------------------- datasets
+
+def retrieval_chunks(source, n_rows, seed, chunk_rows):
+    """Raw_Data_Retrieval.csv rows: resampled queries with jittered latencies and scores"""
+    df = pd.read_csv(source)
+    time_cols = ["faiss_time_ms", "rerank_time_ms"]
+    score_cols = ["faiss_avg_score", "rerank_avg_score", "faiss_top1", "rerank_top1"]
+    stds = df[score_cols].std().fillna(0).to_numpy()
+    for index, _, size in _chunks(n_rows, chunk_rows):
+        rng = _chunk_rng(seed, 1, index)
+        out = df.iloc[rng.integers(0, len(df), size)].reset_index(drop=True)
+        for col in time_cols:
+            out[col] = _jitter_times(rng, out[col].to_numpy())
+        out["total_time_ms"] = np.round(out["faiss_time_ms"] + out["rerank_time_ms"], 2)
+        scores = out[score_cols].to_numpy() + rng.normal(0, 1, (size, len(score_cols))) * stds * SCORE_JITTER
+        out[score_cols] = np.round(scores, 4)
+        out["faiss_avg_score"] = out["faiss_avg_score"].clip(0, 1)
+        out["faiss_top1"] = np.maximum(out["faiss_top1"].clip(0, 1), out["faiss_avg_score"])
+        out["rerank_top1"] = np.maximum(out["rerank_top1"], out["rerank_avg_score"])
+        yield out[df.columns]
+
+
+def performance_chunks(source, n_rows, seed, chunk_rows):
+    """Log_Performa_Sistem_Lama.csv rows: resampled documents with jittered stage timings"""
+    df = pd.read_csv(source)
+    index_col = df.columns[0] if df.columns[0].startswith("Unnamed") else None
+    stages = ["extraction_ms", "chunking_ms", "embedding_ms", "retrieval_ms", "llm_ms"]
+    overhead = (df["total_ms"] - df[stages].sum(axis=1)).clip(lower=0).to_numpy()
+    for index, start, size in _chunks(n_rows, chunk_rows):
+        rng = _chunk_rng(seed, 4, index)
+        rows = rng.integers(0, len(df), size)
+        out = df.iloc[rows].reset_index(drop=True)
+        for col in stages[:-1]:
+            out[col] = _jitter_times(rng, out[col].to_numpy())
+        # LLM time follows output length, so scale both by the same factor
+        factor = rng.lognormal(0.0, TIME_JITTER, size)
+        out["output_length"] = np.maximum(1, np.round(out["output_length"].to_numpy() * factor)).astype(int)
+        out["llm_ms"] = _jitter_times(rng, out["llm_ms"].to_numpy() * factor, sigma=TIME_JITTER / 2)
+        out["total_ms"] = np.round(out[stages].sum(axis=1) + overhead[rows], 2)
+        if index_col:
+            out[index_col] = np.arange(start, start + size)
+        # The source index column has an empty header
+        yield out[df.columns].rename(columns={index_col: ""}) if index_col else out[df.columns]
+
+
+def evaluation_chunks(source, n_rows, seed, chunk_rows, n_assessments):
+    """Data_Evaluasi_Expert.json records: resampled evaluations with partly redrawn ratings"""
+    with open(source, "r", encoding="utf-8") as f:
+        df = pd.DataFrame(json.load(f))
+    aspects = ["relevance", "difficulty_match", "structure", "pedagogical_value"]
+    # Most frequent interpretation label per overall band
+    bands = pd.cut(df["overall"], [-np.inf, 3.5, 4.25, np.inf], right=False, labels=False)
+    labels = df.groupby(bands)["interpretation"].agg(lambda s: s.value_counts().index[0]).to_dict()
+    fallback = df["interpretation"].mode()[0]
+    gaps = _gaps(df["timestamp"])
+    clock = df["timestamp"].max()
+    for index, _, size in _chunks(n_rows, chunk_rows):
+        rng = _chunk_rng(seed, 2, index)
+        out = df.iloc[rng.integers(0, len(df), size)].reset_index(drop=True)
+        for col in aspects:
+            redraw = rng.random(size) < RATING_RESAMPLE
+            out.loc[redraw, col] = rng.choice(df[col].to_numpy(), size=int(redraw.sum()))
+        out["overall"] = out[aspects].mean(axis=1).round(2)
+        out_bands = np.digitize(out["overall"], [3.5, 4.25])
+        out["interpretation"] = [labels.get(b, fallback) for b in out_bands]
+        out["assessment_id"] = rng.integers(1, max(n_assessments, 1) + 1, size)
+        out["timestamp"], clock = _timestamps(rng, clock, gaps, size)
+        yield out[df.columns].to_dict("records")
+
+
+def assessment_chunks(source, n_rows, seed, chunk_rows):
+    """Log_Hasil_Generate_Soal.json records: resampled soal with content cut to sampled lengths"""
+    with open(source, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    lengths = np.array([len(r.get("content", "")) for r in records])
+    by_subject = {}
+    for i, r in enumerate(records):
+        by_subject.setdefault(r["mata_kuliah"], []).append(i)
+    gaps = _gaps([r["timestamp"] for r in records])
+    clock = max(r["timestamp"] for r in records)
+    next_id = max(int(r["id"]) for r in records) + 1
+    for index, _, size in _chunks(n_rows, chunk_rows):
+        rng = _chunk_rng(seed, 3, index)
+        picks = rng.integers(0, len(records), size)
+        target_lengths = rng.choice(lengths, size)
+        time_factor = rng.lognormal(0.0, TIME_JITTER, size)
+        stamps, clock = _timestamps(rng, clock, gaps, size)
+        partners = rng.random(size)
+        chunk = []
+        for j, pick in enumerate(picks):
+            base = records[pick]
+            content = base.get("content", "")
+            if len(content) < target_lengths[j]:
+                # Extend with another soal of the same subject to reach the sampled length
+                pool = by_subject[base["mata_kuliah"]]
+                content = content + "\n\n" + records[pool[int(partners[j] * len(pool))]].get("content", "")
+            record = dict(base, id=next_id, content=content[:target_lengths[j]], timestamp=stamps[j])
+            if isinstance(base.get("metrics"), dict):
+                metrics = dict(base["metrics"])
+                for key in ("processing_time_s", "api_time_ms"):
+                    if key in metrics:
+                        metrics[key] = round(metrics[key] * float(time_factor[j]), 2)
+                record["metrics"] = metrics
+            chunk.append(record)
+            next_id += 1
+        yield chunk
+
+
+# ---------------------------------------------------------------- writers
+
+def write_csv(path, chunks, encoding="utf-8"):
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False,
+                     encoding=encoding if i == 0 else "utf-8")
+        rows += len(chunk)
+    return rows
+
+
+def write_json_array(path, chunks):
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for chunk in chunks:
+            for record in chunk:
+                if rows:
+                    f.write(",\n")
+                f.write(json.dumps(record, ensure_ascii=False, default=str))
+                rows += 1
+        f.write("\n]\n")
+    return rows
+
+
+def _source_rows(path):
+    if path.suffix == ".csv":
+        return sum(1 for _ in open(path, "rb")) - 1
+    with open(path, "r", encoding="utf-8") as f:
+        return len(json.load(f))
+
+
+def generate(source_dir, out_dir, scale=10, rows=None, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, copy_rest=True):
+    """
+    Write a synthetic copy of ``source_dir`` into ``out_dir``.
+
+    Each modelled dataset gets ``rows`` rows, or ``scale`` times its source
+    row count. Other files are copied unchanged when ``copy_rest`` is set, so
+    ``out_dir`` can be served by the dashboard as-is. Returns {file: rows}.
+    """
+    source_dir, out_dir = Path(source_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    size = lambda name: rows if rows is not None else int(round(_source_rows(source_dir / name) * scale))
+
+    written = {}
+    n_assessments = size(ASSESSMENTS_FILE)
+    written[RETRIEVAL_FILE] = write_csv(
+        out_dir / RETRIEVAL_FILE,
+        retrieval_chunks(source_dir / RETRIEVAL_FILE, size(RETRIEVAL_FILE), seed, chunk_rows))
+    written[PERFORMANCE_FILE] = write_csv(
+        out_dir / PERFORMANCE_FILE,
+        performance_chunks(source_dir / PERFORMANCE_FILE, size(PERFORMANCE_FILE), seed, chunk_rows),
+        encoding="utf-8-sig")
+    written[EVALUATIONS_FILE] = write_json_array(
+        out_dir / EVALUATIONS_FILE,
+        evaluation_chunks(source_dir / EVALUATIONS_FILE, size(EVALUATIONS_FILE), seed, chunk_rows, n_assessments))
+    written[ASSESSMENTS_FILE] = write_json_array(
+        out_dir / ASSESSMENTS_FILE,
+        assessment_chunks(source_dir / ASSESSMENTS_FILE, n_assessments, seed, chunk_rows))
+
+    if copy_rest:
+        for src in source_dir.rglob("*"):
+            rel = src.relative_to(source_dir)
+            if not src.is_file() or rel.as_posix() in written or any(p.startswith(".") for p in rel.parts):
+                continue
+            (out_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(src, out_dir / rel)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate large synthetic copies of the hasil/ datasets")
+    parser.add_argument("--source", default=str(Path(__file__).parent / "hasil"))
+    parser.add_argument("--out", required=True)
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", type=float, default=10, help="rows per dataset as a multiple of the source")
+    size.add_argument("--rows", type=int, help="exact rows per dataset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--no-copy-rest", action="store_true", help="only write the modelled datasets")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = generate(args.source, args.out, scale=args.scale, rows=args.rows, seed=args.seed,
+                       chunk_rows=args.chunk_rows, copy_rest=not args.no_copy_rest)
+    for name, n in written.items():
+        print(f"{name}: {n} rows")
+    print(f"Written to {args.out} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
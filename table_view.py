@@ -0,0 +1,83 @@
+"""
+Paged tables with precomputed colour scales.
+
+``TableView`` wraps a DataFrame that is shown one page at a time. Colour
+scales replace ``Styler.background_gradient``. Each scale is computed once,
+as one vectorized column of CSS strings looked up in the colormap's table
+of colours, so the colours match the gradient Styler would draw. Sort
+orders are computed once per (column, direction) with a stable argsort and
+kept. A page is a slice of row positions. Only the visible rows reach a
+Styler, so formatting and colouring cost follows the page size rather than
+the table length, and the frame is never copied or re-sorted.
+"""
+
+import numpy as np
+
+# Luminance below which gradient cells get light text, as in Styler.background_gradient
+TEXT_COLOR_THRESHOLD = 0.408
+
+
+def gradient_css(values, cmap, vmin, vmax):
+    """Background and text CSS of every value on a ``cmap`` scale from ``vmin`` to ``vmax`` ("" for NaN)"""
+    from matplotlib import colormaps, colors
+
+    colormap = colormaps[cmap]
+    rgba = colormap(np.arange(colormap.N))
+    linear = np.where(rgba[:, :3] <= 0.04045, rgba[:, :3] / 12.92, ((rgba[:, :3] + 0.055) / 1.055) ** 2.4)
+    dark = linear @ [0.2126, 0.7152, 0.0722] < TEXT_COLOR_THRESHOLD
+    lookup = np.array([f"background-color: {colors.to_hex(c)}; color: {'#f1f1f1' if d else '#000000'}"
+                       for c, d in zip(rgba, dark)] + [""], dtype=object)
+
+    values = np.asarray(values, dtype=float)
+    scaled = (values - vmin) / (vmax - vmin) if vmax > vmin else np.full(len(values), 0.5)
+    # Same binning as the colormap itself: floor(x * N), clipped to the table
+    codes = np.clip(np.nan_to_num(scaled * colormap.N), 0, colormap.N - 1).astype(np.int64)
+    codes[~np.isfinite(values)] = colormap.N
+    return lookup[codes]
+
+
+class TableView:
+    """A DataFrame shown a page at a time, with server-side sorting and precomputed colour scales"""
+
+    def __init__(self, df, gradients=None):
+        self.frame = df.reset_index(drop=True)
+        # column -> CSS per row; gradients maps column -> (cmap, vmin, vmax)
+        self.styles = {column: gradient_css(self.frame[column].to_numpy(dtype=float), *spec)
+                       for column, spec in (gradients or {}).items()}
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def columns(self):
+        return list(self.frame.columns)
+
+    def order(self, column=None, ascending=True):
+        """Row positions sorted on ``column`` (None: original order), computed once per sort key"""
+        if column is None:
+            return None
+        key = (column, ascending)
+        if key not in self._orders:
+            # Benign race between sessions: both compute the same array
+            self._orders[key] = self.frame[column].sort_values(
+                ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        return self._orders[key]
+
+    def page_rows(self, number, size, sort=None, ascending=True):
+        """Row positions of page ``number`` (1-based)"""
+        start = (number - 1) * size
+        order = self.order(sort, ascending)
+        if order is None:
+            return np.arange(start, min(start + size, len(self)))
+        return order[start:start + size]
+
+    def styled_page(self, number, size, sort=None, ascending=True, formats=None):
+        """Styler over the rows of one page only, with their precomputed colours"""
+        rows = self.page_rows(number, size, sort, ascending)
+        styler = self.frame.iloc[rows].style
+        if formats:
+            styler = styler.format(formats)
+        for column, css in self.styles.items():
+            styler = styler.apply(lambda _, css=css[rows]: css, subset=[column], axis=0)
+        return styler
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+
+def sections():
+    import app
+    return app.SECTIONS
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HASIL_DIR", str(tmp_path))
+    monkeypatch.setenv("DASHBOARD_PREFETCH", "0")
+    return tmp_path
+
+
+@pytest.mark.parametrize("evaluations", [None, "[]"])
+def test_sections_render_without_data(data_dir, evaluations):
+    if evaluations is not None:
+        (data_dir / "Data_Evaluasi_Expert.json").write_text(evaluations, encoding="utf-8")
+    for section in sections():
+        at = AppTest.from_file(APP, default_timeout=120).run()
+        at.sidebar.radio[0].set_value(section).run()
+        assert not at.exception, f"{section}: {at.exception[0].value}"
+
+
+def test_snapshot_rebuild_only_moves_changed_sources(tmp_path):
+    import app
+    import snapshot
+    for name, value in (("a.csv", 1), ("b.csv", 2)):
+        (tmp_path / name).write_text(f"x\n{value}\n", encoding="utf-8")
+    snapshot.build_snapshot(tmp_path)
+    with app.use_dataset(tmp_path):
+        before = {name: app.snapshot_version(name) for name in ("a.csv", "b.csv")}
+        (tmp_path / "b.csv").write_text("x\n3\n", encoding="utf-8")
+        snapshot.build_snapshot(tmp_path)
+        assert app.snapshot_version("a.csv") == before["a.csv"]
+        assert app.snapshot_version("b.csv") == snapshot.content_hash(tmp_path / "b.csv") != before["b.csv"]
+        assert app.snapshot_version("missing.csv") is None
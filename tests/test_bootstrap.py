@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bootstrap
+
+
+def test_all_nan_group_gives_nan_interval():
+    df = pd.DataFrame({
+        "subject": ["A", "A", "B", "B"],
+        "score": [0.5, 0.7, np.nan, np.nan],
+        "success": [True, False, True, True],
+    })
+    result = bootstrap.intervals(df, means=["score"], rates=["success"], by="subject", replicates=200)
+    empty = result[(result["group"] == "B") & (result["metric"] == "score")].iloc[0]
+    assert empty["n"] == 0
+    assert np.isnan([empty["estimate"], empty["low"], empty["high"]]).all()
+    filled = result[(result["group"] == "A") & (result["metric"] == "score")].iloc[0]
+    assert filled["n"] == 2 and filled["low"] <= filled["estimate"] <= filled["high"]
+    assert result[(result["group"] == "B") & (result["metric"] == "success")].iloc[0]["n"] == 2
+
+
+def test_empty_frame_gives_nan_rows():
+    rows = bootstrap.group_intervals(pd.DataFrame({"score": [], "success": []}), means=["score"], rates=["success"])
+    assert [r["metric"] for r in rows] == ["score", "success"]
+    assert all(r["n"] == 0 and np.isnan(r["estimate"]) for r in rows)
+
+
+def _retrieval_like(n, groups=5, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "subject": rng.integers(0, groups, n).astype(str),
+        "p_relevant": rng.random(n),
+        "p_top1": rng.random(n),
+        "time_ms": rng.gamma(4, 50, n),
+        "success": rng.random(n) > 0.3,
+    })
+
+
+@pytest.mark.parametrize("n", [1_000, 2_500, 100_000])
+def test_intervals_are_fast(n):
+    df = _retrieval_like(n)
+    bootstrap.intervals(df.head(100), means=["p_relevant"], by="subject")  # warm up
+    start = time.perf_counter()
+    bootstrap.intervals(df, means=["p_relevant", "p_top1", "time_ms"], rates=["success"], by="subject")
+    assert time.perf_counter() - start < 1.0
+
+
+@pytest.mark.parametrize("n", [200, 5_000])
+def test_interval_width_matches_standard_error(n):
+    df = _retrieval_like(n, groups=1)
+    row = bootstrap.group_intervals(df, means=["time_ms"])[0]
+    expected = 2 * 1.96 * df["time_ms"].std() / np.sqrt(n)
+    assert abs((row["high"] - row["low"]) / expected - 1) < 0.1
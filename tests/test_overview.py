@@ -0,0 +1,123 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import overview
+
+HASIL = Path(__file__).resolve().parent.parent / "hasil"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in (overview.EVALUATIONS_FILE, overview.ASSESSMENTS_FILE, overview.RETRIEVAL_FILE):
+        shutil.copy(HASIL / name, tmp_path / name)
+    (tmp_path / overview.INBOX_DIR).mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """(file name, start offset) of every read the overview makes"""
+    calls = []
+
+    def recording(reader):
+        def read(path, start):
+            calls.append((Path(path).name, start))
+            return reader(path, start)
+        return read
+
+    for sources in (overview.SOURCES, overview.INBOX_SOURCES):
+        for name, (key, reader, totals_of) in list(sources.items()):
+            monkeypatch.setitem(sources, name, (key, recording(reader), totals_of))
+    return calls
+
+
+def assert_close(actual, expected, path="state"):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_close(a, e, f"{path}[{i}]")
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, nan_ok=True), path
+    else:
+        assert actual == expected, path
+
+
+def fold(data_dir, reads):
+    """Update the persisted overview, check it against a full recompute and return the folded reads"""
+    reads.clear()
+    state = json.loads(json.dumps(overview.open_overview(data_dir)))
+    folded = list(reads)
+    full, _ = overview.update(data_dir)
+    assert_close(state, json.loads(json.dumps(full)))
+    return folded
+
+
+def append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_appended_records_are_folded(data_dir, reads):
+    fold(data_dir, reads)
+    retrieval = data_dir / overview.RETRIEVAL_FILE
+    size = retrieval.stat().st_size
+    append(retrieval, retrieval.read_bytes().splitlines(keepends=True)[1])
+
+    evaluations = data_dir / overview.EVALUATIONS_FILE
+    consumed = overview.load_state(data_dir / overview.OVERVIEW_FILE)["sources"][overview.EVALUATIONS_FILE]["end"]
+    text = evaluations.read_text(encoding="utf-8").rstrip()
+    record = dict(json.loads(text)[0], overall=1.0)
+    evaluations.write_text(text[:-1].rstrip() + ",\n" + json.dumps(record) + "\n]\n", encoding="utf-8")
+
+    folded = dict(fold(data_dir, reads))
+    assert folded[overview.RETRIEVAL_FILE] == size and folded[overview.EVALUATIONS_FILE] == consumed
+    assert overview.load_state(data_dir / overview.OVERVIEW_FILE)["evaluations"]["count"] == 51
+
+
+def test_partial_trailing_line_waits_for_its_newline(data_dir, reads):
+    inbox = data_dir / overview.INBOX_DIR
+    record = json.loads((data_dir / overview.EVALUATIONS_FILE).read_text(encoding="utf-8"))[0]
+    line = json.dumps(record).encode("utf-8")
+    row = (data_dir / overview.RETRIEVAL_FILE).read_bytes().splitlines(keepends=True)[1]
+    append(inbox / "live.jsonl", line + b"\n")
+    fold(data_dir, reads)
+
+    append(inbox / "live.jsonl", line[:40])
+    append(data_dir / overview.RETRIEVAL_FILE, row[:30])
+    fold(data_dir, reads)
+    state = overview.load_state(data_dir / overview.OVERVIEW_FILE)
+    assert state["evaluations"]["count"] == 51
+
+    append(inbox / "live.jsonl", line[40:] + b"\n")
+    append(data_dir / overview.RETRIEVAL_FILE, row[30:])
+    folded = dict(fold(data_dir, reads))
+    assert folded["live.jsonl"] > 0 and folded[overview.RETRIEVAL_FILE] > 0
+    assert overview.load_state(data_dir / overview.OVERVIEW_FILE)["evaluations"]["count"] == 52
+
+
+def test_rewritten_prefix_is_recomputed(data_dir, reads):
+    fold(data_dir, reads)
+    retrieval = data_dir / overview.RETRIEVAL_FILE
+    lines = retrieval.read_bytes().splitlines(keepends=True)
+    # Same size, different first row: only the prefix digest can tell
+    lines[1] = lines[1].replace(b"22.96", b"99.96")
+    retrieval.write_bytes(b"".join(lines))
+    assert dict(fold(data_dir, reads))[overview.RETRIEVAL_FILE] == 0
+
+
+def test_new_inbox_files_are_folded(data_dir, reads):
+    fold(data_dir, reads)
+    inbox = data_dir / overview.INBOX_DIR
+    records = json.loads((data_dir / overview.EVALUATIONS_FILE).read_text(encoding="utf-8"))[:3]
+    (inbox / "batch.jsonl").write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    lines = (data_dir / overview.RETRIEVAL_FILE).read_bytes().splitlines(keepends=True)
+    (inbox / "run.csv").write_bytes(b"".join(lines[:4]))
+    # Only the new files are read from the start
+    assert sorted(name for name, start in fold(data_dir, reads) if not start) == ["batch.jsonl", "run.csv"]
@@ -0,0 +1,17 @@
+import pandas as pd
+
+import query_catalog
+
+
+def test_exact_match_skips_truncated_prefixes():
+    index = query_catalog.QueryIndex(pd.DataFrame({
+        "mata_kuliah": ["Basis Data"] * 3,
+        "query": ["Apa itu basis data", "Apa itu basis...", "Apa itu basis data relasional"],
+    }))
+    rows = index.join(["Basis Data"] * 4, [
+        "Apa itu basis data",             # exact key, also a prefix of row 2's key
+        "apa itu  basis data relasional",
+        "Apa itu basis data normalisasi",  # only the truncated row matches
+        "Apa itu SQL",
+    ])
+    assert rows == [[0], [2], [1], []]
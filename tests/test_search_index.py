@@ -0,0 +1,26 @@
+import json
+
+import search_index
+
+RECORDS = [
+    {"id": 1, "mata_kuliah": "Basis Data", "topic": "JOIN", "difficulty": "Mudah", "content": "Gunakan INNER JOIN"},
+    {"id": 2, "mata_kuliah": "Basis Data", "topic": "Normalisasi", "difficulty": "Sedang", "content": "Bentuk normal"},
+    {"id": 3, "mata_kuliah": "Algoritma", "topic": "Rekursif", "difficulty": "Sulit", "content": "Fungsi rekursif dan join"},
+]
+
+
+def test_persisted_index_round_trips_without_pickle(tmp_path):
+    source, index_path = tmp_path / "log.json", tmp_path / ".search" / "log.json"
+    source.write_text(json.dumps(RECORDS), encoding="utf-8")
+    built = search_index.SearchIndex.open(source, index_path)
+    loaded = search_index.SearchIndex.load(source, index_path)
+    assert loaded.postings == built.postings and loaded.lengths == built.lengths
+    assert loaded.search("join") == built.search("join")
+    assert [d for d, _ in loaded.search("join", subject="Algoritma")] == [2]
+    assert loaded.content(2) == "Fungsi rekursif dan join"
+    assert sorted(p.suffix for p in index_path.parent.iterdir()) == [".json", ".npy"]
+
+    # An unreadable index is rebuilt, never executed
+    index_path.write_bytes(b"\x80\x04not json")
+    assert search_index.SearchIndex.load(source, index_path) is None
+    assert search_index.SearchIndex.open(source, index_path).search("join") == built.search("join")
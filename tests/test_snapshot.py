@@ -0,0 +1,41 @@
+import pandas as pd
+
+import ingest
+import snapshot
+
+
+def write_csv(path, rows):
+    pd.DataFrame({"subject": ["A"] * rows, "score": range(rows)}).to_csv(path, index=False)
+
+
+def test_snapshot_records_the_parsed_version(tmp_path):
+    write_csv(tmp_path / "scores.csv", 3)
+    tables, _ = ingest.ingest(tmp_path, workers=1)
+    # Rewritten between the parse and the build: the snapshot must not pass for the new file
+    write_csv(tmp_path / "scores.csv", 5)
+    manifest = snapshot.build_snapshot(tmp_path, tables=tables)
+    assert manifest["tables"]["scores.csv"]["rows"] == 3
+    assert not snapshot.is_fresh(tmp_path, "scores.csv", manifest)
+    assert snapshot.read_table(tmp_path, "scores.csv") is None
+
+    snapshot.build_snapshot(tmp_path)
+    assert len(snapshot.read_table(tmp_path, "scores.csv")) == 5
+
+
+def test_refresh_parses_only_stale_sources(tmp_path):
+    write_csv(tmp_path / "a.csv", 3)
+    write_csv(tmp_path / "b.csv", 4)
+    assert set(ingest.refresh_snapshot(tmp_path, workers=1)["source"]) == {"a.csv", "b.csv"}
+    before = snapshot.load_manifest(tmp_path)["tables"]["a.csv"]
+    inode = (tmp_path / snapshot.SNAPSHOT_DIR / f"{before['columns'][0]['file']}.npy").stat().st_ino
+
+    write_csv(tmp_path / "b.csv", 6)
+    write_csv(tmp_path / "c.csv", 2)
+    assert set(ingest.refresh_snapshot(tmp_path, workers=1)["source"]) == {"b.csv", "c.csv"}
+    manifest = snapshot.load_manifest(tmp_path)
+    assert manifest["tables"]["a.csv"] == before
+    assert (tmp_path / snapshot.SNAPSHOT_DIR / f"{before['columns'][0]['file']}.npy").stat().st_ino == inode
+    files = [c["file"] for entry in manifest["tables"].values() for c in entry["columns"]]
+    assert len(files) == len(set(files))
+    assert [len(snapshot.read_table(tmp_path, s)) for s in ("a.csv", "b.csv", "c.csv")] == [3, 6, 2]
+    assert ingest.refresh_snapshot(tmp_path, workers=1) is None
@@ -0,0 +1,27 @@
+import pytest
+
+import soal_html
+
+
+@pytest.mark.parametrize("link", [
+    "[a](jav&#x61;script:alert(1))",
+    "[a](&#106;avascript:alert(1))",
+    "[a](java\tscript:alert(1))",
+    "![a](java\tscript:alert(1))",
+    "[a](data:text/html,<script>alert(1)</script>)",
+])
+def test_script_urls_are_neutralized(link):
+    rendered = soal_html.render_markdown(link)
+    assert 'href="#"' in rendered or 'src="#"' in rendered
+    assert "script:" not in rendered
+
+
+@pytest.mark.parametrize("url", ["https://example.com/a?b=1", "mailto:dosen@example.com", "../soal/1.html", "#top"])
+def test_safe_urls_are_kept(url):
+    assert soal_html.is_safe_url(url)
+    assert f'href="{url}"' in soal_html.render_markdown(f"[a]({url})")
+
+
+def test_raw_html_is_escaped():
+    rendered = soal_html.render_markdown('<a href="javascript:alert(1)">x</a>')
+    assert "<a " not in rendered